@@ -0,0 +1,63 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Measure reads of a value acquired from the root of a DotDictWithAcquisition
+by namespaces nested 1 to 8 deep: by attribute on the innermost namespace
+and by key of the form 'n1.n2.password' on the root.  The 'cold' columns
+start a new epoch of the tree before every read, so every read walks up
+through the parents the way it did before acquired keys were cached.
+
+    python benchmarks/bench_acquisition.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import timeit
+
+from configman import dotdict
+from configman.dotdict import DotDictWithAcquisition
+
+
+#------------------------------------------------------------------------------
+def make_config(depth):
+    config = DotDictWithAcquisition()
+    config.password = 'secret'
+    path = '.'.join('n%d' % x for x in range(1, depth + 1))
+    config[path + '.user'] = 'fred'
+    return config, config[path], path + '.password'
+
+
+#------------------------------------------------------------------------------
+def time_it(a_function, number=20000):
+    return min(timeit.repeat(a_function, number=number, repeat=3)) \
+        / number * 1e9
+
+
+#------------------------------------------------------------------------------
+def main():
+    print('%6s %16s %16s %16s %16s' % (
+        'depth', 'attr cold (ns)', 'attr (ns)', 'key cold (ns)', 'key (ns)'
+    ))
+    for depth in range(1, 9):
+        config, innermost, key = make_config(depth)
+        assert innermost.password == config[key] == 'secret'
+
+        def attribute_cold():
+            config._clock[0] = next(dotdict._epochs)
+            innermost.password
+
+        def key_cold():
+            config._clock[0] = next(dotdict._epochs)
+            config[key]
+
+        print('%6d %16.0f %16.0f %16.0f %16.0f' % (
+            depth,
+            time_it(attribute_cold),
+            time_it(lambda: innermost.password),
+            time_it(key_cold),
+            time_it(lambda: config[key]),
+        ))
+
+
+if __name__ == '__main__':
+    main()
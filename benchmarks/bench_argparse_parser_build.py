@@ -0,0 +1,70 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare building the argparse parser from scratch for every lenient
+parse against extending the previously built parser, the way the overlay and
+expansion loop asks for parses: the options arrive in batches, one batch per
+expansion level, and the command line is parsed after each batch.
+
+    python benchmarks/bench_argparse_parser_build.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import time
+
+from configman import ConfigurationManager, Namespace
+from configman.value_sources.for_argparse import ValueSource
+
+
+#------------------------------------------------------------------------------
+def make_config_manager():
+    config_manager = ConfigurationManager(
+        definition_source=[Namespace()],
+        values_source_list=[argparse],
+        argv_source=[],
+        use_auto_help=False,
+    )
+    config_manager.argv_source = ['--ns0.opt0=1']
+    return config_manager
+
+
+#------------------------------------------------------------------------------
+def add_batch(config_manager, batch, batch_size):
+    namespace_name = 'ns%d' % batch
+    config_manager.option_definitions.namespace(namespace_name)
+    a_namespace = config_manager.option_definitions[namespace_name]
+    for x in range(batch_size):
+        a_namespace.add_option('opt%d' % x, default=x, doc='option %d' % x)
+
+
+#------------------------------------------------------------------------------
+def run(number_of_options, batches, reuse):
+    config_manager = make_config_manager()
+    value_source = ValueSource(argparse, config_manager)
+    start = time.time()
+    for batch in range(batches):
+        add_batch(config_manager, batch, number_of_options // batches)
+        if not reuse:
+            value_source.parser_builds.clear()
+        value_source.get_values(config_manager, True)
+    return time.time() - start
+
+
+#------------------------------------------------------------------------------
+def main():
+    print('%8s %8s %14s %14s' % (
+        'options', 'batches', 'rebuild (ms)', 'extend (ms)'
+    ))
+    for number_of_options, batches in ((500, 5), (1500, 5), (1500, 10)):
+        print('%8d %8d %14.1f %14.1f' % (
+            number_of_options,
+            batches,
+            run(number_of_options, batches, False) * 1000,
+            run(number_of_options, batches, True) * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
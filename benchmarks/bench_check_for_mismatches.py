@@ -0,0 +1,115 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the acquisition tolerant matching of unmatched keys in
+_check_for_mismatches: the former scan of every known key with 'endswith'
+against the index of the dot boundary suffixes of the known keys.  The known
+keys number 10k, the unmatched keys come from a noisy environment: variables
+that have nothing to do with the configuration and a few that can be
+acquired.  The last section times a complete _check_for_mismatches with an
+environment like source that doesn't ignore mismatches.
+
+    python benchmarks/bench_check_for_mismatches.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import time
+import warnings
+
+import six
+
+from configman import ConfigurationManager, Namespace
+
+
+#------------------------------------------------------------------------------
+def make_known_keys(number):
+    return set(
+        'app%d.section%d.option%d' % (x % 10, x % 100, x)
+        for x in range(number)
+    )
+
+
+#------------------------------------------------------------------------------
+def make_noisy_environment(number):
+    environment = dict(
+        ('NOISE_VARIABLE_%d' % x, 'value') for x in range(number)
+    )
+    # some keys that could have been acquired
+    for x in range(0, number, 10):
+        environment['section%d.option%d' % (x % 100, x)] = 'value'
+    return environment
+
+
+#------------------------------------------------------------------------------
+def scan_with_endswith(unmatched_keys, known_keys):
+    for key in unmatched_keys.copy():
+        key_is_okay = six.moves.reduce(
+            lambda x, y: x or y,
+            (known_key.endswith(key) for known_key in known_keys)
+        )
+        if key_is_okay:
+            unmatched_keys.remove(key)
+    return unmatched_keys
+
+
+#------------------------------------------------------------------------------
+def lookup_in_suffix_index(unmatched_keys, known_keys):
+    unmatched_keys.difference_update(
+        ConfigurationManager._dotted_suffixes(known_keys)
+    )
+    return unmatched_keys
+
+
+#------------------------------------------------------------------------------
+def time_it(function, *args):
+    start = time.time()
+    result = function(*args)
+    return time.time() - start, result
+
+
+#------------------------------------------------------------------------------
+def main():
+    known_keys = make_known_keys(10000)
+    print('%12s %16s %16s' % (
+        'source keys', 'endswith (ms)', 'suffixes (ms)'
+    ))
+    for number_of_source_keys in (100, 1000, 3000):
+        unmatched_keys = set(make_noisy_environment(number_of_source_keys))
+        scan_time, scan_result = time_it(
+            scan_with_endswith,
+            set(unmatched_keys),
+            known_keys
+        )
+        index_time, index_result = time_it(
+            lookup_in_suffix_index,
+            set(unmatched_keys),
+            known_keys
+        )
+        assert scan_result == index_result
+        print('%12d %16.1f %16.1f' % (
+            number_of_source_keys,
+            scan_time * 1000,
+            index_time * 1000
+        ))
+
+    definitions = Namespace()
+    for a_key in known_keys:
+        definitions.add_option(a_key, default=0)
+    noisy_environment = make_noisy_environment(1000)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        cm = ConfigurationManager(
+            definitions,
+            [noisy_environment],
+            argv_source=[],
+            use_auto_help=False,
+        )
+        check_time, result = time_it(cm._check_for_mismatches, known_keys)
+    print('complete _check_for_mismatches, 1000 source keys: %.1f ms' % (
+        check_time * 1000
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Time loading a generated 50 MB conf file with the for_conf value source,
+against the line by line parsing that it did before.  The file has comments,
+blank lines and continued values.
+
+    python benchmarks/bench_conf_parser.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import os
+import tempfile
+import time
+
+from configman.converters import to_str
+from configman.value_sources import for_conf
+
+
+#------------------------------------------------------------------------------
+def old_values_from_lines(lines):
+    """a stand in for the parsing within the old ValueSource constructor"""
+    values = {}
+    previous_key = None
+    for line in lines:
+        line = to_str(line)
+        if line.strip().startswith('#') or not line.strip():
+            continue
+        if line[0] in ' \t' and previous_key:
+            line = line[1:]
+            values[previous_key] = (
+                '%s%s' % (values[previous_key], line.rstrip())
+            )
+            continue
+        try:
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+            previous_key = key
+        except ValueError:
+            values[line] = ''
+    return values
+
+
+#------------------------------------------------------------------------------
+def write_conf_file(pathname, size):
+    with open(pathname, 'w') as f:
+        number = 0
+        while f.tell() < size:
+            f.write('# the doc of option %d\n' % number)
+            f.write('namespace%d.option%d=value number %d\n' % (
+                number % 100,
+                number,
+                number
+            ))
+            if number % 10 == 0:
+                f.write('  continued on the next line\n')
+            if number % 50 == 0:
+                f.write('\n')
+            number += 1
+
+
+#------------------------------------------------------------------------------
+def time_it(a_function):
+    best = None
+    for x in range(3):
+        start = time.time()
+        result = a_function()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+
+#------------------------------------------------------------------------------
+def main(size=50 * 1024 * 1024):
+    handle, pathname = tempfile.mkstemp(suffix='.conf')
+    os.close(handle)
+    try:
+        write_conf_file(pathname, size)
+
+        def old_parser():
+            with open(pathname) as f:
+                return old_values_from_lines(f)
+
+        old_values, old_time = time_it(old_parser)
+        new_values, new_time = time_it(
+            lambda: for_conf.ValueSource(pathname).values
+        )
+        assert old_values == new_values
+        print('%.0f MB, %d keys' % (
+            os.path.getsize(pathname) / 1024 / 1024,
+            len(new_values)
+        ))
+        print('  line by line parsing: %6.2f s' % old_time)
+        print('  values_from_lines:    %6.2f s' % new_time)
+    finally:
+        os.remove(pathname)
+
+
+if __name__ == '__main__':
+    main()
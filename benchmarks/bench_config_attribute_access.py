@@ -0,0 +1,82 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare reading 'config.db.host' from the kinds of configuration that
+get_config can return, and from a plain object for reference.  The last
+column reads 'config.db.password', a key acquired from the root.
+
+    python benchmarks/bench_config_attribute_access.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import timeit
+
+from configman import ConfigurationManager, Namespace
+from configman.dotdict import DotDict, DotDictWithAcquisition
+from configman.frozen_config import CompiledConfig
+
+
+#==============================================================================
+class Plain(object):
+    pass
+
+
+#------------------------------------------------------------------------------
+def make_config_manager():
+    n = Namespace()
+    n.add_option('password', default='secret')
+    n.namespace('db')
+    n.db.add_option('host', default='localhost')
+    n.db.add_option('port', default=5432)
+    return ConfigurationManager(
+        [n],
+        values_source_list=[],
+        argv_source=[],
+        use_admin_controls=False,
+        use_auto_help=False,
+    )
+
+
+#------------------------------------------------------------------------------
+def time_it(statement, number=200000):
+    """time the statement with the name 'config' bound to the module global
+    'config_under_test'"""
+    timer = timeit.Timer(
+        statement,
+        setup='from __main__ import config_under_test as config'
+    )
+    return min(timer.repeat(number=number, repeat=3)) / number * 1e9
+
+
+#------------------------------------------------------------------------------
+def main():
+    global config_under_test
+    config_manager = make_config_manager()
+    plain = Plain()
+    plain.password = 'secret'
+    plain.db = Plain()
+    plain.db.host = 'localhost'
+    configs = [
+        ('DotDict', config_manager.get_config(mapping_class=DotDict)),
+        ('DotDictWithAcquisition', config_manager.get_config()),
+        ('FrozenConfig', config_manager.get_frozen_config()),
+        ('CompiledConfig',
+         config_manager.get_config(mapping_class=CompiledConfig)),
+        ('plain object', plain),
+    ]
+    print('%-24s %16s %16s' % ('config', 'db.host (ns)', 'acquired (ns)'))
+    for name, config in configs:
+        config_under_test = config
+        if isinstance(config, DotDictWithAcquisition) or not isinstance(
+            config,
+            (DotDict, Plain)
+        ):
+            acquired = '%16.1f' % time_it('config.db.password')
+        else:
+            acquired = '%16s' % 'n/a'
+        print('%-24s %16.1f %s' % (name, time_it('config.db.host'), acquired))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Time 'import configman' in fresh interpreters with '-X importtime' and
+compare it with importing all of the value source and definition source
+backends as well, which is what 'import configman' used to do.  Needs Python
+3.7 or later.
+
+    python benchmarks/bench_import_time.py
+"""
+from __future__ import absolute_import, division, print_function
+
+from configman.tests.test_import_time import (
+    import_times,
+    lazily_imported_modules,
+)
+
+
+#------------------------------------------------------------------------------
+def best_import_time(module_names, repeat=20):
+    """the best total microseconds of all of the imports of an interpreter
+    that imports the modules"""
+    best = None
+    for x in range(repeat):
+        elapsed = sum(import_times(*module_names).values())
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+#------------------------------------------------------------------------------
+def main():
+    lazy = best_import_time(['configman'])
+    eager = best_import_time(['configman'] + [
+        x for x in lazily_imported_modules if x.startswith('configman.')
+    ])
+    print('all imports of an interpreter that imports')
+    print('  configman:               %6.1f ms' % (lazy / 1000.0))
+    print('  configman and backends:  %6.1f ms' % (eager / 1000.0))
+
+
+if __name__ == '__main__':
+    main()
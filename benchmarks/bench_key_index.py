@@ -0,0 +1,58 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the cost of fully qualified key lookups in a DotDict with and
+without the flat key index as the nesting depth of the key grows.
+
+    python benchmarks/bench_key_index.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import timeit
+
+from configman.namespace import Namespace
+
+
+#------------------------------------------------------------------------------
+def make_tree(depth, width=10):
+    """create a Namespace with 'width' options at each of 'depth' levels and
+    return it along with the qualified name of the deepest option"""
+    root = Namespace()
+    path = []
+    for level in range(depth):
+        namespace_name = '.'.join(path)
+        for x in range(width):
+            name = 'opt%d' % x
+            if namespace_name:
+                name = '%s.%s' % (namespace_name, name)
+            root.add_option(name, default=x)
+        path.append('level%d' % level)
+    return root, '.'.join(path[:-1] + ['opt0'])
+
+
+#------------------------------------------------------------------------------
+def time_lookups(a_tree, key, number=100000):
+    return min(timeit.repeat(
+        lambda: a_tree[key],
+        number=number,
+        repeat=3
+    )) / number * 1e9
+
+
+#------------------------------------------------------------------------------
+def main():
+    print('%6s %14s %14s' % ('depth', 'walk (ns)', 'index (ns)'))
+    for depth in range(1, 11):
+        plain_tree, key = make_tree(depth)
+        indexed_tree, key = make_tree(depth)
+        indexed_tree.enable_key_index()
+        print('%6d %14.0f %14.0f' % (
+            depth,
+            time_lookups(plain_tree, key),
+            time_lookups(indexed_tree, key),
+        ))
+
+
+if __name__ == '__main__':
+    main()
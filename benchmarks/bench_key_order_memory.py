@@ -0,0 +1,65 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the memory held by the linked list OrderedSet and by the
+CompactOrderedSet that DotDict uses for its key order, each holding the
+same 100k keys.  Also times adding, iterating over and discarding all of
+the keys.
+
+Requires Python 3 for tracemalloc.
+
+    python benchmarks/bench_key_order_memory.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import timeit
+import tracemalloc
+
+from configman.orderedset import OrderedSet, CompactOrderedSet
+
+
+#------------------------------------------------------------------------------
+def measure(factory):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    an_object = factory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return an_object, sum(x.size_diff for x in stats)
+
+
+#------------------------------------------------------------------------------
+def time_it(a_function):
+    return min(timeit.repeat(a_function, number=1, repeat=3)) * 1e3
+
+
+#------------------------------------------------------------------------------
+def discard_all(a_class, keys):
+    a_set = a_class(keys)
+    for a_key in keys:
+        a_set.discard(a_key)
+
+
+#------------------------------------------------------------------------------
+def main(number=100000):
+    # the keys are shared by both sets, so only the sets are measured
+    keys = ['option_%d' % x for x in range(number)]
+    print('%d keys' % number)
+    print('%-18s %12s %10s %10s %12s' % (
+        'class', 'bytes/key', 'add (ms)', 'iter (ms)', 'discard (ms)'
+    ))
+    for a_class in (OrderedSet, CompactOrderedSet):
+        a_set, size = measure(lambda: a_class(keys))
+        print('%-18s %12.1f %10.1f %10.1f %12.1f' % (
+            a_class.__name__,
+            size / number,
+            time_it(lambda: a_class(keys)),
+            time_it(lambda: list(a_set)),
+            time_it(lambda: discard_all(a_class, keys)),
+        ))
+
+
+if __name__ == '__main__':
+    main()
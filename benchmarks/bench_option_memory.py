@@ -0,0 +1,105 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compare the per instance memory footprint of the __slots__ based Option
+against an Option that keeps its attributes in a per instance __dict__, the
+way Option did before.  Also compares the cost of Option.copy against
+copying through the constructor.
+
+Requires Python 3 for tracemalloc.
+
+    python benchmarks/bench_option_memory.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import timeit
+import tracemalloc
+
+from configman.option import Option
+
+
+#==============================================================================
+class DictBasedOption(object):
+    """a stand in for the old Option layout: the same attributes, but held
+    in an instance __dict__"""
+    def __init__(self, an_option):
+        for an_attribute in Option.__slots__:
+            setattr(self, an_attribute, getattr(an_option, an_attribute))
+
+
+#------------------------------------------------------------------------------
+def make_options(number):
+    return [
+        Option('option_%d' % x, default=x, doc='option number %d' % x)
+        for x in range(number)
+    ]
+
+
+#------------------------------------------------------------------------------
+def measure(factory):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = factory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return objects, sum(x.size_diff for x in stats)
+
+
+#------------------------------------------------------------------------------
+def copy_through_constructor(o):
+    return Option(
+        name=o.name,
+        default=o.default,
+        doc=o.doc,
+        from_string_converter=o.from_string_converter,
+        to_string_converter=o.to_string_converter,
+        value=o.value,
+        short_form=o.short_form,
+        exclude_from_print_conf=o.exclude_from_print_conf,
+        exclude_from_dump_conf=o.exclude_from_dump_conf,
+        is_argument=o.is_argument,
+        likely_to_be_changed=o.likely_to_be_changed,
+        not_for_definition=o.not_for_definition,
+        reference_value_from=o.reference_value_from,
+        secret=o.secret,
+        has_changed=o.has_changed,
+        foreign_data=o.foreign_data,
+    )
+
+
+#------------------------------------------------------------------------------
+def main(number=50000):
+    options = make_options(number)
+    # the names, defaults and docs are shared by both layouts, so only the
+    # instances themselves are measured
+    slotted, slotted_size = measure(lambda: [o.copy() for o in options])
+    dict_based, dict_based_size = measure(
+        lambda: [DictBasedOption(o) for o in options]
+    )
+    print('%d options' % number)
+    print('  __dict__ based: %6.1f bytes per option' % (
+        dict_based_size / number
+    ))
+    print('  __slots__ based: %5.1f bytes per option' % (
+        slotted_size / number
+    ))
+
+    an_option = options[0]
+    repeat = 100000
+    print('copy one option')
+    print('  through the constructor: %6.0f ns' % (min(timeit.repeat(
+        lambda: copy_through_constructor(an_option),
+        number=repeat,
+        repeat=3
+    )) / repeat * 1e9))
+    print('  Option.copy: %18.0f ns' % (min(timeit.repeat(
+        an_option.copy,
+        number=repeat,
+        repeat=3
+    )) / repeat * 1e9))
+
+
+if __name__ == '__main__':
+    main()
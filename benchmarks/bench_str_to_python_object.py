@@ -0,0 +1,59 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Measure str_to_python_object on the hit path, where the resolution of the
+dotted path is cached, and on the miss path, where the cache is cleared
+before every conversion and the modules have to be imported again (they are
+already in sys.modules, so no file is actually loaded).  The miss path for a
+class name includes the failed probe of the whole path as a module; the
+'probe cached' column shows the miss path when only that failure is
+remembered.
+
+    python benchmarks/bench_str_to_python_object.py
+"""
+from __future__ import absolute_import, division, print_function
+
+import timeit
+
+from configman import converters
+
+PATHS = (
+    'os.path',
+    'configman.converters.str_to_python_object',
+    'configman.dotdict.DotDictWithAcquisition',
+    'collections.OrderedDict',
+)
+
+
+#------------------------------------------------------------------------------
+def time_it(a_function, number=20000):
+    return min(timeit.repeat(a_function, number=number, repeat=3)) \
+        / number * 1e9
+
+
+#------------------------------------------------------------------------------
+def main():
+    convert = converters.str_to_python_object
+    print('%-45s %10s %10s %14s' % (
+        'path', 'hit (ns)', 'miss (ns)', 'probe cached'
+    ))
+    for a_path in PATHS:
+        convert(a_path)
+        hit = time_it(lambda: convert(a_path))
+
+        def miss():
+            converters.clear_python_object_cache()
+            convert(a_path)
+        cold = time_it(miss)
+
+        def miss_with_probe_cached():
+            converters._python_object_resolutions.clear()
+            convert(a_path)
+        warm = time_it(miss_with_probe_cached)
+
+        print('%-45s %10.0f %10.0f %14.0f' % (a_path, hit, cold, warm))
+
+
+if __name__ == '__main__':
+    main()
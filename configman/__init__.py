@@ -23,7 +23,8 @@ from configman.converters import (
     timedelta_converter
 )
 
-from configman.environment import environment
+from configman.environment import environment, PrefixedEnvironment
+from configman.frozen_config import CompiledConfig, FrozenConfig
 # this next line brings in command_line and, if argparse is available,
 # a definition of the configman version of ArgumentParser.  Why is it done
 # with "import *" ? Because we don't know what symbols to import, the decision
@@ -33,6 +34,18 @@ from configman.environment import environment
 from configman.commandline import *
 
 
+#------------------------------------------------------------------------------
+def __getattr__(name):
+    """ArgumentParser is only imported from configman.commandline when it is
+    first asked for.  Python 3.7 and later look up module attributes that
+    don't exist here, earlier versions get it from the import above."""
+    if name == 'ArgumentParser':
+        from configman.commandline import ArgumentParser
+        return ArgumentParser
+    raise AttributeError(
+        "module %r has no attribute %r" % (__name__, name)
+    )
+
 
 #------------------------------------------------------------------------------
 def configuration(*args, **kwargs):
@@ -9,11 +9,25 @@
 # this line
 from __future__ import absolute_import, division, print_function
 import getopt as command_line
+from sys import version_info as _version_info
 
-try:
-    # keep this commented out until we want argparse as the default
-    # import argparse as command_line
-    from configman.def_sources.for_argparse import ArgumentParser
-except ImportError:
-    # argparse is not available, we can silently ignore this problem
-    pass
+
+#------------------------------------------------------------------------------
+def __getattr__(name):
+    """the configman version of ArgumentParser, and argparse with it, is only
+    imported when it is first asked for.  Python 3.7 and later look up
+    module attributes that don't exist here."""
+    if name == 'ArgumentParser':
+        from configman.def_sources.for_argparse import ArgumentParser
+        return ArgumentParser
+    raise AttributeError(name)
+
+
+if _version_info < (3, 7):
+    try:
+        # keep this commented out until we want argparse as the default
+        # import argparse as command_line
+        from configman.def_sources.for_argparse import ArgumentParser
+    except ImportError:
+        # argparse is not available, we can silently ignore this problem
+        pass
@@ -41,12 +41,16 @@ from configman.environment import (
     environment
 )
 from configman.namespace import (
-    Namespace
+    Namespace,
+    OutputNamespace
 )
 from configman.option import (
     Option,
     Aggregation
 )
+from configman.frozen_config import FrozenConfig, CompiledConfig
+from configman.orderedset import OrderedSet
+from configman import snapshot
 
 # RequiredConfig is not used directly in this file, but made available as
 # a type to be imported from this module
@@ -57,6 +61,8 @@ from configman.value_sources import (
     config_filename_from_commandline,
     wrap_with_value_source_api,
     dispatch_request_to_write,
+    offers_lookups,
+    values_of,
     file_extension_dispatch,
     type_handler_dispatch
 )
@@ -82,6 +88,7 @@ class ConfigurationManager(object):
         config_pathname='.',
         config_optional=True,
         value_source_object_hook=DotDict,
+        snapshot_pathname=None,
     ):
         """create and initialize a configman object.
 
@@ -129,6 +136,12 @@ class ConfigurationManager(object):
                                      representation of a value source.
                                      This is used to enable any special
                                      processing, like key translations.
+          snapshot_pathname - (optional) the path and name of a file in which
+                              to keep a snapshot of the fully resolved
+                              configuration.  If the snapshot is up to date
+                              with the definition and value sources, it is
+                              used instead of building the configuration
+                              from scratch.  See configman.snapshot.
                             """
 
         # instead of allowing mutables as default keyword argument values...
@@ -168,6 +181,9 @@ class ConfigurationManager(object):
         self._config = None  # eventual container for DOM-like config object
 
         self.option_definitions = Namespace()
+        # fully qualified lookups into the option definitions are done so
+        # often that they warrant a flat index
+        self.option_definitions.enable_key_index()
         self.definition_source_list = definition_source_list
 
         command_line_value_source = command_line
@@ -228,43 +244,32 @@ class ConfigurationManager(object):
             admin_options = self._setup_admin_options(values_source_list)
             self.definition_source_list.append(admin_options)
 
-        # iterate through the option definitions to create the nested dict
-        # hierarchy of all the options called 'option_definitions'
-        for a_definition_source in self.definition_source_list:
+        # the pathname of the snapshot that the option definitions came from
+        self.restored_from_snapshot = None
+        snapshot_key = None
+        if snapshot_pathname:
             try:
-                safe_copy_of_def_source = a_definition_source.safe_copy()
-            except AttributeError:
-                # apparently, the definition source was not in the form of a
-                # Namespace object.  This isn't a show stopper, but we don't
-                # know how to make a copy of this object safely: we know from
-                # experience that the stock copy.copy method leads to grief
-                # as many sub-objects within an option definition source can
-                # not be copied that way (classes, for example).
-                # The only action we can take is to trust and continue with the
-                # original copy of the definition source.
-                safe_copy_of_def_source = a_definition_source
-            setup_definitions(
-                safe_copy_of_def_source,
-                self.option_definitions
+                snapshot_key = snapshot.source_key(self, values_source_list)
+            except snapshot.SnapshotNotPossible:
+                pass
+        if not (
+            snapshot_key
+            and self._load_snapshot(
+                snapshot_pathname,
+                snapshot_key,
+                values_source_list
             )
-
-        if use_admin_controls:
-            # the name of the config file needs to be loaded from the command
-            # line prior to processing the rest of the command line options.
-            config_filename = config_filename_from_commandline(self)
-            if (
-                config_filename
-                and ConfigFileFutureProxy in values_source_list
-            ):
-                self.option_definitions.admin.conf.default = config_filename
-
-        self.values_source_list = wrap_with_value_source_api(
-            values_source_list,
-            self
-        )
-
-        known_keys = self._overlay_expand()
-        self._check_for_mismatches(known_keys)
+        ):
+            self._build_option_definitions(
+                values_source_list,
+                use_admin_controls
+            )
+            if snapshot_key:
+                self._save_snapshot(
+                    snapshot_pathname,
+                    snapshot_key,
+                    values_source_list
+                )
 
         # the app_name, app_version and app_description are to come from
         # if 'application' option if it is present. If it is not present,
@@ -315,6 +320,98 @@ class ConfigurationManager(object):
         if quit_after_admin and admin_tasks_done:
             sys.exit()
 
+    #--------------------------------------------------------------------------
+    def _build_option_definitions(
+        self,
+        values_source_list,
+        use_admin_controls
+    ):
+        """build the fully resolved option definitions from scratch: walk the
+        definition sources, then overlay and expand the values from the value
+        sources until no new options appear."""
+        # iterate through the option definitions to create the nested dict
+        # hierarchy of all the options called 'option_definitions'
+        for a_definition_source in self.definition_source_list:
+            try:
+                safe_copy_of_def_source = a_definition_source.safe_copy()
+            except AttributeError:
+                # apparently, the definition source was not in the form of a
+                # Namespace object.  This isn't a show stopper, but we don't
+                # know how to make a copy of this object safely: we know from
+                # experience that the stock copy.copy method leads to grief
+                # as many sub-objects within an option definition source can
+                # not be copied that way (classes, for example).
+                # The only action we can take is to trust and continue with the
+                # original copy of the definition source.
+                safe_copy_of_def_source = a_definition_source
+            setup_definitions(
+                safe_copy_of_def_source,
+                self.option_definitions
+            )
+
+        if use_admin_controls:
+            # the name of the config file needs to be loaded from the command
+            # line prior to processing the rest of the command line options.
+            config_filename = config_filename_from_commandline(self)
+            if (
+                config_filename
+                and ConfigFileFutureProxy in values_source_list
+            ):
+                self.option_definitions.admin.conf.default = config_filename
+
+        self.values_source_list = wrap_with_value_source_api(
+            values_source_list,
+            self
+        )
+
+        known_keys = self._overlay_expand()
+        self._check_for_mismatches(known_keys)
+
+    #--------------------------------------------------------------------------
+    def _load_snapshot(self, snapshot_pathname, snapshot_key,
+                       values_source_list):
+        """restore the fully resolved option definitions from a snapshot.
+        Returns False if there is no usable snapshot."""
+        state = snapshot.load_snapshot(
+            snapshot_pathname,
+            snapshot_key,
+            functools.partial(snapshot.mapping_key, self, values_source_list)
+        )
+        if state is None:
+            return False
+        self.option_definitions = state['option_definitions']
+        self.option_definitions.enable_key_index()
+        self.args = state['args']
+        # the value sources were not consulted, they were accounted for when
+        # the snapshot was made
+        self.values_source_list = []
+        self._defaults_before_overlay = {}
+        self.restored_from_snapshot = snapshot_pathname
+        return True
+
+    #--------------------------------------------------------------------------
+    def _save_snapshot(self, snapshot_pathname, snapshot_key,
+                       values_source_list):
+        """save the fully resolved option definitions.  Failure to save a
+        snapshot is not an error, the next run just has to build the
+        configuration from scratch again."""
+        state = {
+            'option_definitions': self.option_definitions,
+            'args': self.args,
+        }
+        try:
+            option_keys = snapshot.defined_option_keys(self)
+            snapshot.save_snapshot(
+                snapshot_pathname,
+                snapshot_key,
+                snapshot.files_consulted(self, values_source_list),
+                state,
+                option_keys,
+                snapshot.mapping_key(self, values_source_list, option_keys)
+            )
+        except (snapshot.SnapshotNotPossible, IOError, OSError):
+            pass
+
     #--------------------------------------------------------------------------
     @contextlib.contextmanager
     def context(self, mapping_class=DotDictWithAcquisition):
@@ -330,6 +427,12 @@ class ConfigurationManager(object):
 
     #--------------------------------------------------------------------------
     def get_config(self, mapping_class=DotDictWithAcquisition):
+        """return the values of the options in a nested mapping of the
+        given class.  If the class is CompiledConfig or a class derived from
+        it, the result is a tree of immutable objects of classes generated
+        with a slot for each key of each namespace."""
+        if issubclass(mapping_class, CompiledConfig):
+            return mapping_class.from_mapping(self.get_config())
         config = self._generate_config(mapping_class)
         if self._aggregate(self.option_definitions, config, config):
             # state changed, must regenerate
@@ -337,6 +440,13 @@ class ConfigurationManager(object):
         else:
             return config
 
+    #--------------------------------------------------------------------------
+    def get_frozen_config(self):
+        """return the configuration as a FrozenConfig: immutable, hashable
+        and safe to share between threads without locks.  Lookups work the
+        same as for the DotDictWithAcquisition returned by 'get_config'."""
+        return FrozenConfig(self.get_config())
+
     #--------------------------------------------------------------------------
     def output_summary(self, output_stream=sys.stdout):
         """outputs a usage tip and the list of acceptable commands.
@@ -363,7 +473,7 @@ class ConfigurationManager(object):
         bracket_count = 0
         # this section prints the non-switch command line arguments
         for key in names_list:
-            an_option = self.option_definitions[key]
+            an_option = self.option_definitions.peek(key)
             if an_option.is_argument:
                 if an_option.default is None:
                     # there's no option, assume the user must set this
@@ -487,37 +597,15 @@ class ConfigurationManager(object):
         if skip_keys:
             blocked_keys.extend(skip_keys)
 
-        if blocked_keys:
-            option_defs = self.option_definitions.safe_copy()
-            for a_blocked_key in blocked_keys:
-                try:
-                    del option_defs[a_blocked_key]
-                except (AttributeError, KeyError):
-                    # okay that key isn't here
-                    pass
-            # remove empty namespaces
-            all_keys = [k for k in
-                        option_defs.keys_breadth_first(include_dicts=True)]
-            for key in all_keys:
-                candidate = option_defs[key]
-                if (isinstance(candidate, Namespace) and not len(candidate)):
-                    del option_defs[key]
-        else:
-            option_defs = self.option_definitions
-
-        # find all of the secret options and overwrite their values with
-        # '*' * 16
-        if not self.option_definitions.admin.expose_secrets.default:
-            for a_key in option_defs.keys_breadth_first():
-                an_option = option_defs[a_key]
-                if (
-                    (not a_key.startswith('admin'))
-                    and isinstance(an_option, Option)
-                    and an_option.secret
-                ):
-                    # force the option to be a string of *
-                    option_defs[a_key].value = '*' * 16
-                    option_defs[a_key].from_string_converter = str
+        # the blocked keys, the namespaces left empty and the secrets are
+        # dealt with by a view as the writer walks the tree, not by changing
+        # a copy of the whole tree up front
+        expose_secrets = self.option_definitions.admin.expose_secrets.default
+        option_defs = OutputNamespace(
+            self.option_definitions,
+            blocked_keys,
+            mask_secrets=not expose_secrets
+        )
 
         dispatch_request_to_write(config_file_type, option_defs, opener)
 
@@ -532,13 +620,13 @@ class ConfigurationManager(object):
         logger.info("app_name: %s", self.app_name)
         logger.info("app_version: %s", self.app_version)
         logger.info("current configuration:")
-        config = [(key, self.option_definitions[key].value)
+        config = [(key, self.option_definitions.peek(key).value)
                   for key in self.option_definitions.keys_breadth_first()
                   if key not in self.keys_blocked_from_output]
         config.sort()
         for key, val in config:
             if (
-                self.option_definitions[key].secret
+                self.option_definitions.peek(key).secret
                 or 'password' in key.lower()
             ):
                 logger.info('%s: *********', key)
@@ -559,26 +647,33 @@ class ConfigurationManager(object):
             Namespace names.
         """
         return [x for x in self.option_definitions.keys_breadth_first()
-                if isinstance(self.option_definitions[x], Option)]
+                if isinstance(self.option_definitions.peek(x), Option)]
 
     #--------------------------------------------------------------------------
-    def _create_reference_value_options(self, keys, finished_keys):
-        """this method steps through the option definitions looking for
+    def _create_reference_value_options(self, keys, known_keys):
+        """this method steps through the given option keys looking for
         alt paths.  On finding one, it creates the 'reference_value_from' links
-        within the option definitions and populates it with copied options."""
+        within the option definitions and populates it with copied options.
+
+        parameters:
+            keys - the option keys to examine, normally just those that are
+                   waiting to be overlaid and expanded
+            known_keys - a set of the names of all Options already defined"""
         # a set of known reference_value_from_links
         set_of_reference_value_option_names = set()
         for key in keys:
-            if key in finished_keys:
-                continue
-            an_option = self.option_definitions[key]
+            an_option = self.option_definitions.peek(key)
             if an_option.reference_value_from:
 
                 fully_qualified_reference_name = '.'.join((
                     an_option.reference_value_from,
                     an_option.name
                 ))
-                if fully_qualified_reference_name in keys:
+                if (
+                    fully_qualified_reference_name in known_keys
+                    or fully_qualified_reference_name
+                    in set_of_reference_value_option_names
+                ):
                     continue  # this referenced value has already been defined
                               # no need to repeat it - skip on to the next key
                 reference_option = an_option.copy()
@@ -605,132 +700,158 @@ class ConfigurationManager(object):
     #--------------------------------------------------------------------------
     def _overlay_expand(self):
         """This method overlays each of the value sources onto the default
-        in each of the defined options.  It does so using a breadth first
-        iteration, overlaying and expanding each level of the tree in turn.
-        As soon as no changes were made to any level, the loop breaks and the
-        work is done.  The actual action of the overlay is to take the value
-        from the source and copy into the 'default' member of each Option
-        object.
+        in each of the defined options.  It works from a worklist of 'dirty'
+        keys: initially every defined option, and thereafter only those keys
+        that were brought in or disturbed by the previous expansion pass.
+        As soon as a pass leaves no dirty keys behind, the work is done.  The
+        actual action of the overlay is to take the value from the source and
+        copy into the 'default' member of each Option object.
 
         "expansion" means converting an option value into its real type from
         string. The conversion is accomplished by simply calling the
         'set_value' method of the Option object.  If the resultant type has its
         own configuration options, bring those into the current namespace and
         then proceed to overlay/expand those.
+
+        returns:
+            a set of the fully qualified names of all the known Options
         """
-        new_keys_have_been_discovered = True  # loop control, False breaks loop
-        finished_keys = set()
+        # this is the only full walk of the option definitions.  From here
+        # on, 'known_keys' is extended as new Options are brought in by
+        # expansion.
+        known_keys = set()
+        dirty_keys = OrderedSet()  # the worklist for the next pass
+        for a_key in self.option_definitions.keys_breadth_first():
+            if isinstance(self.option_definitions.peek(a_key), Option):
+                known_keys.add(a_key)
+                dirty_keys.add(a_key)
         all_reference_values = {}
-
-        while new_keys_have_been_discovered:  # loop until nothing more is done
-            # names_of_all_exsting_options holds a list of all keys in the
-            # option definitons in breadth first order using this form:
-            # [ 'x', 'y', 'z', 'x.a', 'x.b', 'z.a', 'z.b', 'x.a.j', 'x.a.k',
-            # 'x.b.h']
-            names_of_all_exsting_options = [
-                x for x
-                in self.option_definitions.keys_breadth_first()
-                if isinstance(self.option_definitions[x], Option)
-            ]
-            new_keys_have_been_discovered = False  # setup to break loop
-
+        # the values sources are only consulted again when the set of known
+        # keys has grown since the last time that they were asked.  Sources
+        # like the command line can only offer values for keys that they
+        # know about.
+        values_from_all_sources = None
+        number_of_known_keys_at_last_fetch = None
+        # the defaults of the options as they were before any value source
+        # was overlaid.  A reload needs them to overlay the value sources
+        # again.
+        self._defaults_before_overlay = {}
+
+        def mark_dirty(keys, pending_keys):
+            # queue keys for the next pass unless they're still waiting to
+            # be processed in the current pass
+            for a_key in keys:
+                if a_key not in pending_keys:
+                    dirty_keys.add(a_key)
+
+        while dirty_keys:
             # create alternate paths options
             set_of_reference_value_option_names = \
                 self._create_reference_value_options(
-                    names_of_all_exsting_options,
-                    finished_keys
+                    dirty_keys,
+                    known_keys
                 )
-
             for a_ref_option_name in set_of_reference_value_option_names:
                 if a_ref_option_name not in all_reference_values:
                     all_reference_values[a_ref_option_name] = []
+            known_keys.update(set_of_reference_value_option_names)
 
-            all_keys = list(set_of_reference_value_option_names) \
-                + names_of_all_exsting_options
-
-            # previous versions of this method pulled the values from the
-            # values sources deeper within the following nested loops.
-            # that was not necessary and caused a lot of redundant work.
-            # the 'values_from_all_sources' now holds all the the values
-            # from each of the value sources.
-            values_from_all_sources = [
-                a_value_source.get_values(
-                    self,  # pass in the config_manager itself
-                    True,  # ignore mismatches
-                    self.value_source_object_hook  # build with this class
-                )
-                for a_value_source in self.values_source_list
-            ]
+            # the keys to be worked in this pass.  The reference value
+            # options go first so that their values are in place before the
+            # options that refer to them are overlaid.
+            keys_for_this_pass = OrderedSet(
+                sorted(set_of_reference_value_option_names)
+            )
+            keys_for_this_pass |= dirty_keys
+            dirty_keys = OrderedSet()
+            # keys from this pass that have not yet been overlaid and those
+            # that have not yet been expanded.  A key disturbed while it is
+            # still pending in this pass need not be queued for the next one.
+            keys_pending_overlay = set(keys_for_this_pass)
+            keys_pending_expansion = set(keys_for_this_pass)
+
+            if number_of_known_keys_at_last_fetch != len(known_keys):
+                # previous versions of this method pulled the values from the
+                # values sources deeper within the following nested loops.
+                # that was not necessary and caused a lot of redundant work.
+                # the 'values_from_all_sources' now holds all the the values
+                # from each of the value sources.
+                # value sources that offer lookups of single keys are not
+                # copied, see 'values_of'
+                values_from_all_sources = [
+                    values_of(
+                        a_value_source,
+                        self,  # pass in the config_manager itself
+                        True,  # ignore mismatches
+                        self.value_source_object_hook  # build with this class
+                    )
+                    for a_value_source in self.values_source_list
+                ]
+                number_of_known_keys_at_last_fetch = len(known_keys)
 
             # overlay process:
             # fetch all the default values from the value sources before
             # applying the from string conversions
-
-            for key in all_keys:
-                if key in finished_keys:
-                    continue
-                #if not isinstance(an_option, Option):
-                #   continue  # aggregations and other types are ignored
+            for key in keys_for_this_pass:
+                keys_pending_overlay.discard(key)
+                # the Option may still be shared with the Namespace that it
+                # was defined in, it is only copied if it is to change
+                an_option = self.option_definitions.peek(key)
+                default = an_option.default
+                has_changed = an_option.has_changed
                 # loop through all the value sources looking for values
                 # that match this current key.
-                if self.option_definitions[key].reference_value_from:
-                    reference_value_from = (
-                        self.option_definitions[key].reference_value_from
-                    )
+                if an_option.reference_value_from:
+                    reference_value_from = an_option.reference_value_from
                     top_key = key.split('.')[-1]
-                    self.option_definitions[key].default = (
-                        self.option_definitions[reference_value_from]
-                        [top_key].default
-                    )
+                    default = self.option_definitions.peek(
+                        '.'.join((reference_value_from, top_key))
+                    ).default
                     all_reference_values[
                         '.'.join((reference_value_from, top_key))
                     ].append(
                         key
                     )
 
-                an_option = self.option_definitions[key]
                 if key in all_reference_values:
                     # make sure that this value gets propagated to keys
                     # even if the keys have already been overlaid
-                    finished_keys -= set(
-                        all_reference_values[key]
+                    mark_dirty(
+                        all_reference_values[key],
+                        keys_pending_overlay
                     )
 
+                if key not in self._defaults_before_overlay:
+                    self._defaults_before_overlay[key] = default
                 for val_src_dict in values_from_all_sources:
                     try:
-
                         # overlay the default with the new value from
                         # the value source.  This assignment may come
                         # via acquisition, so the key given may not have
                         # been an exact match for what was returned.
-                        an_option.has_changed = (
-                            an_option.default != val_src_dict[key]
-                        )
-                        an_option.default = val_src_dict[key]
-                        if key in all_reference_values:
-                            # make sure that this value gets propagated to keys
-                            # even if the keys have already been overlaid
-                            finished_keys -= set(
-                                all_reference_values[key]
-                            )
+                        has_changed = default != val_src_dict[key]
+                        default = val_src_dict[key]
                     except KeyError as x:
                         pass  # okay, that source doesn't have this value
+                if (
+                    default is not an_option.default
+                    or has_changed != an_option.has_changed
+                ):
+                    an_option = self.option_definitions[key]
+                    an_option.default = default
+                    an_option.has_changed = has_changed
 
             # expansion process:
             # step through all the keys converting them to their proper
             # types and bringing in any new keys in the process
-            for key in all_keys:
-                if key in finished_keys:
-                    continue
-                # mark this key as having been seen and processed
-                finished_keys.add(key)
-                an_option = self.option_definitions[key]
-                #if not isinstance(an_option, Option):
-                #    continue  # aggregations, namespaces are ignored
-                # apply the from string conversion to make the real value
-                an_option.set_value(an_option.default)
-                # new values have been seen, don't let loop break
-                new_keys_have_been_discovered = True
+            for key in keys_for_this_pass:
+                keys_pending_expansion.discard(key)
+                an_option = self.option_definitions.peek(key)
+                if not an_option._is_set_to(an_option.default):
+                    # apply the from string conversion to make the real
+                    # value
+                    an_option = self.option_definitions[key]
+                    an_option.set_value(an_option.default)
                 try:
                     try:
                         # try to fetch new requirements from this value
@@ -766,22 +887,28 @@ class ConfigurationManager(object):
                         # targets
                         continue
                     # some new Options to be brought in may have already been
-                    # seen and in the finished_keys set.  They must be reset
-                    # as unfinished so that a new default doesn't permanently
-                    # overwrite any of the values already placed by the
-                    # overlays.  So we've got to remove those keys from the
-                    # finished keys list.
+                    # seen and overlaid.  They must be marked dirty so that a
+                    # new default doesn't permanently overwrite any of the
+                    # values already placed by the overlays.
                     # Before we can do that however, we need the fully
                     # qualified names for the new keys.
                     qualified_parent_name_list = key.rsplit('.', 1)
                     if len(qualified_parent_name_list) > 1:
-                        qualified_parent_name = qualified_parent_name_list[0]
+                        qualified_parent_prefix = \
+                            qualified_parent_name_list[0] + '.'
                     else:
-                        qualified_parent_name = ''
-
-                    finished_keys = finished_keys.difference(
-                        '.'.join((qualified_parent_name, ref_option_name))
-                        for ref_option_name in new_requirements
+                        qualified_parent_prefix = ''
+
+                    mark_dirty(
+                        (
+                            qualified_key
+                            for qualified_key in (
+                                qualified_parent_prefix + ref_option_name
+                                for ref_option_name in new_requirements
+                            )
+                            if qualified_key in known_keys
+                        ),
+                        keys_pending_expansion
                     )
                     # add the new Options to the namespace
                     new_namespace = new_requirements.safe_copy(
@@ -790,16 +917,105 @@ class ConfigurationManager(object):
 
                     for new_key in new_namespace.keys_breadth_first():
                         if new_key not in current_namespace:
-                            current_namespace[new_key] = new_namespace[new_key]
+                            new_value = current_namespace.share_from(
+                                new_namespace,
+                                new_key
+                            )
+                            if isinstance(new_value, Option):
+                                # a brand new Option, queue it for the next
+                                # pass
+                                qualified_key = \
+                                    qualified_parent_prefix + new_key
+                                known_keys.add(qualified_key)
+                                dirty_keys.add(qualified_key)
                 except AttributeError as x:
                     # there are apparently no new Options to bring in from
                     # this option's value
                     pass
-        return finished_keys
+        return known_keys
+
+    #--------------------------------------------------------------------------
+    def _overlay_again(self, keys):
+        """overlay the value sources onto the options with the given keys
+        once more, starting from the defaults that they had before the first
+        overlay.  Used when value sources have been replaced with newer
+        versions of themselves.  Options are not expanded again: a change to
+        an option that brings in other options changes its value, but the
+        options that it brings in stay as they are.
+
+        As in '_overlay_expand', an option with 'reference_value_from' starts
+        from the default of the option that it refers to.  The options that
+        refer to one of the given keys are overlaid again too, after it.
+
+        returns:
+            a list of tuples (key, old value, new value) for every option
+            whose value changed"""
+        values_from_all_sources = [
+            values_of(
+                a_value_source,
+                self,
+                True,
+                self.value_source_object_hook
+            )
+            for a_value_source in self.values_source_list
+        ]
+        # the keys of the options that refer to each referenced option
+        referring_keys = {}
+        for a_key in self.option_definitions.keys_breadth_first():
+            an_option = self.option_definitions.peek(a_key)
+            if (
+                isinstance(an_option, Option)
+                and an_option.reference_value_from
+            ):
+                referring_keys.setdefault(
+                    '.'.join((
+                        an_option.reference_value_from,
+                        a_key.split('.')[-1]
+                    )),
+                    []
+                ).append(a_key)
+        keys = set(keys)
+        # the referenced options go first so that their new values are in
+        # place before the options that refer to them are overlaid
+        keys_in_order = OrderedSet(sorted(keys.intersection(referring_keys)))
+        for a_key in keys_in_order:
+            keys.update(referring_keys[a_key])
+        keys_in_order |= sorted(keys)
+        changes = []
+        for key in keys_in_order:
+            an_option = self.option_definitions[key]
+            old_value = an_option.value
+            if an_option.reference_value_from:
+                an_option.default = self.option_definitions.peek(
+                    '.'.join((
+                        an_option.reference_value_from,
+                        key.split('.')[-1]
+                    ))
+                ).default
+            else:
+                an_option.default = self._defaults_before_overlay.get(
+                    key,
+                    an_option.default
+                )
+            an_option.has_changed = False
+            for val_src_dict in values_from_all_sources:
+                try:
+                    an_option.has_changed = (
+                        an_option.default != val_src_dict[key]
+                    )
+                    an_option.default = val_src_dict[key]
+                except KeyError:
+                    pass  # okay, that source doesn't have this value
+            an_option.set_value(an_option.default)
+            if an_option.value != old_value:
+                changes.append((key, old_value, an_option.value))
+        return changes
 
     #--------------------------------------------------------------------------
     def _check_for_mismatches(self, known_keys):
         """check for bad options from value sources"""
+        # built only if there are unmatched keys to check against it
+        known_key_suffixes = None
         for a_value_source in self.values_source_list:
             try:
                 if a_value_source.always_ignore_mismatches:
@@ -821,15 +1037,24 @@ class ConfigurationManager(object):
                 allow_mismatches = True
             # make a set of all the keys from a value source in the form
             # of strings like this: 'x.y.z'
-            value_source_mapping = a_value_source.get_values(
-                self,
-                allow_mismatches,
-                self.value_source_object_hook
-            )
-            value_source_keys_set = set([
-                k for k in
-                DotDict(value_source_mapping).keys_breadth_first()
-            ])
+            if (
+                self.value_source_object_hook in (
+                    DotDict,
+                    DotDictWithAcquisition
+                )
+                and offers_lookups(a_value_source)
+            ):
+                value_source_keys_set = set(a_value_source.keys())
+            else:
+                value_source_mapping = a_value_source.get_values(
+                    self,
+                    allow_mismatches,
+                    self.value_source_object_hook
+                )
+                value_source_keys_set = set([
+                    k for k in
+                    DotDict(value_source_mapping).keys_breadth_first()
+                ])
             # make a set of the keys that didn't match any of the known
             # keys in the requirements
             unmatched_keys = value_source_keys_set.difference(known_keys)
@@ -837,13 +1062,10 @@ class ConfigurationManager(object):
             # used during acquisition.
             # remove keys of the form 'y.z' if they match a known key of the
             # form 'x.y.z'
-            for key in unmatched_keys.copy():
-                key_is_okay = six.moves.reduce(
-                    lambda x, y: x or y,
-                    (known_key.endswith(key) for known_key in known_keys)
-                )
-                if key_is_okay:
-                    unmatched_keys.remove(key)
+            if unmatched_keys:
+                if known_key_suffixes is None:
+                    known_key_suffixes = self._dotted_suffixes(known_keys)
+                unmatched_keys.difference_update(known_key_suffixes)
             # anything left in the unmatched_key set is a badly formed key.
             # issue a warning
             if unmatched_keys:
@@ -862,6 +1084,22 @@ class ConfigurationManager(object):
                         'Invalid options: %s' % ', '.join(sorted(unmatched_keys))
                     )
 
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _dotted_suffixes(keys):
+        """return the set of all the suffixes of the keys that start at a
+        dot boundary: 'x.y.z' contributes 'x.y.z', 'y.z' and 'z'.  Testing a
+        key for membership in this set tells if it could have been acquired
+        by one of the keys."""
+        suffixes = set()
+        for a_key in keys:
+            suffixes.add(a_key)
+            dot_index = a_key.find('.')
+            while dot_index != -1:
+                suffixes.add(a_key[dot_index + 1:])
+                dot_index = a_key.find('.', dot_index + 1)
+        return suffixes
+
     #--------------------------------------------------------------------------
     @staticmethod
     def _walk_and_close(a_dict):
@@ -947,9 +1185,10 @@ class ConfigurationManager(object):
 
     #--------------------------------------------------------------------------
     def _walk_config_copy_values(self, source, destination, mapping_class):
-        for key, val in source.items():
+        for key in source.keys():
             if key.endswith('$'):
                 continue
+            val = source.peek(key)
             value_type = type(val)
             if isinstance(val, Option) or isinstance(val, Aggregation):
                 destination[key] = val.value
@@ -960,7 +1199,8 @@ class ConfigurationManager(object):
     #--------------------------------------------------------------------------
     def _aggregate(self, source, base_namespace, local_namespace):
         aggregates_found = False
-        for key, val in source.items():
+        for key in source.keys():
+            val = source.peek(key)
             if isinstance(val, Namespace):
                 new_aggregates_found = self._aggregate(
                     val,
@@ -986,13 +1226,13 @@ class ConfigurationManager(object):
     #--------------------------------------------------------------------------
     def _get_option(self, name):
         try:
-            return self.option_definitions[name]
+            return self.option_definitions.peek(name)
         except KeyError:
             raise NotAnOptionError('%s is not a known option name' % name)
 
     #--------------------------------------------------------------------------
     def _get_options(self, source=None, options=None, prefix=''):
         return [
-            (key, self.option_definitions[key])
+            (key, self.option_definitions.peek(key))
             for key in self.option_definitions.keys_breadth_first()
         ]
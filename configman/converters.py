@@ -3,6 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
 
+import collections
 import sys
 import re
 import datetime
@@ -135,6 +136,49 @@ def str_to_boolean(input_str):
 boolean_converter = str_to_boolean  # for backward compatiblity
 
 
+#------------------------------------------------------------------------------
+# dotted paths resolve to the same objects over and over again: every class
+# option, every converter given as a string.  Rather than importing again,
+# remember which module had to be imported to resolve each path.  Since an
+# entry is only used while that module is still in sys.modules, removing or
+# reloading a module invalidates its entries.
+_python_object_resolutions = {}
+# the first attempt to resolve a path is to import it in its entirety as a
+# module.  For paths that end with a class or function name that always fails
+# and failing an import is expensive.  Failed probes are remembered for as long
+# as a module by that name doesn't appear in sys.modules.
+_failed_module_probes = set()
+
+
+#------------------------------------------------------------------------------
+def clear_python_object_cache():
+    """forget all resolved paths and failed module probes.  Needed only if
+    new modules appear on the filesystem during the run of a program"""
+    _python_object_resolutions.clear()
+    _failed_module_probes.clear()
+
+
+#------------------------------------------------------------------------------
+def _import_for_python_object(input_str, parts):
+    """import the module required to resolve a dotted path.  Returns the name
+    of the imported module and the parts of the path to walk to get the object
+    from the top level package."""
+    if input_str in sys.modules or input_str not in _failed_module_probes:
+        try:
+            # first try as a complete module
+            __import__(input_str)
+            return input_str, parts
+        except ImportError:
+            _failed_module_probes.add(input_str)
+    # it must be a class from a module
+    if len(parts) == 1:
+        # since it has only one part, it must be a class from __main__
+        parts = ('__main__', input_str)
+    module_name = '.'.join(parts[:-1])
+    __import__(module_name, globals(), locals(), [])
+    return module_name, parts
+
+
 #------------------------------------------------------------------------------
 def str_to_python_object(input_str):
     """ a conversion that will import a module and class name
@@ -151,18 +195,16 @@ def str_to_python_object(input_str):
     input_str = str_quote_stripper(input_str)
     if '.' not in input_str and input_str in known_mapping_str_to_type:
         return known_mapping_str_to_type[input_str]
-    parts = [x.strip() for x in input_str.split('.') if x.strip()]
     try:
         try:
-            # first try as a complete module
-            package = __import__(input_str)
-        except ImportError:
-            # it must be a class from a module
-            if len(parts) == 1:
-                # since it has only one part, it must be a class from __main__
-                parts = ('__main__', input_str)
-            package = __import__('.'.join(parts[:-1]), globals(), locals(), [])
-        obj = package
+            module_name, parts = _python_object_resolutions[input_str]
+            if module_name not in sys.modules or parts[0] not in sys.modules:
+                raise KeyError(input_str)
+        except KeyError:
+            parts = [x.strip() for x in input_str.split('.') if x.strip()]
+            module_name, parts = _import_for_python_object(input_str, parts)
+            _python_object_resolutions[input_str] = (module_name, parts)
+        obj = sys.modules[parts[0]]
         for name in parts[1:]:
             obj = getattr(obj, name)
         return obj
@@ -174,6 +216,139 @@ def str_to_python_object(input_str):
 class_converter = str_to_python_object  # for backward compatibility
 
 
+#==============================================================================
+class LazilyImportedModules(collections.MutableSequence):
+    """a list of modules, some of which may be given by name.  A module
+    given by name is imported when it is first read from the list."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, modules=()):
+        self._modules = list(modules)
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        a_module = self._modules[index]
+        if isinstance(a_module, six.string_types):
+            a_module = self._modules[index] = str_to_python_object(a_module)
+        return a_module
+
+    #--------------------------------------------------------------------------
+    def __setitem__(self, index, a_module):
+        self._modules[index] = a_module
+
+    #--------------------------------------------------------------------------
+    def __delitem__(self, index):
+        del self._modules[index]
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._modules)
+
+    #--------------------------------------------------------------------------
+    def insert(self, index, a_module):
+        self._modules.insert(index, a_module)
+
+    #--------------------------------------------------------------------------
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    #--------------------------------------------------------------------------
+    def __ne__(self, other):
+        return not self == other
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self._modules)
+
+
+
+#==============================================================================
+class FilledOnFirstRead(object):
+    """a mixin for a dict that is filled from some modules when it is first
+    read, so that those modules are not imported before they are needed.
+    The modules, usually a LazilyImportedModules, are set as
+    '_unread_modules'.  A derived class adds what it takes from a module in
+    '_fill_from'."""
+
+    _unread_modules = ()
+
+    #--------------------------------------------------------------------------
+    def _fill(self):
+        modules = self._unread_modules
+        if modules:
+            # this could be read again while it is being filled
+            self._unread_modules = ()
+            for a_module in modules:
+                self._fill_from(a_module)
+
+    #--------------------------------------------------------------------------
+    def _fill_from(self, a_module):
+        raise NotImplementedError
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+        self._fill()
+        return super(FilledOnFirstRead, self).__getitem__(key)
+
+    #--------------------------------------------------------------------------
+    def get(self, key, default=None):
+        self._fill()
+        return super(FilledOnFirstRead, self).get(key, default)
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        self._fill()
+        return super(FilledOnFirstRead, self).__contains__(key)
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+        self._fill()
+        return super(FilledOnFirstRead, self).__iter__()
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        self._fill()
+        return super(FilledOnFirstRead, self).__len__()
+
+    #--------------------------------------------------------------------------
+    def keys(self):
+        self._fill()
+        return super(FilledOnFirstRead, self).keys()
+
+    #--------------------------------------------------------------------------
+    def values(self):
+        self._fill()
+        return super(FilledOnFirstRead, self).values()
+
+    #--------------------------------------------------------------------------
+    def items(self):
+        self._fill()
+        return super(FilledOnFirstRead, self).items()
+
+    #--------------------------------------------------------------------------
+    def copy(self):
+        self._fill()
+        return super(FilledOnFirstRead, self).copy()
+
+    if six.PY2:
+        #----------------------------------------------------------------------
+        def iterkeys(self):
+            self._fill()
+            return super(FilledOnFirstRead, self).iterkeys()
+
+        #----------------------------------------------------------------------
+        def itervalues(self):
+            self._fill()
+            return super(FilledOnFirstRead, self).itervalues()
+
+        #----------------------------------------------------------------------
+        def iteritems(self):
+            self._fill()
+            return super(FilledOnFirstRead, self).iteritems()
+
+
 #------------------------------------------------------------------------------
 def str_to_classes_in_namespaces(
     template_for_namespace="cls%d",
@@ -1,6 +1,6 @@
 from __future__ import absolute_import, division, print_function
-import collections
-import six
+
+from configman.converters import FilledOnFirstRead, LazilyImportedModules
 
 # This Source Code Form is subject to the terms of the Mozilla Public
 # License, v. 2.0. If a copy of the MPL was not distributed with this
@@ -9,26 +9,31 @@ import six
 # TODO: This is a temporary dispatch mechanism.  This whole system
 # is to be changed to automatic discovery of the for_* modules
 
-from configman.def_sources import for_mappings
-from configman.def_sources import for_modules
-from configman.def_sources import for_json
-
-definition_dispatch = {
-    collections.Mapping: for_mappings.setup_definitions,
-    type(for_modules): for_modules.setup_definitions,
-    six.binary_type: for_json.setup_definitions,
-    six.text_type: for_json.setup_definitions,
-}
-
-
-try:
-    from configman.def_sources import for_argparse
-    import argparse
-    definition_dispatch[argparse.ArgumentParser] = \
-        for_argparse.setup_definitions
-except ImportError:
-    # silently ignore that argparse doesn't exist
-    pass
+# the definition source modules, each with a 'can_handle' sequence of the
+# types that its 'setup_definitions' accepts.  They're imported when
+# 'definition_dispatch' is first read, not along with configman.
+for_definition_sources = LazilyImportedModules([
+    'configman.def_sources.for_mappings',
+    'configman.def_sources.for_modules',
+    'configman.def_sources.for_json',
+    'configman.def_sources.for_argparse',
+])
+
+
+#==============================================================================
+class DefinitionDispatch(FilledOnFirstRead, dict):
+    """the type of a definition source -> the function that sets up its
+    definitions.  A type given a function before this is first read keeps
+    it."""
+
+    #--------------------------------------------------------------------------
+    def _fill_from(self, a_module):
+        for a_type in a_module.can_handle:
+            self.setdefault(a_type, a_module.setup_definitions)
+
+
+definition_dispatch = DefinitionDispatch()
+definition_dispatch._unread_modules = for_definition_sources
 
 
 class UnknownDefinitionTypeException(Exception):
@@ -28,6 +28,11 @@ from configman.converters import (
     CannotConvertError
 )
 
+# the types of the definition sources that this module sets up
+can_handle = (
+    argparse.ArgumentParser,
+)
+
 
 #-----------------------------------------------------------------------------
 # horrors
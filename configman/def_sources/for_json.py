@@ -3,8 +3,15 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
 import json
+import six
 from configman.def_sources import for_mappings
 
+# the types of the definition sources that this module sets up
+can_handle = (
+    six.binary_type,
+    six.text_type,
+)
+
 
 def setup_definitions(source, destination):
     try:
@@ -12,14 +12,31 @@ from configman.option import (
     Aggregation,
 )
 
+# the types of the definition sources that this module sets up
+can_handle = (
+    collections.Mapping,
+)
+
 
 #------------------------------------------------------------------------------
 def setup_definitions(source, destination):
-    for key, val in source.items():
+    # a Namespace made by 'safe_copy' shares its Options with the original
+    # until they are changed.  The destination shares them as well, and
+    # copies only those that setting up changes.
+    is_namespace = isinstance(source, Namespace)
+    for key in list(source.keys()):
         if key.startswith('__'):
             continue  # ignore these
+        val = source.peek(key) if is_namespace else source[key]
         if isinstance(val, Option):
-            destination[key] = val
+            if is_namespace:
+                destination.share_from(source, key)
+                if val.name and val._is_set_to(val.default):
+                    continue
+                # the destination's own copy if it was shared
+                val = destination[key]
+            else:
+                destination[key] = val
             if not val.name:
                 val.name = key
             val.set_value(val.default)
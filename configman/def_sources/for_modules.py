@@ -2,9 +2,15 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
+import types
 from configman.def_sources.for_mappings import  \
     setup_definitions as setup_definitions_for_mappings
 
+# the types of the definition sources that this module sets up
+can_handle = (
+    types.ModuleType,
+)
+
 
 def setup_definitions(source, destination):
     module_dict = source.__dict__.copy()
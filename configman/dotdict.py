@@ -4,12 +4,21 @@
 from __future__ import absolute_import, division, print_function
 
 import collections
+import itertools
 import weakref
 import six
 
-from configman.orderedset import OrderedSet
+from configman.orderedset import CompactOrderedSet
 from configman.memoize import memoize
 
+# a marker for a key that has no value, None is a legitimate value
+_NOTHING = object()
+
+# the source of the numbers of the epochs of DotDict trees, see '_clock'.
+# 'next' on an itertools.count is atomic, so no two changes anywhere ever
+# start the same epoch.
+_epochs = itertools.count(1)
+
 
 #------------------------------------------------------------------------------
 def iteritems_breadth_first(a_mapping, include_dicts=False):
@@ -28,6 +37,40 @@ def iteritems_breadth_first(a_mapping, include_dicts=False):
             yield '%s.%s' % (key, sub_key), value
 
 
+#------------------------------------------------------------------------------
+def acquisition_keys(key):
+    """return the keys from which the key could be acquired, deepest first:
+    'x.y.z' may be acquired from 'x.y.z', 'x.z' and then 'z'"""
+    parts = key.split('.')
+    return [key] + [
+        '.'.join(parts[:an_index] + parts[-1:])
+        for an_index in range(len(parts) - 2, -1, -1)
+    ]
+
+
+#------------------------------------------------------------------------------
+def lookup_dotted_key(a_mapping, key):
+    """return the value of a key of the form 'x.y.z' from a set of nested
+    Mapping instances without copying them into a DotDict first.  The keys
+    of the mappings may themselves contain dots: 'x.y.z' is found as 'x.y'
+    then 'z' as well as 'x' then 'y.z'.  Raises KeyError if it isn't
+    there."""
+    if key in a_mapping:
+        return a_mapping[key]
+    index = key.find('.')
+    while index != -1:
+        prefix = key[:index]
+        if prefix in a_mapping:
+            value = a_mapping[prefix]
+            if isinstance(value, collections.Mapping):
+                try:
+                    return lookup_dotted_key(value, key[index + 1:])
+                except KeyError:
+                    pass
+        index = key.find('.', index + 1)
+    raise KeyError(key)
+
+
 #------------------------------------------------------------------------------
 def configman_keys(a_mapping):
     """return a DotDict that is a copy of the provided mapping with keys
@@ -100,7 +143,23 @@ class DotDict(collections.MutableMapping):
         parameters:
             initializer - a mapping of keys and values to be added to this
                           mapping."""
-        self.__dict__['_key_order'] = OrderedSet()
+        self.__dict__['_key_order'] = CompactOrderedSet()
+        # weak references back to the DotDict instances that hold this one
+        # as a value in the form of (weakref, key) tuples.  These are used to
+        # notify enclosing DotDicts of changes within this one.
+        self.__dict__['_parent_links'] = None
+        # an optional flat mapping of fully qualified keys to values.  See the
+        # method 'enable_key_index'
+        self.__dict__['_key_index'] = None
+        # bumped on every structural change within this DotDict or any of
+        # its descendants.  It tells when '_keys_cache' is stale.
+        self.__dict__['_generation'] = 0
+        self.__dict__['_keys_cache'] = None
+        # a list holding the current epoch of the tree that this DotDict is
+        # in, shared by every DotDict of the tree.  A new epoch begins with
+        # every change within the tree.  The caches of DotDictWithAcquisition
+        # are only valid for the epoch in which they were filled.
+        self.__dict__['_clock'] = [next(_epochs)]
         if isinstance(initializer, collections.Mapping):
             for key, value in iteritems_breadth_first(
                 initializer,
@@ -116,8 +175,11 @@ class DotDict(collections.MutableMapping):
     #--------------------------------------------------------------------------
     def __setattr__(self, key, value):
         """this function saves keys into the mapping's __dict__."""
+        old_value = self.__dict__.get(key, _NOTHING)
         self._key_order.add(key)
         self.__dict__[key] = value
+        if old_value is not value:
+            self._key_changed(key, old_value, value)
 
     #--------------------------------------------------------------------------
     def __getattr__(self, key):
@@ -135,18 +197,58 @@ class DotDict(collections.MutableMapping):
 
     #--------------------------------------------------------------------------
     def __delattr__(self, key):
+        is_a_key = key in self._key_order
         try:
             self._key_order.discard(key)
         except ValueError:
             # we must be trying to delete something that wasn't a key
             # the next line will catch the error if it still is one
             pass
+        old_value = self.__dict__.get(key, _NOTHING)
         super(DotDict, self).__delattr__(key)
+        if is_a_key:
+            self._key_changed(key, old_value, _NOTHING)
+
+    #--------------------------------------------------------------------------
+    def __getstate__(self):
+        """the links to enclosing DotDicts are weak references that can
+        neither be pickled nor meaningfully copied.  They are dropped here
+        and rebuilt by '__setstate__'."""
+        state = self.__dict__.copy()
+        state['_parent_links'] = None
+        state['_key_index'] = self._key_index is not None
+        state['_keys_cache'] = None
+        # a copy starts epochs of its own
+        del state['_clock']
+        return state
+
+    #--------------------------------------------------------------------------
+    def __setstate__(self, state):
+        index_was_enabled = state.pop('_key_index', False)
+        self.__dict__.update(state)
+        # a shallow copy must not share the key order with the original
+        self.__dict__['_key_order'] = CompactOrderedSet(state['_key_order'])
+        self.__dict__['_key_index'] = None
+        self.__dict__['_clock'] = [next(_epochs)]
+        for key in self._key_order:
+            value = self.__dict__.get(key)
+            if isinstance(value, DotDict):
+                value._add_parent_link(self, key)
+        if index_was_enabled:
+            self.enable_key_index()
 
     #--------------------------------------------------------------------------
     def __getitem__(self, key):
         """define the square bracket operator to refer to the object's __dict__
         for fetching values.  It accepts keys in the form X.Y.Z"""
+        key_index = self._key_index
+        if key_index is not None:
+            try:
+                return key_index[key]
+            except (KeyError, TypeError):
+                # not in the index, walk the tree so that the proper
+                # exception is raised
+                pass
         try:
             key_split = key.split('.')
         except AttributeError:
@@ -205,19 +307,40 @@ class DotDict(collections.MutableMapping):
 
     #--------------------------------------------------------------------------
     def keys_breadth_first(self, include_dicts=False):
-        """a generator that returns all the keys in a set of nested
-        DotDict instances.  The keys take the form X.Y.Z"""
+        """return a tuple of all the keys in a set of nested DotDict
+        instances.  The keys take the form X.Y.Z
+
+        The tuple is cached.  It is only rebuilt after the set of keys in this
+        DotDict or any of its descendants has changed, so repeated calls on
+        an unchanged tree cost nothing."""
+        keys_cache = self._keys_cache
+        if keys_cache is None:
+            keys_cache = self.__dict__['_keys_cache'] = {}
+        try:
+            generation, keys = keys_cache[include_dicts]
+            if generation == self._generation:
+                return keys
+        except KeyError:
+            pass
+        keys = []
         namespaces = []
         for key in self._key_order:
-            if isinstance(getattr(self, key), DotDict):
+            if isinstance(self.__dict__.get(key), DotDict):
                 namespaces.append(key)
                 if include_dicts:
-                    yield key
+                    keys.append(key)
             else:
-                yield key
+                keys.append(key)
         for a_namespace in namespaces:
-            for key in self[a_namespace].keys_breadth_first(include_dicts):
-                yield '%s.%s' % (a_namespace, key)
+            keys.extend(
+                '%s.%s' % (a_namespace, key)
+                for key in getattr(self, a_namespace).keys_breadth_first(
+                    include_dicts
+                )
+            )
+        keys = tuple(keys)
+        keys_cache[include_dicts] = (self._generation, keys)
+        return keys
 
     #--------------------------------------------------------------------------
     def assign(self, key, value):
@@ -235,6 +358,145 @@ class DotDict(collections.MutableMapping):
                 cur_dict = cur_dict[k]
         cur_dict[key_split[-1]] = value
 
+    #--------------------------------------------------------------------------
+    def enable_key_index(self):
+        """maintain a flat index of every fully qualified key within this
+        DotDict and all the DotDicts nested within it.  Once enabled, lookups
+        of the form d['x.y.z'] are a single dictionary access rather than a
+        chain of attribute lookups.  The index is kept up to date on every
+        change to this DotDict or any of its descendants.
+
+        returns:
+            self - for convenience"""
+        self.__dict__['_key_index'] = dict(self._iter_qualified_items())
+        return self
+
+    #--------------------------------------------------------------------------
+    def _iter_qualified_items(self, prefix=''):
+        """a generator of (fully qualified key, value) tuples for every key
+        in this DotDict and all nested DotDicts.  Unlike 'keys_breadth_first',
+        nested DotDicts themselves are included."""
+        for key in self._key_order:
+            value = self.__dict__.get(key, _NOTHING)
+            if value is _NOTHING:
+                # a derived class may hold some values elsewhere
+                value = self.peek(key)
+            qualified_key = prefix + key
+            yield qualified_key, value
+            if isinstance(value, DotDict):
+                for an_item in value._iter_qualified_items(
+                    qualified_key + '.'
+                ):
+                    yield an_item
+
+    #--------------------------------------------------------------------------
+    def peek(self, key):
+        """return the value of a key of the form 'x.y.z' only to look at it.
+        A derived class may hand out a value that it shares with others."""
+        return self[key]
+
+    #--------------------------------------------------------------------------
+    def _add_parent_link(self, parent, key):
+        if self._parent_links is None:
+            self.__dict__['_parent_links'] = []
+        self._parent_links.append((weakref.ref(parent), key))
+        self._set_clock(parent._clock)
+
+    #--------------------------------------------------------------------------
+    def _remove_parent_link(self, parent, key):
+        if not self._parent_links:
+            return
+        for index, (parent_ref, parent_key) in enumerate(self._parent_links):
+            if parent_ref() is parent and parent_key == key:
+                del self._parent_links[index]
+                break
+        else:
+            return
+        # of several enclosing DotDicts, the most recent one keeps the time,
+        # as acquisition follows it
+        for parent_ref, parent_key in reversed(self._parent_links):
+            parent = parent_ref()
+            if parent is not None:
+                self._set_clock(parent._clock)
+                return
+        self._set_clock([next(_epochs)])
+
+    #--------------------------------------------------------------------------
+    def _set_clock(self, clock):
+        """make this DotDict and all the DotDicts within it share the clock
+        of the tree that now holds them"""
+        if self._clock is clock:
+            return
+        self.__dict__['_clock'] = clock
+        for key in self._key_order:
+            value = self.__dict__.get(key)
+            if isinstance(value, DotDict):
+                value._set_clock(clock)
+
+    #--------------------------------------------------------------------------
+    def _ancestry(self, prefix=''):
+        """a generator of (DotDict, prefix) tuples for this DotDict and every
+        DotDict that encloses it.  The 'prefix' is the qualified path from the
+        enclosing DotDict down to this one, ready to have a key appended."""
+        yield self, prefix
+        if self._parent_links:
+            for parent_ref, key in tuple(self._parent_links):
+                parent = parent_ref()
+                if parent is not None:
+                    for an_ancestor in parent._ancestry(
+                        '%s.%s' % (key, prefix) if prefix else key + '.'
+                    ):
+                        yield an_ancestor
+
+    #--------------------------------------------------------------------------
+    def _tree_epoch(self):
+        """the epoch of the tree that holds this DotDict.  A new one begins
+        with any change anywhere within the tree.  The clock is shared, so
+        this costs the same at any depth."""
+        return self._clock[0]
+
+    #--------------------------------------------------------------------------
+    def _key_changed(self, key, old_value, new_value):
+        """called after any key in this DotDict has been added, replaced or
+        deleted.  A missing old or new value is represented by _NOTHING."""
+        old_is_a_dotdict = isinstance(old_value, DotDict)
+        new_is_a_dotdict = isinstance(new_value, DotDict)
+        if old_is_a_dotdict:
+            old_value._remove_parent_link(self, key)
+        if new_is_a_dotdict:
+            new_value._add_parent_link(self, key)
+        # replacing one plain value with another leaves the set of qualified
+        # keys as it was.  Anything else is a structural change.
+        is_structural_change = (
+            old_value is _NOTHING
+            or new_value is _NOTHING
+            or old_is_a_dotdict
+            or new_is_a_dotdict
+        )
+        # a DotDict held in more than one tree starts a new epoch in each
+        epoch = next(_epochs)
+        for an_ancestor, prefix in self._ancestry():
+            an_ancestor._clock[0] = epoch
+            if is_structural_change:
+                an_ancestor.__dict__['_generation'] += 1
+            key_index = an_ancestor._key_index
+            if key_index is None:
+                continue
+            qualified_key = prefix + key
+            if old_value is not _NOTHING:
+                key_index.pop(qualified_key, None)
+                if old_is_a_dotdict:
+                    for sub_key, _ in old_value._iter_qualified_items(
+                        qualified_key + '.'
+                    ):
+                        key_index.pop(sub_key, None)
+            if new_value is not _NOTHING:
+                key_index[qualified_key] = new_value
+                if new_is_a_dotdict:
+                    key_index.update(
+                        new_value._iter_qualified_items(qualified_key + '.')
+                    )
+
     #--------------------------------------------------------------------------
     def parent(self, key):
         """when given a key of the form X.Y.Z, this method will return the
@@ -308,12 +570,43 @@ class DotDictWithAcquisition(DotDict):
     Contrarily, the form d['x.y.z.a'] is a single lookup operation that reveals
     that our goal is to get a value for 'a'.  Since this class has acquisition,
     and 'a' is defined in the base, it is perfectly allowable.
+
+    Acquired values and the results of lookups of the form 'x.y.z' are cached
+    in the instance where the lookup started.  Any change within a tree of
+    nested DotDicts, of whatever kind, invalidates the caches of that tree
+    and of no other, so a cached value is never stale.  Reading the same
+    acquired key over and over again costs a dictionary lookup and a look at
+    the clock that the whole tree shares.
     """
 
+    #--------------------------------------------------------------------------
+    def _resolution_cache(self, epoch):
+        """return the cache of resolved keys of this instance, emptied if it
+        was filled before the given epoch of its tree"""
+        try:
+            cache_epoch, cache = self.__dict__['_resolved_keys']
+            if cache_epoch == epoch:
+                return cache
+        except KeyError:
+            pass
+        cache = {}
+        self.__dict__['_resolved_keys'] = (epoch, cache)
+        return cache
+
     #--------------------------------------------------------------------------
     def __getitem__(self, key):
         """define the square bracket operator to refer to the object's __dict__
         for fetching values.  It accepts keys in the form 'x.y.z'"""
+        if '.' not in key:
+            return getattr(self, key)
+        epoch = self._tree_epoch()
+        try:
+            cache_epoch, cache = self.__dict__['_resolved_keys']
+            if cache_epoch == epoch:
+                return cache[key]
+        except KeyError:
+            pass
+        cache = self._resolution_cache(epoch)
         key_split = key.split('.')
         last_index = len(key_split) - 1
         current = self
@@ -323,9 +616,10 @@ class DotDictWithAcquisition(DotDict):
             except KeyError:
                 if i == last_index:
                     raise
-                temp_dict = DotDictWithAcquisition()
-                temp_dict.__dict__['_parent'] = weakref.proxy(current)
-                current = temp_dict
+                # a missing intermediate key is an empty DotDict that would
+                # acquire everything from 'current', so carry on with
+                # 'current' itself
+        cache[key] = current
         return current
 
     #--------------------------------------------------------------------------
@@ -338,6 +632,13 @@ class DotDictWithAcquisition(DotDict):
             value.__dict__['_parent'] = weakref.proxy(self)
         super(DotDictWithAcquisition, self).__setattr__(key, value)
 
+    #--------------------------------------------------------------------------
+    def __getstate__(self):
+        state = super(DotDictWithAcquisition, self).__getstate__()
+        # a copy may have a different parent, it can't share the cache
+        state.pop('_resolved_keys', None)
+        return state
+
     #--------------------------------------------------------------------------
     def __getattr__(self, key):
         """if a key is not found in the __dict__ using the regular python
@@ -345,12 +646,22 @@ class DotDictWithAcquisition(DotDict):
         parent class."""
         if key == '_parent':
             raise AttributeError('_parent')
+        epoch = self._tree_epoch()
+        try:
+            cache_epoch, cache = self.__dict__['_resolved_keys']
+            if cache_epoch == epoch:
+                return cache[key]
+        except KeyError:
+            pass
+        cache = self._resolution_cache(epoch)
         try:
             if six.PY2:
                 _parent = self._parent
             else:
                 _parent = object.__getattribute__(self, '_parent')
-            return getattr(_parent, key)
+            value = getattr(_parent, key)
+            cache[key] = value
+            return value
         except AttributeError:  # no parent attribute
             # the copy.deepcopy function will try to probe this class for an
             # instance of __deepcopy__.  If an AttributeError is raised, then
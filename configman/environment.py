@@ -2,9 +2,291 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
-from os import environ
 
-from configman.dotdict import configman_keys
+import collections
+import copy
+import os
 
-environment = configman_keys(environ)
-environment.always_ignore_mismatches = True
+from configman.dotdict import acquisition_keys
+from configman.memoize import memoize
+
+
+#------------------------------------------------------------------------------
+def configman_key_for(variable_name):
+    """the configman key for an environment variable name, the same
+    translation that 'configman_keys' applies to every key: if the name is
+    not all uppercase, doubled underscores stand for the '.' character."""
+    if '__' in variable_name and variable_name != variable_name.upper():
+        return variable_name.replace('__', '.')
+    return variable_name
+
+
+#==============================================================================
+class LazyEnvironment(collections.Mapping):
+    """a read only view of the environment with keys in configman form.
+    Unlike 'configman_keys(os.environ)', nothing is copied.  When a key is
+    asked for, it is translated into the names of the environment variables
+    that could supply it and only those are looked up.  Since the environment
+    is consulted at the time of the lookup, changes to the environment are
+    seen.
+
+    For code written for the DotDict that 'configman_keys(os.environ)'
+    returns, the values can also be read as attributes and the read methods
+    of DotDict are there: 'environment.HOME', 'environment.db.host',
+    'keys_breadth_first', 'peek' and 'parent'.  Since the view is not copied,
+    iterating it or reaching a namespace visits the whole environment.
+
+    parameters:
+        prefix - only environment variables with names that start with this
+                 prefix are seen.  The prefix is not part of the configman
+                 key: with the prefix 'MYAPP_', the key 'db.host' comes from
+                 the variable 'MYAPP_db__host'
+        environ - the mapping to view, os.environ if None
+        acquisition - if True, a key of the form 'x.y.z' that isn't in the
+                      environment may be acquired from 'x.z' or 'z', the way
+                      DotDictWithAcquisition would.
+    """
+    # the environment has too much in it that has nothing to do with any
+    # given app to report it as mismatches
+    always_ignore_mismatches = True
+
+    #--------------------------------------------------------------------------
+    def __init__(self, prefix='', environ=None, acquisition=False):
+        self.prefix = prefix
+        self._environ = environ
+        self.acquisition = acquisition
+        # the keys of a namespace view are relative to this
+        self._namespace = ''
+
+    #--------------------------------------------------------------------------
+    @property
+    def environ(self):
+        if self._environ is None:
+            return os.environ
+        return self._environ
+
+    #--------------------------------------------------------------------------
+    def with_acquisition(self):
+        """return a view of the same environment that acquires keys"""
+        a_view = copy.copy(self)
+        a_view.acquisition = True
+        return a_view
+
+    #--------------------------------------------------------------------------
+    def key_for(self, variable_name):
+        """the configman key for the name of an environment variable that
+        begins with the prefix"""
+        return configman_key_for(variable_name[len(self.prefix):])
+
+    #--------------------------------------------------------------------------
+    @memoize(max_cache_size=10000)
+    def variable_names_for(self, key):
+        """return a tuple of the names of the environment variables that could
+        supply the key, in order of preference.  A name that has both dots
+        and doubled underscores standing for dots is not considered."""
+        if self.acquisition:
+            candidate_keys = acquisition_keys(key)
+        else:
+            candidate_keys = [key]
+        names = []
+        for a_key in candidate_keys:
+            for a_name in (a_key.replace('.', '__'), a_key):
+                if configman_key_for(a_name) == a_key and a_name not in names:
+                    names.append(a_name)
+        return tuple(self.prefix + a_name for a_name in names)
+
+    #--------------------------------------------------------------------------
+    def namespace(self, key):
+        """return a view of the keys that begin with 'key.', the way that a
+        DotDict holds a nested DotDict for a namespace.  Raises KeyError if
+        there is no such key."""
+        a_namespace = self._namespace + key + '.'
+        if not any(
+            a_key.startswith(a_namespace)
+            for a_key in self._all_keys()
+        ):
+            raise KeyError(key)
+        a_view = copy.copy(self)
+        a_view._namespace = a_namespace
+        return a_view
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+        environ = self.environ
+        for a_name in self.variable_names_for(self._namespace + key):
+            try:
+                return environ[a_name]
+            except KeyError:
+                pass
+        raise KeyError(key)
+
+    #--------------------------------------------------------------------------
+    def __getattr__(self, key):
+        """read a value or a namespace as an attribute, raising KeyError for
+        a missing key the way that DotDict does"""
+        if key.startswith('_'):
+            raise AttributeError(key)
+        try:
+            return self[key]
+        except KeyError:
+            return self.namespace(key)
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        environ = self.environ
+        for a_name in self.variable_names_for(self._namespace + key):
+            if a_name in environ:
+                return True
+        return False
+
+    #--------------------------------------------------------------------------
+    def _all_keys(self):
+        prefix = self.prefix
+        for a_name in list(self.environ):
+            if a_name.startswith(prefix):
+                yield self.key_for(a_name)
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+        """iterating has to visit the whole environment, it is only done when
+        all the keys are really wanted."""
+        a_namespace = self._namespace
+        for a_key in self._all_keys():
+            if a_key.startswith(a_namespace):
+                yield a_key[len(a_namespace):]
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        return sum(1 for a_key in self)
+
+    #--------------------------------------------------------------------------
+    def keys_breadth_first(self, include_dicts=False):
+        """return a tuple of all the keys in the form X.Y.Z, the keys of
+        the outer namespaces before those of the inner ones.  With
+        'include_dicts', the keys of the namespaces are there too."""
+        keys = set(self)
+        if include_dicts:
+            for a_key in list(keys):
+                parts = a_key.split('.')
+                keys.update(
+                    '.'.join(parts[:x]) for x in range(1, len(parts))
+                )
+        return tuple(sorted(keys, key=lambda k: (k.count('.'), k)))
+
+    #--------------------------------------------------------------------------
+    def peek(self, key):
+        """return a value without copying it, as DotDict.peek does.  The
+        values in the environment are strings, there is nothing to copy."""
+        try:
+            return self[key]
+        except KeyError:
+            return self.namespace(key)
+
+    #--------------------------------------------------------------------------
+    def parent(self, key):
+        """when given a key of the form X.Y.Z, return the view of the
+        namespace that holds the 'Z' key"""
+        parent_key = '.'.join(key.split('.')[:-1])
+        if not parent_key:
+            return None
+        return self.namespace(parent_key)
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+        return '%s(prefix=%r)' % (self.__class__.__name__, self.prefix)
+
+
+#==============================================================================
+class PrefixedEnvironment(LazyEnvironment):
+    """a view of the environment variables of one application.  The names
+    of the variables follow a translation spec rather than the rules of
+    'configman_keys': the prefix, then the configman key with each '.'
+    replaced by the separator, all in uppercase if 'uppercase' is True.
+    With the prefix 'MYAPP_' and 'uppercase', the key 'db.host' comes from
+    the variable 'MYAPP_DB__HOST'.
+
+    Used as a value source, it doesn't look at the environment as a whole.
+    The for_environment value source compiles a table of the variable names
+    that could supply each of the options that the configuration manager
+    defines and probes the environment for just those names.
+
+    parameters:
+        prefix - the prefix of the names of the environment variables
+        separator - what stands for the '.' in the names
+        uppercase - True if the names are the uppercase form of the keys
+        environ - the mapping to view, os.environ if None
+        acquisition - as for LazyEnvironment
+    """
+    #--------------------------------------------------------------------------
+    def __init__(
+        self,
+        prefix,
+        separator='__',
+        uppercase=False,
+        environ=None,
+        acquisition=False
+    ):
+        super(PrefixedEnvironment, self).__init__(
+            prefix,
+            environ,
+            acquisition
+        )
+        self.separator = separator
+        self.uppercase = uppercase
+
+    #--------------------------------------------------------------------------
+    def key_for(self, variable_name):
+        key = variable_name[len(self.prefix):].replace(self.separator, '.')
+        if self.uppercase:
+            return key.lower()
+        return key
+
+    #--------------------------------------------------------------------------
+    @memoize(max_cache_size=10000)
+    def variable_names_for(self, key):
+        if self.acquisition:
+            candidate_keys = acquisition_keys(key)
+        else:
+            candidate_keys = [key]
+        names = []
+        for a_key in candidate_keys:
+            a_name = self.prefix + a_key.replace('.', self.separator)
+            if self.uppercase:
+                a_name = a_name.upper()
+            names.append(a_name)
+        return tuple(names)
+
+    #--------------------------------------------------------------------------
+    def compile(self, keys):
+        """return the translation table for a sequence of configman keys:
+        a list of tuples of a key and the names of the environment variables
+        that could supply it, in order of preference"""
+        return [(a_key, self.variable_names_for(a_key)) for a_key in keys]
+
+    #--------------------------------------------------------------------------
+    def probe(self, translation_table):
+        """return a dict of the keys in the translation table for which
+        there is an environment variable and the values of those variables"""
+        environ = self.environ
+        values = {}
+        for a_key, variable_names in translation_table:
+            for a_name in variable_names:
+                if a_name in environ:
+                    values[a_key] = environ[a_name]
+                    break
+        return values
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+        return '%s(prefix=%r, separator=%r, uppercase=%r)' % (
+            self.__class__.__name__,
+            self.prefix,
+            self.separator,
+            self.uppercase,
+        )
+
+
+# the default environment value source.  The keys that configman asks for are
+# looked up in os.environ, the environment is not copied.  To get a copy of
+# the environment in configman form, use 'configman_keys(os.environ)'.
+environment = LazyEnvironment()
@@ -0,0 +1,318 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import collections
+import re
+
+import six
+
+from configman.dotdict import DotDict
+from configman.memoize import memoize
+
+_identifier = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+
+
+#==============================================================================
+class _ImmutableConfig(collections.Mapping):
+    """what the immutable configurations have in common: the lookups of the
+    DotDictWithAcquisition, immutability and hashing by content.  Derived
+    classes provide the Mapping methods '__iter__' and '__len__' and
+    '_acquire(key)', which returns the value of the key from the namespace
+    or from one of the enclosing namespaces."""
+    __slots__ = ('_parent', '_hash')
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+        """accepts keys in the form 'x.y.z'.  Like DotDictWithAcquisition,
+        intermediate namespaces that don't exist are passed over: if 'a' is
+        in the root, 'x.y.z.a' finds it."""
+        key_split = key.split('.')
+        last_index = len(key_split) - 1
+        current = self
+        for i, k in enumerate(key_split):
+            if not isinstance(current, _ImmutableConfig):
+                try:
+                    current = getattr(current, k)
+                except AttributeError:
+                    raise KeyError(k)
+                continue
+            try:
+                current = current._acquire(k)
+            except KeyError:
+                if i == last_index:
+                    raise
+                # a namespace that doesn't exist has nothing in it, the
+                # lookup continues with the current namespace as its parent
+        return current
+
+    #--------------------------------------------------------------------------
+    def __getattr__(self, key):
+        """only called for keys that are not in this namespace, they may be
+        acquired from the enclosing namespaces"""
+        if key.startswith('__') or key in _ImmutableConfig.__slots__:
+            # let copy, pickle and friends probe for special methods and
+            # never look for the slots among the keys
+            raise AttributeError(key)
+        if self._parent is None:
+            raise KeyError(key)
+        return self._parent._acquire(key)
+
+    #--------------------------------------------------------------------------
+    def __setattr__(self, key, value):
+        raise AttributeError(
+            "'%s' object is immutable" % self.__class__.__name__
+        )
+
+    #--------------------------------------------------------------------------
+    def __delattr__(self, key):
+        raise AttributeError(
+            "'%s' object is immutable" % self.__class__.__name__
+        )
+
+    #--------------------------------------------------------------------------
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(
+                self,
+                '_hash',
+                hash(frozenset(six.iteritems(self)))
+            )
+        return self._hash
+
+    #--------------------------------------------------------------------------
+    def __copy__(self):
+        return self
+
+    #--------------------------------------------------------------------------
+    def __deepcopy__(self, memo):
+        return self
+
+    #--------------------------------------------------------------------------
+    def keys_breadth_first(self, include_dicts=False):
+        """return a list of all the keys in the nested configurations.  The
+        keys take the form X.Y.Z"""
+        namespaces = []
+        keys = []
+        for key, value in six.iteritems(self):
+            if isinstance(value, _ImmutableConfig):
+                namespaces.append((key, value))
+                if include_dicts:
+                    keys.append(key)
+            else:
+                keys.append(key)
+        for key, a_namespace in namespaces:
+            keys.extend(
+                '%s.%s' % (key, x)
+                for x in a_namespace.keys_breadth_first(include_dicts)
+            )
+        return keys
+
+
+#==============================================================================
+class FrozenConfig(_ImmutableConfig):
+    """an immutable and hashable copy of a configuration.  It offers the same
+    lookups as the DotDictWithAcquisition that 'get_config' returns: by
+    attribute, by key, by key of the form 'x.y.z' and with acquisition of
+    keys from the enclosing namespaces.
+
+        config = FrozenConfig(config_manager.get_config())
+        assert config.db.host == config['db.host']
+
+    Since it never changes, a FrozenConfig can be shared between threads
+    without locks.  To publish a new configuration, build a new FrozenConfig
+    and replace the reference to the old one: the assignment is atomic, a
+    reader sees either the old configuration or the new one, never a mix.
+
+    Nested DotDicts in the initializer become nested FrozenConfigs, any other
+    value is taken as it is.  A FrozenConfig is only hashable if all of its
+    values are."""
+    # no '__slots__': the keys and values are held in the instance
+    # dictionary, so reading them is an ordinary attribute access
+
+    #--------------------------------------------------------------------------
+    def __init__(self, initializer=None, _parent=None):
+        object.__setattr__(self, '_parent', _parent)
+        object.__setattr__(self, '_hash', None)
+        if initializer is not None:
+            items = self.__dict__
+            for key, value in six.iteritems(initializer):
+                if isinstance(value, (DotDict, FrozenConfig)):
+                    value = self.__class__(value, _parent=self)
+                items[key] = value
+
+    #--------------------------------------------------------------------------
+    def _acquire(self, key):
+        a_config = self
+        while a_config is not None:
+            items = a_config.__dict__
+            if key in items:
+                return items[key]
+            a_config = a_config._parent
+        raise KeyError(key)
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(self.__dict__)
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.__dict__)
+
+    #--------------------------------------------------------------------------
+    def __eq__(self, other):
+        if isinstance(other, FrozenConfig):
+            return self.__dict__ == other.__dict__
+        return super(FrozenConfig, self).__eq__(other)
+
+    #--------------------------------------------------------------------------
+    def __ne__(self, other):
+        return not self == other
+
+    #--------------------------------------------------------------------------
+    def __hash__(self):
+        return super(FrozenConfig, self).__hash__()
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.__dict__)
+
+
+#==============================================================================
+class CompiledConfig(_ImmutableConfig):
+    """the base of classes generated for the namespaces of a configuration.
+    Each namespace becomes an instance of a class that has a slot for each of
+    its keys, so reading a value is an ordinary attribute access:
+
+        config = config_manager.get_config(mapping_class=CompiledConfig)
+        for a_request in requests:
+            handle(a_request, config.db.host)
+
+    Like a tree of namedtuples, it is immutable and hashable (if all of the
+    values are).  It is also a read only Mapping with the lookups of the
+    DotDictWithAcquisition: keys of the form 'x.y.z' and acquisition of keys
+    from enclosing namespaces.  Acquired keys take the slower path through
+    '__getattr__'.
+
+    The generated classes are cached by their keys, namespaces with the same
+    keys share a class.  Keys that are not identifiers or that begin with
+    '_' are held in slots with made up names; they can be read by key or
+    with getattr.
+
+    Derive from this class to add methods to all of the namespaces."""
+    __slots__ = ()
+    # the keys in order and the names of the slots that hold their values
+    _keys = ()
+    _slot_names = ()
+    # key -> slot name
+    _slot_for = {}
+
+    #--------------------------------------------------------------------------
+    @classmethod
+    def from_mapping(cls, a_mapping, _parent=None):
+        """compile a mapping, nested DotDicts become nested instances"""
+        a_class = compiled_config_class(cls, tuple(a_mapping.keys()))
+        instance = a_class.__new__(a_class)
+        set_slot = object.__setattr__
+        set_slot(instance, '_parent', _parent)
+        set_slot(instance, '_hash', None)
+        for key, slot_name in zip(a_class._keys, a_class._slot_names):
+            value = a_mapping[key]
+            if isinstance(value, DotDict):
+                value = cls.from_mapping(value, instance)
+            set_slot(instance, slot_name, value)
+        return instance
+
+    #--------------------------------------------------------------------------
+    def __reduce__(self):
+        """a generated class cannot be found by its name, so an instance is
+        pickled as the base class and the keys to generate its class from,
+        and then its values"""
+        return (
+            _new_compiled_config,
+            (self.__class__.__bases__[0], self._keys),
+            (
+                self._parent,
+                tuple(getattr(self, x) for x in self._slot_names)
+            ),
+        )
+
+    #--------------------------------------------------------------------------
+    def __setstate__(self, state):
+        parent, values = state
+        set_slot = object.__setattr__
+        set_slot(self, '_parent', parent)
+        set_slot(self, '_hash', None)
+        for slot_name, value in zip(self._slot_names, values):
+            set_slot(self, slot_name, value)
+
+    #--------------------------------------------------------------------------
+    def _acquire(self, key):
+        a_config = self
+        while a_config is not None:
+            slot_name = a_config._slot_for.get(key)
+            if slot_name is not None:
+                return getattr(a_config, slot_name)
+            a_config = a_config._parent
+        raise KeyError(key)
+
+    #--------------------------------------------------------------------------
+    def __getattr__(self, key):
+        slot_name = self._slot_for.get(key)
+        if slot_name is not None:
+            # a key held in a slot with a made up name
+            return getattr(self, slot_name)
+        if key.startswith('__') or key in _ImmutableConfig.__slots__:
+            raise AttributeError(key)
+        if self._parent is None:
+            raise KeyError(key)
+        return self._parent._acquire(key)
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(self._keys)
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._keys)
+
+    #--------------------------------------------------------------------------
+    def __repr__(self):
+        return '%s(%s)' % (
+            self.__class__.__name__,
+            ', '.join(
+                '%s=%r' % (key, getattr(self, slot_name))
+                for key, slot_name in zip(self._keys, self._slot_names)
+            )
+        )
+
+
+#------------------------------------------------------------------------------
+@memoize(max_cache_size=1000)
+def compiled_config_class(base_class, keys):
+    """return a class derived from 'base_class', a CompiledConfig, with a
+    slot for each of the keys"""
+    slot_names = tuple(
+        str(key) if _identifier.match(key) else '_slot%d' % index
+        for index, key in enumerate(keys)
+    )
+    return type(base_class)(
+        str(base_class.__name__),
+        (base_class,),
+        {
+            '__module__': base_class.__module__,
+            '__slots__': slot_names,
+            '_keys': keys,
+            '_slot_names': slot_names,
+            '_slot_for': dict(zip(keys, slot_names)),
+        }
+    )
+
+
+#------------------------------------------------------------------------------
+def _new_compiled_config(base_class, keys):
+    """unpickle an instance of a generated class, see
+    'CompiledConfig.__reduce__'"""
+    a_class = compiled_config_class(base_class, keys)
+    return a_class.__new__(a_class)
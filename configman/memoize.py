@@ -2,39 +2,248 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
+
+import collections
+import weakref
 from functools import wraps
 
+import six
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo',
+    'hits misses evictions uncacheable maxsize currsize'
+)
+
+
+#==============================================================================
+class LRUCache(object):
+    """a cache of function results of limited size.  When it is full, the
+    least recently used result is evicted to make room for a new one."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.results = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # calls with unhashable arguments can't be cached, they're counted
+        self.uncacheable = 0
+
+    #--------------------------------------------------------------------------
+    def call(self, function, args, kwargs, key):
+        """return the result of the function for the key, calling the
+        function with the args and kwargs only if the result isn't known"""
+        try:
+            # moving the result to the end marks it as the most recently used
+            result = self.results.pop(key)
+        except KeyError:
+            self.misses += 1
+            result = function(*args, **kwargs)
+            if self.max_size > 0:
+                if len(self.results) >= self.max_size:
+                    self.results.popitem(last=False)
+                    self.evictions += 1
+                self.results[key] = result
+            return result
+        except TypeError:
+            self.uncacheable += 1
+            return function(*args, **kwargs)
+        self.hits += 1
+        self.results[key] = result
+        return result
+
+    #--------------------------------------------------------------------------
+    def clear(self):
+        self.results.clear()
+
+    #--------------------------------------------------------------------------
+    def info(self):
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.uncacheable,
+            self.max_size,
+            len(self.results),
+        )
+
+
+#------------------------------------------------------------------------------
+def _make_key(args, kwargs):
+    if kwargs:
+        return (args, tuple(sorted(kwargs.items())))
+    return args
+
+
+#------------------------------------------------------------------------------
+def _instance_cache(instance_caches, instance, max_cache_size):
+    """return the cache of an instance from the instance caches, creating it if
+    necessary.  The instance is only weakly referenced, so the cache goes away
+    with the instance.  Returns None if the instance can't be weakly
+    referenced."""
+    instance_id = id(instance)
+    try:
+        reference, cache = instance_caches[instance_id]
+        if reference() is instance:
+            return cache
+    except KeyError:
+        pass
+
+    def forget(reference):
+        # only forget the cache if it still belongs to this reference, the id
+        # may have been reused already
+        try:
+            if instance_caches[instance_id][0] is reference:
+                del instance_caches[instance_id]
+        except KeyError:
+            pass
+    try:
+        reference = weakref.ref(instance, forget)
+    except TypeError:
+        return None
+    cache = LRUCache(max_cache_size)
+    instance_caches[instance_id] = (reference, cache)
+    return cache
+
 
 #------------------------------------------------------------------------------
 def memoize(max_cache_size=1000):
-    """Python 2.4 compatible memoize decorator.
-    It creates a cache that has a maximum size.  If the cache exceeds the max,
-    it is thrown out and a new one made.  With such behavior, it is wise to set
-    the cache just a little larger that the maximum expected need.
+    """A memoize decorator.
+    It creates a least recently used cache that has a maximum size.  Once the
+    cache is full, the result that has gone unused for the longest time is
+    thrown out to make room for a new one.  For methods, recognized by a first
+    parameter called 'self', each instance gets its own cache.  That cache
+    doesn't keep the instance alive, it goes away with the instance.
+
+    The decorated function gets two extra functions: 'cache_info' returns the
+    counters of hits, misses, evictions and calls that could not be cached
+    because of unhashable arguments.  'cache_clear' throws out the cached
+    results.  Both take an optional instance to limit them to the cache of
+    that instance.
 
     Parameters:
       max_cache_size - the size to which a cache can grow
     """
     def wrapper(f):
+        code = six.get_function_code(f)
+        per_instance = (
+            code.co_argcount > 0 and code.co_varnames[0] == 'self'
+        )
+        # used for plain functions and instances that can't be weakly
+        # referenced
+        shared_cache = LRUCache(max_cache_size)
+        # id(instance) -> (weakref to instance, LRUCache)
+        instance_caches = {}
+
         @wraps(f)
         def fn(*args, **kwargs):
-            if kwargs:
-                key = (args, tuple(kwargs.items()))
-            else:
-                key = args
+            if per_instance and args:
+                cache = _instance_cache(
+                    instance_caches,
+                    args[0],
+                    max_cache_size
+                )
+                if cache is not None:
+                    return cache.call(
+                        f,
+                        args,
+                        kwargs,
+                        _make_key(args[1:], kwargs)
+                    )
+            return shared_cache.call(f, args, kwargs, _make_key(args, kwargs))
+
+        def caches(instance):
+            if instance is None:
+                return [shared_cache] + [
+                    a_cache
+                    for reference, a_cache in list(instance_caches.values())
+                ]
             try:
-                return fn.cache[key]
+                reference, cache = instance_caches[id(instance)]
+                if reference() is instance:
+                    return [cache]
             except KeyError:
-                if fn.count >= max_cache_size:
-                    fn.cache = {}
-                    fn.count = 0
-                result = f(*args, **kwargs)
-                fn.cache[key] = result
-                fn.count += 1
-                return result
-            except TypeError:
-                return f(*args, **kwargs)
-        fn.cache = {}
-        fn.count = 0
+                pass
+            return []
+
+        def cache_info(instance=None):
+            infos = [a_cache.info() for a_cache in caches(instance)]
+            return CacheInfo(
+                sum(x.hits for x in infos),
+                sum(x.misses for x in infos),
+                sum(x.evictions for x in infos),
+                sum(x.uncacheable for x in infos),
+                max_cache_size,
+                sum(x.currsize for x in infos),
+            )
+
+        def cache_clear(instance=None):
+            for a_cache in caches(instance):
+                a_cache.clear()
+
+        fn.cache_info = cache_info
+        fn.cache_clear = cache_clear
         return fn
     return wrapper
+
+
+#==============================================================================
+class DefinitionGenerationCache(object):
+    """a cache for results that depend on the set of options in the option
+    definitions rather than on the arguments of a function.  The results
+    stay valid for as long as no option is added to or removed from the
+    option definitions.  That is tracked through the generation of the
+    option definitions, a counter that DotDict advances with every change to
+    its structure.  Option definitions that are not DotDicts have no
+    generation, results for them are never cached.
+
+    The 'hits' and 'misses' counters tell how much work was avoided."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self):
+        self.option_definitions = None
+        self.generation = None
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+
+    #--------------------------------------------------------------------------
+    def _is_valid_for(self, option_definitions):
+        generation = getattr(option_definitions, '_generation', None)
+        if generation is None:
+            return False
+        if (
+            self.option_definitions is not option_definitions
+            or self.generation != generation
+        ):
+            # the options have changed since the results were cached
+            self.option_definitions = option_definitions
+            self.generation = generation
+            self.results = {}
+        return True
+
+    #--------------------------------------------------------------------------
+    def get(self, option_definitions, key):
+        """return the result cached for the key or None if there is none for
+        the current generation of the option definitions"""
+        if self._is_valid_for(option_definitions):
+            try:
+                result = self.results[key]
+                self.hits += 1
+                return result
+            except KeyError:
+                pass
+        self.misses += 1
+        return None
+
+    #--------------------------------------------------------------------------
+    def put(self, option_definitions, key, result):
+        if self._is_valid_for(option_definitions):
+            self.results[key] = result
+
+    #--------------------------------------------------------------------------
+    def clear(self):
+        self.option_definitions = None
+        self.generation = None
+        self.results = {}
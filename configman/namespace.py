@@ -3,9 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
 
-import six
-
-from configman.dotdict import DotDict
+from configman.dotdict import DotDict, _NOTHING
 from configman.option import Option, Aggregation
 
 
@@ -14,6 +12,9 @@ class Namespace(DotDict):
 
     #--------------------------------------------------------------------------
     def __init__(self, doc='', initializer=None):
+        # Options shared with the original of a 'safe_copy' that have not yet
+        # been copied.  See 'safe_copy'
+        self.__dict__['_borrowed'] = None
         super(Namespace, self).__init__(initializer=initializer)
         object.__setattr__(self, '_doc', doc)  # force into attributes
         object.__setattr__(self, '_reference_value_from', False)
@@ -25,8 +26,137 @@ class Namespace(DotDict):
             o = value
         else:
             o = Option(name=name, default=value, value=value)
+        if self._borrowed and name in self._borrowed:
+            self._borrowed.pop(name)._end_loan(self, name)
         super(Namespace, self).__setattr__(name, o)
 
+    #--------------------------------------------------------------------------
+    def __getattr__(self, name):
+        """called only when 'name' is not in the __dict__.  That may be
+        because it is an Option still borrowed from the original of a
+        'safe_copy'.  Whoever asks for it may change it, so this is the
+        moment to make the copy.  Use 'peek' to only look at it."""
+        borrowed = self.__dict__.get('_borrowed')
+        if borrowed and name in borrowed:
+            return self._copy_borrowed_option(name)
+        return super(Namespace, self).__getattr__(name)
+
+    #--------------------------------------------------------------------------
+    def __delattr__(self, name):
+        if self._borrowed and name in self._borrowed:
+            an_option = self._borrowed.pop(name)
+            an_option._end_loan(self, name)
+            self._key_order.discard(name)
+            self._key_changed(name, an_option, _NOTHING)
+            return
+        super(Namespace, self).__delattr__(name)
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+        """like the method of the DotDict, but an Option still borrowed from
+        the original of a 'safe_copy' is copied before it is handed out"""
+        key_index = self._key_index
+        if key_index is not None:
+            try:
+                value = key_index[key]
+            except (KeyError, TypeError):
+                pass
+            else:
+                if not (
+                    isinstance(value, Option)
+                    and value._borrowers is not None
+                ):
+                    return value
+        try:
+            key_split = key.split('.')
+        except AttributeError:
+            key_split = [key]
+        current = self
+        for k in key_split:
+            current = getattr(current, k)
+        return current
+
+    #--------------------------------------------------------------------------
+    def __getstate__(self):
+        """a pickled or copied Namespace owns all of its Options"""
+        state = super(Namespace, self).__getstate__()
+        borrowed = state.pop('_borrowed')
+        if borrowed:
+            for key, an_option in borrowed.items():
+                state[key] = an_option.copy()
+        state['_borrowed'] = None
+        return state
+
+    #--------------------------------------------------------------------------
+    def peek(self, key):
+        """return the value of a key of the form 'x.y.z' without copying an
+        Option still borrowed from the original of a 'safe_copy'.  The value
+        is only to be looked at: to change it, get it with 'self[key]'."""
+        key_index = self._key_index
+        if key_index is not None:
+            try:
+                return key_index[key]
+            except (KeyError, TypeError):
+                pass
+        current = self
+        for k in key.split('.'):
+            borrowed = current.__dict__.get('_borrowed')
+            if borrowed and k in borrowed:
+                current = borrowed[k]
+            else:
+                current = getattr(current, k)
+        return current
+
+    #--------------------------------------------------------------------------
+    def share_from(self, other, key):
+        """give this Namespace the value that a key of the form 'x.y.z' has
+        in the Namespace 'other', creating any nested Namespaces needed on
+        the way.  An Option that 'other' still borrows from the original of
+        a 'safe_copy' is borrowed from that original here too rather than
+        copied.
+
+        returns:
+            the value, only to be looked at as with 'peek'"""
+        parent_key, _, name = key.rpartition('.')
+        source = other.peek(parent_key) if parent_key else other
+        value = source.peek(name)
+        destination = self
+        if parent_key:
+            for k in parent_key.split('.'):
+                try:
+                    destination = getattr(destination, k)
+                except KeyError:
+                    destination[k] = self.__class__()
+                    destination = getattr(destination, k)
+        if not (source._borrowed and source._borrowed.get(name) is value):
+            setattr(destination, name, value)
+            return value
+        if name in destination._key_order:
+            delattr(destination, name)
+        if destination._borrowed is None:
+            destination.__dict__['_borrowed'] = {}
+        destination._borrowed[name] = value
+        value._lend(destination, name)
+        destination._key_order.add(name)
+        destination._key_changed(name, _NOTHING, value)
+        return value
+
+    #--------------------------------------------------------------------------
+    def _copy_borrowed_option(self, name):
+        original_option = self._borrowed.pop(name)
+        original_option._end_loan(self, name)
+        an_option = original_option.copy()
+        self.__dict__[name] = an_option
+        # any enclosing key index still refers to the original
+        self._key_changed(name, original_option, an_option)
+        return an_option
+
+    #--------------------------------------------------------------------------
+    def _stop_borrowing(self, name, an_option):
+        """called by a borrowed Option that is about to change"""
+        if self._borrowed and self._borrowed.get(name) is an_option:
+            self._copy_borrowed_option(name)
+
     #--------------------------------------------------------------------------
     def add_option(self, name, *args, **kwargs):
         """add an option to the namespace.   This can take two forms:
@@ -83,16 +213,35 @@ class Namespace(DotDict):
 
     #--------------------------------------------------------------------------
     def safe_copy(self, reference_value_from=None):
+        """return a copy of this Namespace that may be changed without
+        affecting the original.
+
+        Options are not copied up front: the copy shares the original's
+        Option objects and copies one only when it is about to be changed,
+        either by the original or by the copy.  Since Options are changed in
+        place, the copy hands out its own copy of a shared Option whenever it
+        is asked for one; 'peek' looks at an Option without copying it.
+        Nested Namespaces are copied right away.
+
+        parameters:
+            reference_value_from - assigned to every Option at this level of
+                                   the copy that doesn't already have a
+                                   'reference_value_from' of its own"""
         new_namespace = Namespace()
         if self._reference_value_from:
             new_namespace.ref_value_namespace()
-        for key, opt in six.iteritems(self):
+        borrowed = {}
+        for key in self._key_order:
+            opt = self.peek(key)
             if isinstance(opt, Option):
-                new_namespace[key] = opt.copy()
-                # assign a new reference_value if one has not been defined
-                if not new_namespace[key].reference_value_from:
-                    new_namespace[key].reference_value_from = \
-                        reference_value_from
+                if reference_value_from and not opt.reference_value_from:
+                    opt = opt.copy()
+                    opt.reference_value_from = reference_value_from
+                    new_namespace.__dict__[key] = opt
+                else:
+                    borrowed[key] = opt
+                    opt._lend(new_namespace, key)
+                new_namespace._key_order.add(key)
             elif isinstance(opt, Aggregation):
                 new_namespace.add_aggregation(
                     opt.name,
@@ -100,6 +249,8 @@ class Namespace(DotDict):
                 )
             elif isinstance(opt, Namespace):
                 new_namespace[key] = opt.safe_copy()
+        if borrowed:
+            new_namespace.__dict__['_borrowed'] = borrowed
         return new_namespace
 
     #--------------------------------------------------------------------------
@@ -110,3 +261,142 @@ class Namespace(DotDict):
         # the __setattr__ method, this is the only way to actually force a
         # value to become an attribute rather than member of the dict
         object.__setattr__(self, '_reference_value_from', True)
+
+
+#==============================================================================
+class OutputNamespace(Namespace):
+    """a read only view of a Namespace as the writers of configuration files
+    should see it: without the blocked keys, without the namespaces left
+    empty and with the values of secret Options hidden.  Nothing is copied
+    up front, the nested views and the copies of secret Options are made as
+    a writer reaches them.  A nested view is made, and found to be empty or
+    not, only once.  Writing a configuration through this view takes
+    the same small amount of extra memory whatever the size of the tree.
+
+    parameters:
+        a_namespace - the Namespace to view
+        blocked_keys - fully qualified keys to leave out, a blocked
+                       namespace takes everything within it along
+        mask_secrets - if True, secret Options outside of the 'admin'
+                       namespace appear with the value '*' * 16"""
+
+    #--------------------------------------------------------------------------
+    def __init__(
+        self,
+        a_namespace,
+        blocked_keys=(),
+        mask_secrets=False,
+        _prefix=''
+    ):
+        super(OutputNamespace, self).__init__(doc=a_namespace._doc)
+        object.__setattr__(
+            self,
+            '_reference_value_from',
+            a_namespace._reference_value_from
+        )
+        self.__dict__['_viewed'] = a_namespace
+        if not isinstance(blocked_keys, frozenset):
+            blocked_keys = frozenset(blocked_keys)
+        self.__dict__['_blocked_keys'] = blocked_keys
+        self.__dict__['_mask_secrets'] = mask_secrets
+        self.__dict__['_prefix'] = _prefix
+        # the nested Namespaces viewed so far and their views, _NOTHING for
+        # an empty one, by key
+        self.__dict__['_nested_views'] = {}
+
+    #--------------------------------------------------------------------------
+    def _visible_value(self, key):
+        """return the value of the key in the viewed Namespace, or _NOTHING
+        if the writers are not to see it.  A nested Namespace comes back as
+        a view of its own."""
+        qualified_key = self._prefix + key
+        if qualified_key in self._blocked_keys:
+            return _NOTHING
+        value = self._viewed.peek(key)
+        if isinstance(value, Namespace):
+            try:
+                a_namespace, a_view = self._nested_views[key]
+                if a_namespace is value:
+                    return a_view
+            except KeyError:
+                pass
+            a_view = self.__class__(
+                value,
+                self._blocked_keys,
+                self._mask_secrets,
+                qualified_key + '.'
+            )
+            for a_key in a_view:
+                break
+            else:
+                # nothing to see in there
+                a_view = _NOTHING
+            self._nested_views[key] = (value, a_view)
+            return a_view
+        return value
+
+    #--------------------------------------------------------------------------
+    def __getattr__(self, name):
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
+        value = self._visible_value(name)
+        if value is _NOTHING:
+            raise KeyError(name)
+        if (
+            self._mask_secrets
+            and isinstance(value, Option)
+            and value.secret
+            and not (self._prefix + name).startswith('admin')
+        ):
+            value = value.copy()
+            value.value = '*' * 16
+            value.from_string_converter = str
+        return value
+
+    #--------------------------------------------------------------------------
+    def __setattr__(self, name, value):
+        raise AttributeError("'%s' is read only" % self.__class__.__name__)
+
+    #--------------------------------------------------------------------------
+    def __delattr__(self, name):
+        raise AttributeError("'%s' is read only" % self.__class__.__name__)
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+        for key in self._viewed:
+            if self._visible_value(key) is not _NOTHING:
+                yield key
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        return sum(1 for key in self)
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        try:
+            self[key]
+        except (KeyError, AttributeError):
+            return False
+        return True
+
+    #--------------------------------------------------------------------------
+    def keys_breadth_first(self, include_dicts=False):
+        """like the method of the DotDict, but nothing is cached"""
+        keys = []
+        namespaces = []
+        for key in self._viewed:
+            value = self._visible_value(key)
+            if value is _NOTHING:
+                continue
+            if isinstance(value, Namespace):
+                namespaces.append((key, value))
+                if include_dicts:
+                    keys.append(key)
+            else:
+                keys.append(key)
+        for a_key, a_namespace in namespaces:
+            keys.extend(
+                '%s.%s' % (a_key, key)
+                for key in a_namespace.keys_breadth_first(include_dicts)
+            )
+        return tuple(keys)
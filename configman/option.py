@@ -4,6 +4,10 @@
 from __future__ import absolute_import, division, print_function
 
 import collections
+import datetime
+import numbers
+import types
+import weakref
 import six
 
 from configman.converters import (
@@ -15,10 +19,36 @@ from configman.config_exceptions import (
     CannotConvertError,
     OptionError
 )
+from configman.dotdict import _NOTHING
 
 
 #==============================================================================
 class Option(object):
+    # there may be tens of thousands of Options in a process, so they do
+    # without a per-instance __dict__.  The order here is the order in which
+    # the attributes are written out by the json value source.
+    __slots__ = (
+        'name',
+        'short_form',
+        'default',
+        'doc',
+        'from_string_converter',
+        'to_string_converter',
+        'value',
+        'is_argument',
+        'exclude_from_print_conf',
+        'exclude_from_dump_conf',
+        'likely_to_be_changed',
+        'not_for_definition',
+        'reference_value_from',
+        'secret',
+        'has_changed',
+        'foreign_data',
+        # the private slots are not written out
+        '_last_conversion',
+        '_borrowers',
+    )
+
     #--------------------------------------------------------------------------
     def __init__(
         self,
@@ -39,34 +69,42 @@ class Option(object):
         has_changed=False,
         foreign_data=None,
     ):
-        self.name = name
-        self.short_form = short_form
-        self.default = default
+        # written past '__setattr__': a new Option is shared with no one
+        set_slot = object.__setattr__
+        # (weak reference to a Namespace, key) for each copy of a Namespace
+        # sharing this Option.  See '_lend'
+        set_slot(self, '_borrowers', None)
+        set_slot(self, 'name', name)
+        set_slot(self, 'short_form', short_form)
+        set_slot(self, 'default', default)
         if isinstance(doc, (six.binary_type, six.text_type)):
             doc = to_str(doc).strip()
-        self.doc = doc
+        set_slot(self, 'doc', doc)
         if from_string_converter is None:
             if default is not None:
                 # take a qualified guess from the default value
                 from_string_converter = self._deduce_converter(default)
         if isinstance(from_string_converter, (six.binary_type, six.text_type)):
             from_string_converter = str_to_python_object(from_string_converter)
-        self.from_string_converter = from_string_converter
+        set_slot(self, 'from_string_converter', from_string_converter)
         # if this is not set, the type is used in converters.py to attempt
         # the conversion
-        self.to_string_converter = to_string_converter
+        set_slot(self, 'to_string_converter', to_string_converter)
         if value is None:
             value = default
-        self.value = value
-        self.is_argument = is_argument
-        self.exclude_from_print_conf = exclude_from_print_conf
-        self.exclude_from_dump_conf = exclude_from_dump_conf
-        self.likely_to_be_changed = likely_to_be_changed
-        self.not_for_definition = not_for_definition
-        self.reference_value_from = reference_value_from
-        self.secret = secret
-        self.has_changed = has_changed
-        self.foreign_data = foreign_data
+        set_slot(self, 'value', value)
+        set_slot(self, 'is_argument', is_argument)
+        set_slot(self, 'exclude_from_print_conf', exclude_from_print_conf)
+        set_slot(self, 'exclude_from_dump_conf', exclude_from_dump_conf)
+        set_slot(self, 'likely_to_be_changed', likely_to_be_changed)
+        set_slot(self, 'not_for_definition', not_for_definition)
+        set_slot(self, 'reference_value_from', reference_value_from)
+        set_slot(self, 'secret', secret)
+        set_slot(self, 'has_changed', has_changed)
+        set_slot(self, 'foreign_data', foreign_data)
+        # (converter, string, converted value) from the last time a string
+        # was converted.  See '_set_value_from_string'
+        set_slot(self, '_last_conversion', None)
 
     #--------------------------------------------------------------------------
     def __str__(self):
@@ -118,15 +156,63 @@ class Option(object):
     def set_value(self, val=None):
         if val is None:
             val = self.default
-        if isinstance(val, (six.binary_type, six.text_type)):
+        try:
+            set_value_from = _set_value_plans[type(val)]
+        except KeyError:
+            set_value_from = _set_value_plan_for(type(val))
+        set_value_from(self, val)
+
+    #--------------------------------------------------------------------------
+    def _is_set_to(self, val=None):
+        """True if 'set_value(val)' is sure to leave this Option exactly as
+        it is, so that an Option shared by a 'Namespace.safe_copy' needn't be
+        copied just to be set.  Only the common cases are recognized: a value
+        that needs no conversion and is already the value, or the string that
+        was last converted to the value."""
+        if val is None:
+            val = self.default
+        if self.has_changed:
+            return False
+        try:
+            set_value_from = _set_value_plans[type(val)]
+        except KeyError:
+            set_value_from = _set_value_plan_for(type(val))
+        if set_value_from is Option._set_value_as_is:
+            # a value unequal to itself would set 'has_changed'
+            return val is self.value and not val != val
+        if set_value_from is Option._set_value_from_string:
+            if type(val) is not str:
+                return False
+            if self.from_string_converter is str:
+                # str() hands back the very same string
+                return val is self.value
+            last_conversion = self._last_conversion
+            return (
+                last_conversion is not None
+                and last_conversion[0] is self.from_string_converter
+                and last_conversion[1] == val
+                and last_conversion[2] is self.value
+            )
+        return False
+
+    #--------------------------------------------------------------------------
+    def _set_value_from_string(self, val):
+        if type(val) is not str:
             val = to_str(val)
+        converter = self.from_string_converter
+        last_conversion = self._last_conversion
+        if (
+            last_conversion is not None
+            and last_conversion[0] is converter
+            and last_conversion[1] == val
+        ):
+            # the same string as last time, it needn't be converted again
+            new_value = last_conversion[2]
+        else:
             try:
-                new_value = self.from_string_converter(val)
-                self.has_changed = new_value != self.value
-                self.value = new_value
+                new_value = converter(val)
             except TypeError:
-                self.has_changed = val != self.value
-                self.value = val
+                new_value = val
             except ValueError:
                 error_message = "In '%s', '%s' fails to convert '%s'" % (
                     self.name,
@@ -134,14 +220,32 @@ class Option(object):
                     val
                 )
                 raise CannotConvertError(error_message)
-        elif isinstance(val, Option):
-            self.has_changed = val.default != self.value
-            self.value = val.default
-        elif isinstance(val, collections.Mapping) and 'default' in val:
+            else:
+                # a mutable value could have been changed since, only
+                # immutable values are safe to hand out again
+                if isinstance(new_value, _immutable_types):
+                    self._last_conversion = (converter, val, new_value)
+        self.has_changed = (
+            new_value is not self.value and new_value != self.value
+        )
+        self.value = new_value
+
+    #--------------------------------------------------------------------------
+    def _set_value_from_option(self, val):
+        self.has_changed = val.default != self.value
+        self.value = val.default
+
+    #--------------------------------------------------------------------------
+    def _set_value_from_mapping(self, val):
+        if 'default' in val:
             self.set_value(val["default"])
         else:
-            self.has_changed = val != self.value
-            self.value = val
+            self._set_value_as_is(val)
+
+    #--------------------------------------------------------------------------
+    def _set_value_as_is(self, val):
+        self.has_changed = val != self.value
+        self.value = val
 
     #--------------------------------------------------------------------------
     def set_default(self, val, force=False):
@@ -181,30 +285,172 @@ class Option(object):
 
     #--------------------------------------------------------------------------
     def copy(self):
-        """return a copy"""
-        o = Option(
-            name=self.name,
-            default=self.default,
-            doc=self.doc,
-            from_string_converter=self.from_string_converter,
-            to_string_converter=self.to_string_converter,
-            value=self.value,
-            short_form=self.short_form,
-            exclude_from_print_conf=self.exclude_from_print_conf,
-            exclude_from_dump_conf=self.exclude_from_dump_conf,
-            is_argument=self.is_argument,
-            likely_to_be_changed=self.likely_to_be_changed,
-            not_for_definition=self.not_for_definition,
-            reference_value_from=self.reference_value_from,
-            secret=self.secret,
-            has_changed=self.has_changed,
-            foreign_data=self.foreign_data,
-        )
+        """return a copy.  The attributes are copied directly rather than
+        passed through the constructor, only the defaulting that the
+        constructor would have done is repeated - and then only if it is
+        needed."""
+        o = Option.__new__(Option)
+        set_slot = object.__setattr__
+        set_slot(o, '_borrowers', None)
+        set_slot(o, 'name', self.name)
+        set_slot(o, 'short_form', self.short_form)
+        set_slot(o, 'default', self.default)
+        set_slot(o, 'doc', self.doc)
+        from_string_converter = self.from_string_converter
+        if from_string_converter is None:
+            if self.default is not None:
+                from_string_converter = o._deduce_converter(self.default)
+        elif isinstance(
+            from_string_converter,
+            (six.binary_type, six.text_type)
+        ):
+            from_string_converter = str_to_python_object(
+                from_string_converter
+            )
+        set_slot(o, 'from_string_converter', from_string_converter)
+        set_slot(o, 'to_string_converter', self.to_string_converter)
+        value = self.value
+        if value is None:
+            value = self.default
+        set_slot(o, 'value', value)
+        set_slot(o, 'is_argument', self.is_argument)
+        set_slot(o, 'exclude_from_print_conf', self.exclude_from_print_conf)
+        set_slot(o, 'exclude_from_dump_conf', self.exclude_from_dump_conf)
+        set_slot(o, 'likely_to_be_changed', self.likely_to_be_changed)
+        set_slot(o, 'not_for_definition', self.not_for_definition)
+        set_slot(o, 'reference_value_from', self.reference_value_from)
+        set_slot(o, 'secret', self.secret)
+        set_slot(o, 'has_changed', self.has_changed)
+        set_slot(o, 'foreign_data', self.foreign_data)
+        set_slot(o, '_last_conversion', self._last_conversion)
         return o
 
+    #--------------------------------------------------------------------------
+    def __setattr__(self, name, value):
+        """while this Option is shared with copies of a Namespace, each copy
+        is given a copy of it as it was just before one of its public
+        attributes is really changed.  See 'Namespace.safe_copy'"""
+        try:
+            borrowers = self._borrowers
+        except AttributeError:
+            # not yet through the constructor of a derived class
+            borrowers = None
+        if (
+            borrowers is not None
+            and not name.startswith('_')
+            and getattr(self, name, _NOTHING) is not value
+        ):
+            self._stop_lending()
+        object.__setattr__(self, name, value)
+
+    #--------------------------------------------------------------------------
+    def __getstate__(self):
+        """the copies of Namespaces sharing this Option are not pickled"""
+        state = dict(
+            (a_name, getattr(self, a_name))
+            for a_name in Option.__slots__
+            if a_name != '_borrowers'
+        )
+        # a derived class may have attributes of its own
+        state.update(getattr(self, '__dict__', ()))
+        return state
+
+    #--------------------------------------------------------------------------
+    def __setstate__(self, state):
+        set_slot = object.__setattr__
+        set_slot(self, '_borrowers', None)
+        for a_name, value in state.items():
+            set_slot(self, a_name, value)
+
+    #--------------------------------------------------------------------------
+    def _lend(self, namespace, key):
+        """share this Option with a copy of a Namespace, where it is found
+        under 'key'.  Until the loan ends, changing this Option first gives
+        that copy a copy of its own: see '__setattr__'."""
+        borrowers = self._borrowers
+        if borrowers is None:
+            borrowers = []
+            object.__setattr__(self, '_borrowers', borrowers)
+        else:
+            # forget the copies that have since been thrown away
+            borrowers[:] = [x for x in borrowers if x[0]() is not None]
+        borrowers.append((weakref.ref(namespace), key))
+
+    #--------------------------------------------------------------------------
+    def _end_loan(self, namespace, key):
+        """the copy of a Namespace no longer shares this Option"""
+        borrowers = self._borrowers
+        if borrowers is None:
+            return
+        still_borrowing = []
+        for namespace_ref, a_key in borrowers:
+            a_namespace = namespace_ref()
+            if a_namespace is None:
+                continue
+            if a_namespace is not namespace or a_key != key:
+                still_borrowing.append((namespace_ref, a_key))
+        if still_borrowing:
+            borrowers[:] = still_borrowing
+        else:
+            object.__setattr__(self, '_borrowers', None)
+
+    #--------------------------------------------------------------------------
+    def _stop_lending(self):
+        borrowers = self._borrowers
+        object.__setattr__(self, '_borrowers', None)
+        for namespace_ref, key in borrowers:
+            namespace = namespace_ref()
+            if namespace is not None:
+                namespace._stop_borrowing(key, self)
+
+
+#------------------------------------------------------------------------------
+# the types of the values that a converted string may be taken to be and
+# that may be handed out again without fear of them having been changed
+_immutable_types = (
+    six.binary_type,
+    six.text_type,
+    numbers.Number,
+    type(None),
+    tuple,
+    frozenset,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    type,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.ModuleType,
+)
+
+# the type of a value passed to 'Option.set_value' -> the method that sets
+# it.  The method is chosen the first time a type is seen.
+_set_value_plans = {}
+
+
+#------------------------------------------------------------------------------
+def _set_value_plan_for(a_type):
+    if issubclass(a_type, (six.binary_type, six.text_type)):
+        set_value_from = Option._set_value_from_string
+    elif issubclass(a_type, Option):
+        set_value_from = Option._set_value_from_option
+    elif issubclass(a_type, collections.Mapping):
+        set_value_from = Option._set_value_from_mapping
+    else:
+        set_value_from = Option._set_value_as_is
+    _set_value_plans[a_type] = set_value_from
+    return set_value_from
+
 
 #==============================================================================
 class Aggregation(object):
+    __slots__ = (
+        'name',
+        'function',
+        'value',
+        'secret',
+    )
+
     #--------------------------------------------------------------------------
     def __init__(
         self,
@@ -21,6 +21,7 @@
 from __future__ import absolute_import, division, print_function
 
 import collections
+from itertools import islice
 
 class OrderedSet(collections.MutableSet):
 
@@ -75,7 +76,110 @@ class OrderedSet(collections.MutableSet):
             return '%s()' % (self.__class__.__name__,)
         return '%s(%r)' % (self.__class__.__name__, list(self))
 
+    def __reduce__(self):
+        # the linked list would otherwise be pickled (and deep copied)
+        # recursively, one level of recursion per member
+        return (self.__class__, (list(self),))
+
     def __eq__(self, other):
         if isinstance(other, OrderedSet):
             return len(self) == len(other) and list(self) == list(other)
         return set(self) == set(other)
+
+
+# a placeholder for a discarded key in the array of a CompactOrderedSet
+_HOLE = object()
+
+
+class CompactOrderedSet(collections.MutableSet):
+    """an ordered set held in an array of the keys and a map of each key to
+    its position in the array.  The OrderedSet above spends a three element
+    list per key on its linked list, this spends a slot in the array and an
+    entry in the map.  It is used for the key order of every DotDict.
+
+    A discarded key leaves a hole in the array.  Once the holes outnumber
+    the keys, the array is rebuilt without them, so 'discard' stays O(1)
+    amortized.  Like the OrderedSet, it may be changed while it is being
+    iterated over."""
+
+    __slots__ = ('_keys', '_positions', '_holes')
+
+    def __init__(self, iterable=None):
+        self._keys = []
+        self._positions = {}
+        self._holes = 0
+        if iterable is not None:
+            for key in iterable:
+                self.add(key)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def add(self, key):
+        positions = self._positions
+        if key not in positions:
+            keys = self._keys
+            positions[key] = len(keys)
+            keys.append(key)
+
+    def discard(self, key):
+        position = self._positions.pop(key, None)
+        if position is not None:
+            self._keys[position] = _HOLE
+            self._holes += 1
+            if self._holes > 8 and self._holes > len(self._positions):
+                self._compact()
+
+    def _compact(self):
+        # a new array rather than changing the old one in place: iterators
+        # already running need the old one to find their place in the new one
+        self._keys = [key for key in self._keys if key is not _HOLE]
+        self._positions = dict(
+            (key, position) for position, key in enumerate(self._keys)
+        )
+        self._holes = 0
+
+    def __iter__(self):
+        keys = self._keys
+        index = 0
+        while True:
+            for key in islice(keys, index, None):
+                if keys is not self._keys:
+                    break
+                index += 1
+                if key is not _HOLE:
+                    yield key
+            else:
+                return
+            # the array was rebuilt without its holes during the iteration,
+            # carry on from the same place in the new one
+            index = len([key for key in keys[:index] if key is not _HOLE])
+            keys = self._keys
+
+    def __reversed__(self):
+        for key in reversed(self._keys):
+            if key is not _HOLE:
+                yield key
+
+    def pop(self, last=True):
+        if not self:
+            raise KeyError('set is empty')
+        key = next(reversed(self) if last else iter(self))
+        self.discard(key)
+        return key
+
+    def __repr__(self):
+        if not self:
+            return '%s()' % (self.__class__.__name__,)
+        return '%s(%r)' % (self.__class__.__name__, list(self))
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def __eq__(self, other):
+        if isinstance(other, (OrderedSet, CompactOrderedSet)):
+            return len(self) == len(other) and list(self) == list(other)
+        return set(self) == set(other)
@@ -0,0 +1,447 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""live reloading of configuration files.
+
+A long running service can have its configuration follow the files behind
+its 'conf', 'ini' and 'json' value sources without a restart:
+
+    config_manager = ConfigurationManager(...)
+    reloader = ConfigReloader(config_manager)
+    reloader.subscribe(my_callback)
+    reloader.start()
+
+When a watched file changes, its value source is replaced with one that
+reads the new content.  Only the options for keys whose values differ between
+the old and the new content are overlaid again, in the same order of
+precedence as the original overlay: a value from the command line still wins
+over a value from a file.  The subscribers are called with a list of tuples
+(key, old value, new value) for every option whose value changed.
+
+The reloader also publishes the configuration as a FrozenConfig in its
+'config' attribute.  Threads that read the configuration should fetch that
+attribute rather than call 'get_config' on the configuration manager: a
+reload builds a complete new FrozenConfig and then replaces the reference,
+so a reader never sees a configuration with only some of the changes
+applied and never has to take a lock.
+
+    def handle_request(request):
+        config = reloader.config  # one consistent view for the request
+        ...
+
+Files are watched with inotify where it is available (Linux) and by polling
+their modification times elsewhere.  Either way a change is only reported
+when the content of the file is different.
+
+A configuration manager restored from a snapshot has no value sources, so
+there is nothing that a reloader could watch.  Giving one to a reloader
+raises a ReloadNotPossible exception."""
+from __future__ import absolute_import, division, print_function
+
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import warnings
+
+import six
+
+from configman.config_exceptions import ConfigmanException
+from configman.dotdict import (
+    DotDict,
+    DotDictWithAcquisition,
+    acquisition_keys,
+    iteritems_breadth_first,
+)
+from configman.option import Option
+from configman.snapshot import file_stamp, stamp_is_current
+from configman.value_sources.source_exceptions import ValueException
+
+# the inotify events that mean a file has, or may have, new content.  Editors
+# often write a new file and rename it over the old one, so the directories
+# are watched rather than the files themselves.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCHED_EVENTS = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+
+
+#==============================================================================
+class ReloadNotPossible(ConfigmanException):
+    pass
+
+
+#------------------------------------------------------------------------------
+def _inotify_libc():
+    """return the C library if it offers inotify, None if it doesn't"""
+    global _libc
+    if _libc is None:
+        _libc = False
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(
+                ctypes.util.find_library('c') or 'libc.so.6',
+                use_errno=True
+            )
+            libc.inotify_init1
+            libc.inotify_add_watch
+            _libc = libc
+        except (ImportError, OSError, AttributeError):
+            pass
+    return _libc or None
+
+
+#------------------------------------------------------------------------------
+def inotify_is_available():
+    return _inotify_libc() is not None
+
+
+#==============================================================================
+class PollingWatcher(object):
+    """watch files by polling their modification times"""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, pathnames, interval=1.0):
+        self.pathnames = set(os.path.abspath(x) for x in pathnames)
+        self.interval = interval
+        self.stamps = dict((x, file_stamp(x)) for x in self.pathnames)
+
+    #--------------------------------------------------------------------------
+    def _changed(self, candidates):
+        """return the set of the candidates that have new content"""
+        changed = set()
+        for a_pathname in candidates:
+            if not stamp_is_current(a_pathname, self.stamps[a_pathname]):
+                self.stamps[a_pathname] = file_stamp(a_pathname)
+                changed.add(a_pathname)
+        return changed
+
+    #--------------------------------------------------------------------------
+    def wait_for_changes(self, timeout=0):
+        """return the set of the watched files that have changed since the
+        last time that they were reported.  If none has, wait up to
+        'timeout' seconds for one to change."""
+        give_up_at = time.time() + timeout
+        while True:
+            changed = self._changed(self.pathnames)
+            remaining = give_up_at - time.time()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    #--------------------------------------------------------------------------
+    def close(self):
+        pass
+
+
+#==============================================================================
+class InotifyWatcher(PollingWatcher):
+    """watch files with the Linux inotify facility"""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, pathnames, interval=1.0):
+        super(InotifyWatcher, self).__init__(pathnames, interval)
+        libc = _inotify_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            import ctypes
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # watch descriptor -> directory
+        self.directories = {}
+        for a_directory in set(os.path.dirname(x) for x in self.pathnames):
+            encoded_directory = a_directory
+            if isinstance(encoded_directory, six.text_type):
+                encoded_directory = encoded_directory.encode(
+                    sys.getfilesystemencoding()
+                )
+            watch_descriptor = libc.inotify_add_watch(
+                self.fd,
+                encoded_directory,
+                WATCHED_EVENTS
+            )
+            if watch_descriptor >= 0:
+                self.directories[watch_descriptor] = a_directory
+
+    #--------------------------------------------------------------------------
+    def _read_events(self):
+        """return the set of the watched files named in the pending events"""
+        candidates = set()
+        try:
+            data = os.read(self.fd, 65536)
+        except OSError as x:
+            if x.errno == errno.EAGAIN:
+                return candidates
+            raise
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            watch_descriptor, mask, cookie, length = \
+                EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            try:
+                a_directory = self.directories[watch_descriptor]
+            except KeyError:
+                continue
+            if isinstance(a_directory, six.text_type):
+                name = name.decode(sys.getfilesystemencoding())
+            a_pathname = os.path.join(a_directory, name)
+            if a_pathname in self.pathnames:
+                candidates.add(a_pathname)
+        return candidates
+
+    #--------------------------------------------------------------------------
+    def wait_for_changes(self, timeout=0):
+        give_up_at = time.time() + timeout
+        while True:
+            remaining = max(give_up_at - time.time(), 0)
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if readable:
+                changed = self._changed(self._read_events())
+                if changed:
+                    return changed
+            elif remaining <= 0:
+                return set()
+
+    #--------------------------------------------------------------------------
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+#------------------------------------------------------------------------------
+def create_watcher(pathnames, interval=1.0):
+    """return an InotifyWatcher if inotify is available, otherwise a
+    PollingWatcher"""
+    if inotify_is_available():
+        try:
+            return InotifyWatcher(pathnames, interval)
+        except OSError:
+            # out of inotify instances or watches
+            pass
+    return PollingWatcher(pathnames, interval)
+
+
+#==============================================================================
+class ConfigReloader(object):
+    """follow changes to the files behind the value sources of a
+    configuration manager.
+
+    parameters:
+        config_manager - the ConfigurationManager to keep up to date
+        watcher - an object with the methods 'wait_for_changes' and 'close'
+                  of the PollingWatcher.  If None, one is created for the
+                  files of the value sources.
+        interval - for polling, the number of seconds between looks at the
+                   files; for the background thread, the longest time that it
+                   waits before checking whether it has been stopped.
+    """
+
+    #--------------------------------------------------------------------------
+    def __init__(self, config_manager, watcher=None, interval=1.0):
+        if config_manager.restored_from_snapshot:
+            raise ReloadNotPossible(
+                "the configuration was restored from the snapshot '%s', "
+                "there are no value sources to reload it from.  A "
+                "configuration manager that is to be reloaded must not be "
+                "given a 'snapshot_pathname'"
+                % config_manager.restored_from_snapshot
+            )
+        self.config_manager = config_manager
+        self.interval = interval
+        self.subscribers = []
+        # the current configuration, replaced as a whole by every reload
+        # that changes something
+        self.config = config_manager.get_frozen_config()
+        # a watcher created here is replaced when the set of files to watch
+        # changes
+        self._watcher_is_ours = watcher is None
+        if watcher is None:
+            watcher = create_watcher(self.watched_pathnames(), interval)
+        self.watcher = watcher
+        self._lock = threading.Lock()
+        self._stop_requested = threading.Event()
+        self._thread = None
+
+    #--------------------------------------------------------------------------
+    def watched_pathnames(self):
+        """return the absolute pathnames of the files behind the value
+        sources of the configuration manager and of the files that they
+        include"""
+        pathnames = []
+        for a_value_source in self.config_manager.values_source_list:
+            a_pathname = getattr(a_value_source, 'pathname', None)
+            if a_pathname:
+                pathnames.append(os.path.abspath(a_pathname))
+                pathnames.extend(sorted(
+                    getattr(a_value_source, 'included_pathnames', ())
+                ))
+        return pathnames
+
+    #--------------------------------------------------------------------------
+    def subscribe(self, subscriber):
+        """register a callable to be called with the list of changes after
+        every reload that changed something"""
+        self.subscribers.append(subscriber)
+
+    #--------------------------------------------------------------------------
+    def unsubscribe(self, subscriber):
+        self.subscribers.remove(subscriber)
+
+    #--------------------------------------------------------------------------
+    def _affected_keys(self, changed_keys):
+        """return the keys of the options that may take their value from one
+        of the changed keys of a value source"""
+        config_manager = self.config_manager
+        option_definitions = config_manager.option_definitions
+        acquiring = issubclass(
+            config_manager.value_source_object_hook,
+            DotDictWithAcquisition
+        )
+        affected_keys = []
+        for a_key in option_definitions.keys_breadth_first():
+            if not isinstance(option_definitions.peek(a_key), Option):
+                continue
+            if acquiring:
+                candidates = acquisition_keys(a_key)
+            else:
+                candidates = (a_key,)
+            if any(x in changed_keys for x in candidates):
+                affected_keys.append(a_key)
+        return affected_keys
+
+    #--------------------------------------------------------------------------
+    def reload(self, pathnames=None):
+        """read the given files again, all of the watched files if None,
+        apply the changes to the configuration manager and tell the
+        subscribers about them.
+
+        returns:
+            a list of tuples (key, old value, new value) for every option
+            whose value changed"""
+        if pathnames is not None:
+            pathnames = set(os.path.abspath(x) for x in pathnames)
+        config_manager = self.config_manager
+        with self._lock:
+            changed_keys = set()
+            values_source_list = config_manager.values_source_list
+            for index, a_value_source in enumerate(values_source_list):
+                a_pathname = getattr(a_value_source, 'pathname', None)
+                if not a_pathname or (
+                    pathnames is not None
+                    and os.path.abspath(a_pathname) not in pathnames
+                    and pathnames.isdisjoint(
+                        getattr(a_value_source, 'included_pathnames', ())
+                    )
+                ):
+                    # neither the file nor any file it includes has changed
+                    continue
+                try:
+                    new_value_source = a_value_source.__class__(
+                        a_pathname,
+                        config_manager
+                    )
+                except ValueException as x:
+                    # the file may be in the middle of being written.  Keep
+                    # the old values until the next change.
+                    warnings.warn(
+                        "%s could not be reloaded: %s" % (a_pathname, x)
+                    )
+                    continue
+                old_values = dict(iteritems_breadth_first(
+                    a_value_source.get_values(config_manager, True, DotDict)
+                ))
+                new_values = dict(iteritems_breadth_first(
+                    new_value_source.get_values(config_manager, True, DotDict)
+                ))
+                for a_key in set(old_values) | set(new_values):
+                    if (
+                        a_key not in old_values
+                        or a_key not in new_values
+                        or old_values[a_key] != new_values[a_key]
+                    ):
+                        changed_keys.add(a_key)
+                values_source_list[index] = new_value_source
+            if self._watcher_is_ours:
+                watched_pathnames = self.watched_pathnames()
+                if set(watched_pathnames) != self.watcher.pathnames:
+                    # the includes have changed
+                    self.watcher.close()
+                    self.watcher = create_watcher(
+                        watched_pathnames,
+                        self.interval
+                    )
+            if not changed_keys:
+                return []
+            changes = config_manager._overlay_again(
+                self._affected_keys(changed_keys)
+            )
+            if changes:
+                # publish the new configuration with a single assignment
+                self.config = config_manager.get_frozen_config()
+        if changes:
+            for a_subscriber in list(self.subscribers):
+                a_subscriber(changes)
+        return changes
+
+    #--------------------------------------------------------------------------
+    def check(self, timeout=0):
+        """wait up to 'timeout' seconds for watched files to change and
+        reload those that did.
+
+        returns:
+            the list of changes, see 'reload'"""
+        changed_pathnames = self.watcher.wait_for_changes(timeout)
+        if not changed_pathnames:
+            return []
+        return self.reload(changed_pathnames)
+
+    #--------------------------------------------------------------------------
+    def _run(self):
+        while not self._stop_requested.is_set():
+            try:
+                self.check(self.interval)
+            except Exception as x:
+                # a broken subscriber or file must not end the watching
+                warnings.warn("configuration reload failed: %s" % x)
+
+    #--------------------------------------------------------------------------
+    def start(self):
+        """watch the files in a background thread"""
+        if self._thread is not None:
+            return
+        self._stop_requested.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='configman-reloader'
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    #--------------------------------------------------------------------------
+    def stop(self):
+        """stop the background thread and the watching of the files"""
+        if self._thread is not None:
+            self._stop_requested.set()
+            self._thread.join()
+            self._thread = None
+        self.watcher.close()
@@ -0,0 +1,386 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""a cache of fully resolved configuration.
+
+Building a configuration means walking the definition sources, importing
+every class named by an option, parsing the config files and running the
+expansion loop until the set of options stops growing.  For a short lived
+process that repeatedly starts with the same inputs that work is the same
+every time.  A snapshot is the pickled result of that work together with a
+record of the inputs that produced it:
+
+    * a key made from the arguments given to the ConfigurationManager: the
+      command line, the definition sources and the value sources.
+    * for the environment and any other mapping used as a value source, a
+      key made from only what it holds for the options that were defined.
+      Reading the whole environment would defeat its lazy lookups, and an
+      unrelated variable is no reason to build the configuration again.
+    * the stamps (mtime, size and sha1) of every file that was consulted:
+      config files and the files that they include, json definition files,
+      the source files of the modules that provided classes and functions
+      for the resolved options and the main script itself.
+
+A snapshot is only used if the keys are the same and none of the files has
+changed.  Whenever that is not true, or the snapshot cannot be read, the
+configuration is built from scratch and the snapshot rewritten.  Configurations
+that cannot be pickled (options with lambda converters or classes created on
+the fly, for example) are never written to a snapshot.
+
+Since a snapshot is a pickle, it must be kept in a location that only trusted
+users can write to.  It holds the values of secret options as well, so it is
+created readable by its owner only.
+
+A configuration manager restored from a snapshot has no value sources, it
+cannot be given to a configman.reloader.ConfigReloader."""
+from __future__ import absolute_import, division, print_function
+
+import collections
+import hashlib
+import inspect
+import os
+import sys
+
+import six
+from six.moves import cPickle as pickle
+
+from configman.config_exceptions import ConfigmanException
+from configman.config_file_future_proxy import ConfigFileFutureProxy
+from configman.dotdict import (
+    DotDictWithAcquisition,
+    acquisition_keys,
+    iteritems_breadth_first,
+    lookup_dotted_key,
+)
+from configman.environment import LazyEnvironment
+from configman.option import Option
+
+# bump this whenever the layout of the snapshot changes
+SNAPSHOT_FORMAT = 2
+
+
+#==============================================================================
+class SnapshotNotPossible(ConfigmanException):
+    pass
+
+
+#------------------------------------------------------------------------------
+def _hash_of(an_object):
+    try:
+        return hashlib.sha1(pickle.dumps(an_object, 2)).hexdigest()
+    except Exception as x:
+        # pickling can fail in many ways for objects that don't support it
+        raise SnapshotNotPossible(
+            '%r cannot be part of a snapshot: %s' % (an_object, x)
+        )
+
+
+#------------------------------------------------------------------------------
+def file_stamp(pathname):
+    """return a tuple of the mtime, size and sha1 of the file's content or
+    None if the file doesn't exist"""
+    try:
+        stat = os.stat(pathname)
+        with open(pathname, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+    except (IOError, OSError):
+        return None
+    return (stat.st_mtime, stat.st_size, digest)
+
+
+#------------------------------------------------------------------------------
+def stamp_is_current(pathname, stamp):
+    """return True if the file is unchanged since the stamp was taken.  The
+    content is only hashed if the mtime differs while the size is the same"""
+    try:
+        stat = os.stat(pathname)
+    except (IOError, OSError):
+        return stamp is None
+    if stamp is None:
+        return False
+    mtime, size, digest = stamp
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime == mtime:
+        return True
+    current_stamp = file_stamp(pathname)
+    return current_stamp is not None and current_stamp[2] == digest
+
+
+#------------------------------------------------------------------------------
+def _source_pathname(a_module):
+    pathname = getattr(a_module, '__file__', None)
+    if not pathname:
+        return None
+    if pathname.endswith(('.pyc', '.pyo')) and os.path.exists(pathname[:-1]):
+        return pathname[:-1]
+    return pathname
+
+
+#------------------------------------------------------------------------------
+def _modules_of(an_object):
+    """yield the modules that an object comes from.  For classes, this
+    includes the modules of all the base classes as they may contribute
+    required config too"""
+    if inspect.ismodule(an_object):
+        yield an_object
+        return
+    if inspect.isclass(an_object):
+        module_names = [a_class.__module__ for a_class in an_object.__mro__]
+    elif inspect.isroutine(an_object):
+        module_names = [getattr(an_object, '__module__', None)]
+    else:
+        return
+    for a_module_name in module_names:
+        a_module = sys.modules.get(a_module_name)
+        if a_module is not None:
+            yield a_module
+
+
+#------------------------------------------------------------------------------
+def source_key(config_manager, values_source_list):
+    """create a key representing the inputs that a configuration manager gets
+    from its constructor.  Raises SnapshotNotPossible if any of the inputs
+    cannot be represented."""
+    import configman  # deferred to avoid a circular import
+    key = [
+        SNAPSHOT_FORMAT,
+        configman.__version__,
+        sys.version,
+        list(config_manager.argv_source),
+        config_manager.config_pathname,
+        config_manager.config_optional,
+        config_manager.app_name,
+        config_manager.app_version,
+        config_manager.app_description,
+        config_manager.use_auto_help,
+        _hash_of(config_manager.value_source_object_hook),
+    ]
+    for a_definition_source in config_manager.definition_source_list:
+        if isinstance(a_definition_source, six.string_types):
+            # a file name, its contents are covered by the file stamps
+            key.append(('file', a_definition_source))
+        elif inspect.ismodule(a_definition_source):
+            key.append(('module', a_definition_source.__name__))
+        else:
+            key.append(_hash_of(a_definition_source))
+    for a_value_source in values_source_list:
+        if a_value_source is ConfigFileFutureProxy:
+            key.append('ConfigFileFutureProxy')
+        elif isinstance(a_value_source, six.string_types):
+            key.append(('file', a_value_source))
+        elif inspect.ismodule(a_value_source):
+            key.append(('module', a_value_source.__name__))
+        elif isinstance(a_value_source, LazyEnvironment):
+            # what it holds is covered by 'mapping_key'
+            key.append(('environment', repr(a_value_source)))
+        elif isinstance(a_value_source, collections.Mapping):
+            key.append(('mapping', type(a_value_source).__name__))
+        else:
+            key.append(_hash_of(a_value_source))
+    return _hash_of(key)
+
+
+#------------------------------------------------------------------------------
+def defined_option_keys(config_manager):
+    """return a list of the fully qualified keys of the Options that a
+    configuration manager defines"""
+    option_definitions = config_manager.option_definitions
+    return [
+        a_key for a_key in option_definitions.keys_breadth_first()
+        if isinstance(option_definitions.peek(a_key), Option)
+    ]
+
+
+#------------------------------------------------------------------------------
+def mapping_key(config_manager, values_source_list, option_keys):
+    """create a key representing what the mappings among the value sources
+    hold for the options with the given keys.  Of the environment, only the
+    variables that could supply one of the options are looked up.  Of any
+    other mapping, only the values of the keys that could supply one of the
+    options count, along with the names of the other keys if they could
+    fail the check for mismatches.  Raises SnapshotNotPossible if a value
+    cannot be represented."""
+    acquisition = issubclass(
+        config_manager.value_source_object_hook,
+        DotDictWithAcquisition
+    )
+    if acquisition:
+        candidate_keys = set()
+        for a_key in option_keys:
+            candidate_keys.update(acquisition_keys(a_key))
+    else:
+        candidate_keys = set(option_keys)
+    candidate_keys = sorted(candidate_keys)
+    key = []
+    for a_value_source in values_source_list:
+        if isinstance(a_value_source, LazyEnvironment):
+            if acquisition and not a_value_source.acquisition:
+                a_value_source = a_value_source.with_acquisition()
+            variable_names = set()
+            for a_key in option_keys:
+                variable_names.update(
+                    a_value_source.variable_names_for(a_key)
+                )
+            environ = a_value_source.environ
+            key.append(sorted(
+                (a_name, environ[a_name])
+                for a_name in variable_names
+                if a_name in environ
+            ))
+        elif isinstance(a_value_source, collections.Mapping):
+            values = []
+            for a_key in candidate_keys:
+                try:
+                    values.append(
+                        (a_key, lookup_dotted_key(a_value_source, a_key))
+                    )
+                except KeyError:
+                    pass
+            if a_value_source is os.environ or a_value_source.get(
+                'always_ignore_mismatches',
+                False
+            ):
+                other_keys = []
+            else:
+                other_keys = sorted(
+                    set(
+                        a_key for a_key, a_value
+                        in iteritems_breadth_first(a_value_source)
+                    ).difference(candidate_keys)
+                )
+            key.append((values, other_keys))
+    return _hash_of(key)
+
+
+#------------------------------------------------------------------------------
+def files_consulted(config_manager, values_source_list):
+    """return the set of pathnames of the files that contributed to the
+    fully resolved configuration of a configuration manager"""
+    pathnames = set()
+    for a_source in list(config_manager.definition_source_list) + list(
+        values_source_list
+    ):
+        if a_source is ConfigFileFutureProxy:
+            try:
+                a_source = config_manager.option_definitions.peek(
+                    'admin.conf'
+                ).default
+            except KeyError:
+                continue
+        if isinstance(a_source, six.string_types):
+            pathnames.add(os.path.abspath(a_source))
+        elif inspect.ismodule(a_source):
+            pathnames.add(_source_pathname(a_source))
+    for a_value_source in config_manager.values_source_list:
+        # files included by config files
+        pathnames.update(getattr(a_value_source, 'included_pathnames', ()))
+    main_module = sys.modules.get('__main__')
+    if main_module is not None:
+        pathnames.add(_source_pathname(main_module))
+    for a_key in config_manager.option_definitions.keys_breadth_first():
+        an_option = config_manager.option_definitions.peek(a_key)
+        if not isinstance(an_option, Option):
+            continue
+        for an_object in (
+            an_option.value,
+            an_option.default,
+            an_option.from_string_converter,
+            an_option.to_string_converter,
+        ):
+            for a_module in _modules_of(an_object):
+                pathnames.add(_source_pathname(a_module))
+    pathnames.discard(None)
+    return pathnames
+
+
+#------------------------------------------------------------------------------
+def load_snapshot(pathname, key, mapping_key_for=None):
+    """return the state saved in a snapshot or None if there is no snapshot,
+    it cannot be read or it is out of date.
+
+    parameters:
+        pathname - the pathname of the snapshot
+        key - the 'source_key' that the snapshot must have been saved with
+        mapping_key_for - a function of the option keys saved in the
+                          snapshot that returns the 'mapping_key' that the
+                          snapshot must have been saved with"""
+    try:
+        with open(pathname, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception:
+        # a missing, truncated or otherwise unreadable snapshot is no
+        # different from having no snapshot at all
+        return None
+    try:
+        if snapshot['key'] != key:
+            return None
+        for a_pathname, a_stamp in six.iteritems(snapshot['file_stamps']):
+            if not stamp_is_current(a_pathname, a_stamp):
+                return None
+        if mapping_key_for is not None and (
+            mapping_key_for(snapshot['option_keys'])
+            != snapshot['mapping_key']
+        ):
+            return None
+        return snapshot['state']
+    except (KeyError, TypeError, ValueError, SnapshotNotPossible):
+        return None
+
+
+#------------------------------------------------------------------------------
+def save_snapshot(
+    pathname,
+    key,
+    pathnames,
+    state,
+    option_keys=(),
+    a_mapping_key=None
+):
+    """write a snapshot of the state.  The snapshot is written to a temporary
+    file that is then renamed so that a concurrently starting process never
+    sees a partially written snapshot.  Raises SnapshotNotPossible if the
+    state cannot be pickled.
+
+    parameters:
+        pathname - the pathname of the snapshot
+        key - the 'source_key' of the inputs
+        pathnames - the pathnames of the files consulted
+        state - what is to be restored from the snapshot
+        option_keys - the keys of the options defined, for 'mapping_key'
+        a_mapping_key - the 'mapping_key' of those option keys"""
+    snapshot = {
+        'key': key,
+        'file_stamps': dict(
+            (a_pathname, file_stamp(a_pathname))
+            for a_pathname in pathnames
+        ),
+        'option_keys': list(option_keys),
+        'mapping_key': a_mapping_key,
+        'state': state,
+    }
+    try:
+        pickled_snapshot = pickle.dumps(snapshot, 2)
+    except Exception as x:
+        raise SnapshotNotPossible(
+            'the configuration cannot be pickled: %s' % x
+        )
+    temporary_pathname = '%s.%d.tmp' % (pathname, os.getpid())
+    try:
+        # left behind by an earlier process that had the same pid
+        os.unlink(temporary_pathname)
+    except OSError:
+        pass
+    # the values of secret options are in there, only the owner may read it
+    fd = os.open(
+        temporary_pathname,
+        os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+        0o600
+    )
+    with os.fdopen(fd, 'wb') as f:
+        f.write(pickled_snapshot)
+    try:
+        os.replace(temporary_pathname, pathname)
+    except AttributeError:
+        # Python 2 has no os.replace, rename is atomic on posix systems
+        os.rename(temporary_pathname, pathname)
@@ -2517,3 +2517,132 @@ c.string =   from ini
         self.assertFalse(config.option_definitions.wilma.has_changed)
         self.assertFalse(config.option_definitions.sarita.has_changed)
         self.assertTrue(config.option_definitions.robert.has_changed)
+
+    #--------------------------------------------------------------------------
+    def test_overlay_expand_fetches_values_only_when_keys_grow(self):
+        from configman.converters import str_to_classes_in_namespaces
+        from configman.value_sources import for_mapping
+        n = config_manager.Namespace()
+        n.add_option(
+            'classes',
+            default='configman.tests.test_config_manager.T1, '
+                    'configman.tests.test_config_manager.T2, '
+                    'configman.tests.test_config_manager.T3',
+            from_string_converter=str_to_classes_in_namespaces()
+        )
+        with mock.patch.object(
+            config_manager,
+            'values_of',
+            side_effect=config_manager.values_of
+        ) as mocked_values_of:
+            with mock.patch.object(
+                for_mapping.ValueSource,
+                'get_values'
+            ) as mocked_get_values:
+                config = config_manager.ConfigurationManager(
+                    n,
+                    [{'cls0.a': 17, 'cls2.ccc.x': 66}],
+                    use_admin_controls=False,
+                    use_auto_help=False,
+                    argv_source=[]
+                )
+            # one fetch per expansion level:
+            #     'classes' -> 'clsN.cls' -> 'clsN.a' ... -> no new keys
+            self.assertEqual(mocked_values_of.call_count, 3)
+            # a mapping offers lookups, it is never copied
+            self.assertEqual(mocked_get_values.call_count, 0)
+        conf = config.get_config()
+        self.assertEqual(conf.cls0.a, 17)
+        self.assertEqual(conf.cls1.b, 22)
+        self.assertEqual(conf.cls2.c, 33)
+        self.assertEqual(conf.cls2.ccc.x, 66)
+        self.assertEqual(
+            sorted(config.get_option_names()),
+            [
+                'classes', 'cls0.a', 'cls0.cls', 'cls1.b', 'cls1.cls',
+                'cls2.c', 'cls2.ccc.x', 'cls2.cls'
+            ]
+        )
+
+    #--------------------------------------------------------------------------
+    def test_mismatches_match_suffixes_only_at_dot_boundaries(self):
+        n = Namespace()
+        n.namespace('database')
+        n.database.add_option('host', default='localhost')
+        n.database.add_option('port', default=5432)
+        # 'port' may have been acquired by 'database.port'
+        cm = config_manager.ConfigurationManager(
+            n,
+            [{'admin': {'strict': True}}, {'port': 5433}],
+            value_source_object_hook=DotDictWithAcquisition,
+        )
+        self.assertEqual(cm.get_config().database.port, 5433)
+        # 'ost' is a suffix of 'database.host', but not a key that could have
+        # been acquired by it
+        self.assertRaises(
+            NotAnOptionError,
+            config_manager.ConfigurationManager,
+            n,
+            [{'admin': {'strict': True}}, {'ost': 'nowhere'}],
+        )
+        self.assertEqual(
+            config_manager.ConfigurationManager._dotted_suffixes(
+                ['x.y.z', 'a']
+            ),
+            set(['x.y.z', 'y.z', 'z', 'a'])
+        )
+
+    #--------------------------------------------------------------------------
+    def test_options_are_copied_only_when_they_change(self):
+        n = Namespace()
+        for x in range(100):
+            n.add_option('option_%d' % x, default=x)
+        n.namespace('db')
+        n.db.add_option('host', default='localhost')
+        with mock.patch.object(
+            Option,
+            'copy',
+            side_effect=Option.copy,
+            autospec=True
+        ) as mocked_copy:
+            cm = config_manager.ConfigurationManager(
+                [n],
+                [{'option_7': 77, 'db.host': 'elsewhere'}],
+                argv_source=[]
+            )
+            config = cm.get_config()
+        # only the two Options given new values have been copied
+        self.assertEqual(mocked_copy.call_count, 2)
+        self.assertEqual(config.option_7, 77)
+        self.assertEqual(config.option_8, 8)
+        self.assertEqual(config.db.host, 'elsewhere')
+        self.assertEqual(n.option_7.value, 7)
+        self.assertEqual(n.db.host.value, 'localhost')
+        # the Options still shared don't see changes to the originals
+        n.option_8.default = 88
+        n.option_8.set_value(88)
+        self.assertEqual(cm.option_definitions.option_8.value, 8)
+        self.assertEqual(cm.get_config().option_8, 8)
+
+    #--------------------------------------------------------------------------
+    def test_derived_options_in_definitions(self):
+        class MyOption(Option):
+            pass
+
+        class MySlottedOption(Option):
+            __slots__ = ()
+
+        n = Namespace()
+        n.add_option(MyOption('a', default=1))
+        n.add_option(MySlottedOption('b', default=2))
+        cm = config_manager.ConfigurationManager(
+            [n],
+            values_source_list=[],
+            argv_source=[]
+        )
+        config = cm.get_config()
+        self.assertEqual((config.a, config.b), (1, 2))
+        n.a.set_value(11)
+        self.assertEqual(cm.get_config().a, 1)
+        self.assertTrue(type(n.a) is MyOption)
+        self.assertTrue(type(n.b) is MySlottedOption)
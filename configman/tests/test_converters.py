@@ -3,10 +3,13 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import sys
 import unittest
 import datetime
 import six
 
+import mock
+
 from configman import converters
 from configman import RequiredConfig, Namespace, ConfigurationManager
 from configman.dotdict import DotDict
@@ -172,6 +175,72 @@ class TestCase(unittest.TestCase):
         """),
             Foo)
 
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_caches_resolutions(self):
+        converters.clear_python_object_cache()
+        path = 'configman.tests.test_converters.Foo'
+        real_import = six.moves.builtins.__import__
+        with mock.patch.object(
+            converters,
+            '__import__',
+            create=True,
+            side_effect=real_import
+        ) as mocked_import:
+            self.assertTrue(converters.str_to_python_object(path) is Foo)
+            # the failed probe of the whole path as a module, then the module
+            self.assertEqual(mocked_import.call_count, 2)
+            self.assertTrue(path in converters._failed_module_probes)
+
+            self.assertTrue(converters.str_to_python_object(path) is Foo)
+            self.assertEqual(mocked_import.call_count, 2)
+
+            # when a path has to be resolved again, a remembered failed probe
+            # is not repeated
+            converters.clear_python_object_cache()
+            converters._failed_module_probes.add(path)
+            self.assertTrue(converters.str_to_python_object(path) is Foo)
+            self.assertEqual(mocked_import.call_count, 3)
+
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_cache_follows_sys_modules(self):
+        converters.clear_python_object_cache()
+        path = 'configman.tests.values_for_module_tests_1.Alpha'
+        module_name = 'configman.tests.values_for_module_tests_1'
+        first_alpha = converters.str_to_python_object(path)
+        original_module = sys.modules.pop(module_name)
+        try:
+            # the module is gone, so the cached resolution is no good
+            second_alpha = converters.str_to_python_object(path)
+            self.assertTrue(second_alpha is not first_alpha)
+            self.assertTrue(sys.modules[module_name] is not original_module)
+        finally:
+            sys.modules[module_name] = original_module
+            # the import of the replacement also rebound the package attribute
+            sys.modules['configman.tests'].values_for_module_tests_1 = \
+                original_module
+        # attributes are always looked up afresh
+        with mock.patch.object(original_module, 'Alpha', Foo):
+            self.assertTrue(converters.str_to_python_object(path) is Foo)
+        self.assertTrue(converters.str_to_python_object(path) is first_alpha)
+
+    #--------------------------------------------------------------------------
+    def test_str_to_python_object_failures_are_not_cached(self):
+        converters.clear_python_object_cache()
+        self.assertRaises(
+            converters.CannotConvertError,
+            converters.str_to_python_object,
+            'configman.tests.test_converters.NoSuchThing'
+        )
+        self.assertRaises(
+            converters.CannotConvertError,
+            converters.str_to_python_object,
+            'no_such_package.no_such_module.Thing'
+        )
+        self.assertFalse(
+            'no_such_package.no_such_module.Thing'
+            in converters._python_object_resolutions
+        )
+
     #--------------------------------------------------------------------------
     def test_dict_conversions(self):
         d = {
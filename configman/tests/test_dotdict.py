@@ -13,7 +13,7 @@ from configman.dotdict import (
     configman_keys,
     create_key_translating_dot_dict
 )
-from configman.orderedset import OrderedSet
+from configman.orderedset import CompactOrderedSet
 from configman import Namespace
 
 
@@ -236,6 +236,36 @@ class TestCase(unittest.TestCase):
         actual.sort()
         self.assertEqual(expected, actual)
 
+    #--------------------------------------------------------------------------
+    def test_keys_breadth_first_is_cached(self):
+        d = DotDict()
+        d['a.b.c'] = 1
+        d['a.d'] = 2
+        keys = d.keys_breadth_first()
+        self.assertEqual(keys, ('a.d', 'a.b.c'))
+        # nothing has changed, so the very same tuple comes back
+        self.assertTrue(d.keys_breadth_first() is keys)
+        self.assertEqual(
+            d.keys_breadth_first(include_dicts=True),
+            ('a', 'a.b', 'a.d', 'a.b.c')
+        )
+        # replacing a value doesn't change the structure
+        d.a.b.c = 17
+        self.assertTrue(d.keys_breadth_first() is keys)
+        # adding a key deep within the tree invalidates the cache all the way
+        # up to the root
+        d.a.b.e = 3
+        self.assertEqual(d.keys_breadth_first(), ('a.d', 'a.b.c', 'a.b.e'))
+        self.assertEqual(d.a.keys_breadth_first(), ('d', 'b.c', 'b.e'))
+        del d['a.b.c']
+        self.assertEqual(d.keys_breadth_first(), ('a.d', 'a.b.e'))
+        d.a.d = DotDict()
+        self.assertEqual(d.keys_breadth_first(), ('a.b.e',))
+        self.assertEqual(
+            d.keys_breadth_first(include_dicts=True),
+            ('a', 'a.b', 'a.d', 'a.b.e')
+        )
+
     #--------------------------------------------------------------------------
     def test_dot_lookup(self):
         d = DotDict()
@@ -403,7 +433,7 @@ class TestCase(unittest.TestCase):
         d['a.b.d'] = 8
         d['a.x'] = 99
         d['b'] = 21
-        self.assertTrue(isinstance(d._key_order, OrderedSet))
+        self.assertTrue(isinstance(d._key_order, CompactOrderedSet))
         # the keys should be in order of insertion within each level of the
         # nested dicts
         keys_in_breadth_first_order = [
@@ -414,6 +444,159 @@ class TestCase(unittest.TestCase):
             [k for k in d.keys_breadth_first(include_dicts=True)]
         )
 
+    #--------------------------------------------------------------------------
+    def test_key_index(self):
+        d = DotDict()
+        d['a.b.c'] = 17
+        d.enable_key_index()
+        self.assertEqual(
+            d._key_index,
+            {'a': d.a, 'a.b': d.a.b, 'a.b.c': 17}
+        )
+        # changes to descendants are reflected in the index of the root
+        d.a.b.d = 8
+        self.assertEqual(d._key_index['a.b.d'], 8)
+        d['a.x.y'] = 99
+        self.assertEqual(d._key_index['a.x.y'], 99)
+        self.assertTrue(d._key_index['a.x'] is d.a.x)
+        # replacing a whole branch drops the keys of the old branch
+        old_b = d.a.b
+        d.a.b = DotDict()
+        d.a.b.z = 3
+        self.assertTrue('a.b.c' not in d._key_index)
+        self.assertTrue('a.b.d' not in d._key_index)
+        self.assertEqual(d['a.b.z'], 3)
+        # a detached branch no longer updates its old root
+        old_b.q = 5
+        self.assertTrue('a.b.q' not in d._key_index)
+        # deleting
+        del d['a.x.y']
+        self.assertTrue('a.x.y' not in d._key_index)
+        self.assertRaises(KeyError, d.__getitem__, 'a.x.y')
+        del d.a
+        self.assertEqual(d._key_index, {})
+        self.assertRaises(KeyError, d.__getitem__, 'a.b.z')
+
+    #--------------------------------------------------------------------------
+    def test_key_index_with_shared_branch(self):
+        shared = DotDict()
+        shared.x = 1
+        d = DotDict()
+        d.enable_key_index()
+        d['a.s'] = shared
+        d['b.s'] = shared
+        shared.y = 2
+        self.assertEqual(d._key_index['a.s.y'], 2)
+        self.assertEqual(d._key_index['b.s.y'], 2)
+        del d.a
+        shared.z = 3
+        self.assertTrue('a.s.z' not in d._key_index)
+        self.assertEqual(d._key_index['b.s.z'], 3)
+
+    #--------------------------------------------------------------------------
+    def test_key_index_survives_copying(self):
+        from copy import deepcopy
+        d = Namespace()
+        d.add_option('a.b.c', default=17)
+        d.enable_key_index()
+        d2 = deepcopy(d)
+        self.assertTrue(d2._key_index is not None)
+        self.assertTrue(d2['a.b.c'] is d2.a.b.c)
+        d2.a.b.add_option('d', default=8)
+        self.assertTrue('a.b.d' in d2._key_index)
+        self.assertTrue('a.b.d' not in d._key_index)
+
+    #--------------------------------------------------------------------------
+    def test_acquisition_cache_follows_changes(self):
+        d = DotDictWithAcquisition()
+        d.password = 'secret'
+        d['a.b.c.user'] = 'fred'
+        leaf = d.a.b.c
+        self.assertEqual(leaf.password, 'secret')
+        self.assertEqual(d['a.b.c.password'], 'secret')
+        self.assertEqual(d['a.x.y.password'], 'secret')
+        self.assertEqual(leaf._resolved_keys[1], {'password': 'secret'})
+
+        # a change in an ancestor
+        d.password = 'new secret'
+        self.assertEqual(leaf.password, 'new secret')
+        self.assertEqual(d['a.b.c.password'], 'new secret')
+        self.assertEqual(d['a.x.y.password'], 'new secret')
+        # a closer ancestor now has the key
+        d.a.password = 'closer'
+        self.assertEqual(leaf.password, 'closer')
+        self.assertEqual(d['a.b.c.password'], 'closer')
+        del d.a.password
+        self.assertEqual(leaf.password, 'new secret')
+        # the node itself gets the key
+        leaf.password = 'mine'
+        self.assertEqual(d['a.b.c.password'], 'mine')
+        del leaf.password
+        del d.password
+        self.assertRaises(KeyError, lambda: leaf.password)
+        self.assertRaises(KeyError, lambda: d['a.b.c.password'])
+        # a subtree moved elsewhere acquires from its new ancestors
+        other = DotDictWithAcquisition()
+        other.password = 'other'
+        other.c = leaf
+        self.assertEqual(leaf.password, 'other')
+
+    #--------------------------------------------------------------------------
+    def test_acquisition_cache_sees_changes_in_plain_dotdicts(self):
+        d = DotDictWithAcquisition()
+        d.x = DotDict()
+        d.x.y = 1
+        self.assertEqual(d['x.y'], 1)
+        d.x.y = 2
+        self.assertEqual(d['x.y'], 2)
+        d.x.z = Namespace()
+        d.x.z.add_option('w', default=3)
+        self.assertEqual(d['x.z.w'].value, 3)
+        d.x.z.add_option('w', default=4)
+        self.assertEqual(d['x.z.w'].value, 4)
+
+        # a change in another tree leaves the cache alone
+        d.a = 'a'
+        leaf = d.leaf = DotDictWithAcquisition()
+        self.assertEqual(leaf.a, 'a')
+        cache = leaf._resolved_keys
+        other = DotDictWithAcquisition()
+        other.a = 'other'
+        self.assertEqual(leaf.a, 'a')
+        self.assertTrue(leaf._resolved_keys is cache)
+
+    #--------------------------------------------------------------------------
+    def test_the_tree_shares_one_clock(self):
+        d = DotDictWithAcquisition()
+        d['a.b.c.user'] = 'fred'
+        leaf = d.a.b.c
+        self.assertTrue(leaf._clock is d._clock)
+        self.assertEqual(leaf._tree_epoch(), d._tree_epoch())
+        epoch = d._tree_epoch()
+        leaf.user = 'wilma'
+        self.assertTrue(d._tree_epoch() > epoch)
+        # a subtree moved to another tree keeps the time of that tree
+        branch = d.a.b
+        other = DotDict()
+        other.branch = branch
+        self.assertTrue(leaf._clock is other._clock)
+        self.assertTrue(leaf._clock is not d._clock)
+        # a change within a subtree held by two trees starts a new epoch in
+        # each of them
+        epochs = (d._tree_epoch(), other._tree_epoch())
+        leaf.user = 'betty'
+        self.assertTrue(d._tree_epoch() > epochs[0])
+        self.assertTrue(other._tree_epoch() > epochs[1])
+        # let go by both, the subtree keeps its own time
+        del other.branch
+        self.assertTrue(leaf._clock is d._clock)
+        del d.a.b
+        self.assertTrue(leaf._clock is branch._clock)
+        self.assertTrue(branch._clock is not d._clock)
+        epoch = d._tree_epoch()
+        leaf.user = 'pebbles'
+        self.assertEqual(d._tree_epoch(), epoch)
+
     #--------------------------------------------------------------------------
     def test_translating_key_dot_dict(self):
         HyphenUnderscoreDict = create_key_translating_dot_dict(
@@ -425,7 +608,7 @@ class TestCase(unittest.TestCase):
         d['a-a.b_b.d-d'] = 8
         d['a_a.x-x'] = 99
         d['b-b'] = 21
-        self.assertTrue(isinstance(d._key_order, OrderedSet))
+        self.assertTrue(isinstance(d._key_order, CompactOrderedSet))
         # the keys should be in order of insertion within each level of the
         # nested dicts
         keys_in_breadth_first_order = [
@@ -471,7 +654,7 @@ class TestCase(unittest.TestCase):
         d['a-a.b_b.d-d'] = 8
         d['a_a.x-x'] = 99
         d['b-b'] = 21
-        self.assertTrue(isinstance(d._key_order, OrderedSet))
+        self.assertTrue(isinstance(d._key_order, CompactOrderedSet))
         # the keys should be in order of insertion within each level of the
         # nested dicts
         keys_in_breadth_first_order = [
@@ -534,7 +717,7 @@ class TestCase(unittest.TestCase):
         d['a-a'].b_b.add_aggregation('d-d', lambda x, y, z: True)
         d['a_a'].add_option('x-x')
         d.add_option('b-b')
-        self.assertTrue(isinstance(d._key_order, OrderedSet))
+        self.assertTrue(isinstance(d._key_order, CompactOrderedSet))
         # the keys should be in order of insertion within each level of the
         # nested dicts
         keys_in_breadth_first_order = [
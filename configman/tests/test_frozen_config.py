@@ -0,0 +1,189 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import copy
+import pickle
+import unittest
+
+from configman import Namespace, ConfigurationManager
+from configman.dotdict import DotDict, DotDictWithAcquisition
+from configman.frozen_config import (
+    FrozenConfig,
+    CompiledConfig,
+    compiled_config_class,
+)
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def _a_config(self):
+        d = DotDictWithAcquisition()
+        d.a = 1
+        d.b = 'two'
+        d.x = DotDictWithAcquisition()
+        d.x.c = 3
+        d.x.y = DotDictWithAcquisition()
+        d.x.y.d = 4
+        return d
+
+    #--------------------------------------------------------------------------
+    def test_lookups(self):
+        frozen = FrozenConfig(self._a_config())
+        self.assertEqual(frozen.a, 1)
+        self.assertEqual(frozen['x.c'], 3)
+        self.assertEqual(frozen.x.y.d, 4)
+        self.assertEqual(frozen['x']['y']['d'], 4)
+        self.assertTrue(isinstance(frozen.x.y, FrozenConfig))
+        self.assertEqual(len(frozen), 3)
+        self.assertEqual(
+            sorted(frozen.keys_breadth_first()),
+            ['a', 'b', 'x.c', 'x.y.d']
+        )
+
+    #--------------------------------------------------------------------------
+    def test_acquisition_is_like_dotdict_with_acquisition(self):
+        config = self._a_config()
+        frozen = FrozenConfig(config)
+        for key in ('x.a', 'x.y.a', 'x.y.c', 'q.a', 'x.q.c'):
+            self.assertEqual(frozen[key], config[key])
+        self.assertEqual(frozen['q.r.x.y.a'], 1)
+        self.assertEqual(frozen.x.y.a, config.x.y.a)
+        self.assertRaises(KeyError, lambda: frozen['x.y.z'])
+        self.assertRaises(KeyError, lambda: frozen.x.q)
+        self.assertRaises(KeyError, lambda: frozen.q.a)
+
+    #--------------------------------------------------------------------------
+    def test_immutable(self):
+        frozen = FrozenConfig(self._a_config())
+
+        def set_it():
+            frozen.a = 2
+        self.assertRaises(AttributeError, set_it)
+
+        def set_item():
+            frozen['a'] = 2
+        self.assertRaises(TypeError, set_item)
+
+        def del_it():
+            del frozen.x
+        self.assertRaises(AttributeError, del_it)
+        self.assertEqual(frozen.a, 1)
+        self.assertTrue(copy.copy(frozen) is frozen)
+        self.assertTrue(copy.deepcopy(frozen) is frozen)
+
+    #--------------------------------------------------------------------------
+    def test_hashable_and_comparable(self):
+        one = FrozenConfig(self._a_config())
+        another = FrozenConfig(self._a_config())
+        self.assertEqual(one, another)
+        self.assertEqual(hash(one), hash(another))
+        self.assertEqual(len(set([one, another])), 1)
+        different = self._a_config()
+        different.x.y.d = 5
+        self.assertNotEqual(one, FrozenConfig(different))
+        # comparison with other mappings is by content
+        self.assertEqual(FrozenConfig({'a': 1}), {'a': 1})
+        self.assertRaises(TypeError, hash, FrozenConfig({'a': [1, 2]}))
+
+    #--------------------------------------------------------------------------
+    def test_get_frozen_config(self):
+        n = Namespace()
+        n.add_option('name', default='fred')
+        n.namespace('db')
+        n.db.add_option('port', default=5432)
+        cm = ConfigurationManager(
+            [n],
+            values_source_list=[{'db': {'port': 1234}}],
+            argv_source=[],
+            use_admin_controls=False,
+            use_auto_help=False,
+        )
+        frozen = cm.get_frozen_config()
+        self.assertTrue(isinstance(frozen, FrozenConfig))
+        self.assertEqual(frozen, cm.get_config())
+        self.assertEqual(frozen.db.port, 1234)
+        self.assertEqual(frozen.db.name, 'fred')
+
+    #--------------------------------------------------------------------------
+    def test_compiled_config(self):
+        config = self._a_config()
+        config['x.odd-key'] = 5
+        config.x._private = 6
+        compiled = CompiledConfig.from_mapping(config)
+        self.assertEqual(compiled.a, 1)
+        self.assertEqual(compiled.x.y.d, 4)
+        self.assertEqual(compiled['x.y.d'], 4)
+        self.assertEqual(compiled['x.odd-key'], 5)
+        self.assertEqual(getattr(compiled.x, 'odd-key'), 5)
+        self.assertEqual(compiled.x._private, 6)
+        # acquisition
+        self.assertEqual(compiled.x.y.a, 1)
+        self.assertEqual(compiled.x.y.c, 3)
+        self.assertEqual(compiled['q.x.y.b'], 'two')
+        self.assertRaises(KeyError, lambda: compiled.x.q)
+        self.assertRaises(KeyError, lambda: compiled['x.y.q'])
+        self.assertEqual(list(compiled.x.y), ['d'])
+        self.assertEqual(len(compiled.x), 4)
+        self.assertEqual(compiled, FrozenConfig(config))
+        self.assertEqual(hash(compiled), hash(FrozenConfig(config)))
+
+        def set_it():
+            compiled.a = 2
+        self.assertRaises(AttributeError, set_it)
+        self.assertRaises(AttributeError, delattr, compiled, 'a')
+
+    #--------------------------------------------------------------------------
+    def test_compiled_config_classes_are_shared(self):
+        one = CompiledConfig.from_mapping(DotDict({'a': 1, 'b': 2}))
+        another = CompiledConfig.from_mapping(DotDict({'a': 3, 'b': 4}))
+        self.assertTrue(type(one) is type(another))
+        self.assertTrue(issubclass(type(one), CompiledConfig))
+        self.assertTrue(
+            type(one) is compiled_config_class(CompiledConfig, ('a', 'b'))
+        )
+
+    #--------------------------------------------------------------------------
+    def test_compiled_config_pickles(self):
+        config = self._a_config()
+        config['x.odd-key'] = 5
+        compiled = CompiledConfig.from_mapping(config)
+        self.assertEqual(type(compiled).__module__, CompiledConfig.__module__)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copied = pickle.loads(pickle.dumps(compiled, protocol))
+            self.assertEqual(copied, compiled)
+            self.assertTrue(type(copied) is type(compiled))
+            self.assertTrue(type(copied.x) is type(compiled.x))
+            self.assertEqual(copied['x.odd-key'], 5)
+            # the nested namespaces still acquire from their parents
+            self.assertEqual(copied.x.y.a, 1)
+            self.assertEqual(hash(copied), hash(compiled))
+
+    #--------------------------------------------------------------------------
+    def test_get_config_with_compiled_config(self):
+
+        class MyConfig(CompiledConfig):
+            __slots__ = ()
+
+            def connection_string(self):
+                return '%s:%s' % (self.host, self.port)
+
+        n = Namespace()
+        n.add_option('host', default='localhost')
+        n.namespace('db')
+        n.db.add_option('port', default=5432)
+        cm = ConfigurationManager(
+            [n],
+            values_source_list=[],
+            argv_source=[],
+            use_admin_controls=False,
+            use_auto_help=False,
+        )
+        config = cm.get_config(mapping_class=MyConfig)
+        self.assertTrue(isinstance(config.db, MyConfig))
+        self.assertEqual(config.db.connection_string(), 'localhost:5432')
+        with cm.context(mapping_class=CompiledConfig) as config:
+            self.assertEqual(config.db.port, 5432)
@@ -0,0 +1,78 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import os
+import subprocess
+import sys
+import unittest
+
+import configman
+
+# the modules that are only imported when a source that needs them turns up
+lazily_imported_modules = (
+    'argparse',
+    'configobj',
+    'configman.def_sources.for_argparse',
+    'configman.def_sources.for_json',
+    'configman.def_sources.for_mappings',
+    'configman.def_sources.for_modules',
+    'configman.value_sources.for_argparse',
+    'configman.value_sources.for_conf',
+    'configman.value_sources.for_configobj',
+    'configman.value_sources.for_getopt',
+    'configman.value_sources.for_json',
+    'configman.value_sources.for_mapping',
+    'configman.value_sources.for_modules',
+)
+
+
+#------------------------------------------------------------------------------
+def import_times(*module_names):
+    """import the modules in a fresh interpreter with '-X importtime' and
+    return a mapping of the name of every module imported along with them,
+    including those of the interpreter's startup, to the microseconds that
+    it took to import it, not counting the modules that it imported"""
+    environ = dict(os.environ)
+    environ['PYTHONPATH'] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(configman.__file__))]
+        + [x for x in [environ.get('PYTHONPATH')] if x]
+    )
+    output = subprocess.check_output(
+        [
+            sys.executable, '-X', 'importtime', '-c',
+            '; '.join('import %s' % x for x in module_names)
+        ],
+        stderr=subprocess.STDOUT,
+        env=environ,
+    ).decode('utf-8')
+    times = {}
+    for a_line in output.splitlines():
+        if not a_line.startswith('import time:'):
+            continue
+        self_time, cumulative_time, name = a_line[12:].split('|')
+        if self_time.strip().isdigit():
+            times[name.strip()] = int(self_time)
+    return times
+
+
+#==============================================================================
+@unittest.skipIf(
+    sys.version_info < (3, 7),
+    "'-X importtime' needs Python 3.7 or later"
+)
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def test_backends_are_not_imported_with_configman(self):
+        times = import_times('configman')
+        self.assertTrue('configman' in times)
+        imported = [x for x in lazily_imported_modules if x in times]
+        self.assertEqual(imported, [])
+
+    #--------------------------------------------------------------------------
+    def test_argument_parser_is_imported_when_asked_for(self):
+        from configman.def_sources.for_argparse import ArgumentParser
+        self.assertTrue(configman.ArgumentParser is ArgumentParser)
+        self.assertRaises(AttributeError, getattr, configman, 'no_such_name')
@@ -3,7 +3,9 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
 
+import gc
 import unittest
+import weakref
 
 from configman.memoize import memoize
 
@@ -91,3 +93,82 @@ class TestCase(unittest.TestCase):
             expected = [(x, x, x) for x in range(10)]
             self.assertEqual(results, expected)
             self.assertEqual(A.counter, 10)
+
+    #--------------------------------------------------------------------------
+    def test_memoize_least_recently_used(self):
+
+        @memoize(max_cache_size=3)
+        def foo(a):
+            foo.calls.append(a)
+            return a * 2
+        foo.calls = []
+
+        for x in (1, 2, 3, 1, 4):
+            foo(x)
+        # 2 was the least recently used when 4 needed room
+        self.assertEqual(foo.calls, [1, 2, 3, 4])
+        foo(1)
+        foo(3)
+        self.assertEqual(foo.calls, [1, 2, 3, 4])
+        foo(2)
+        self.assertEqual(foo.calls, [1, 2, 3, 4, 2])
+
+        info = foo.cache_info()
+        self.assertEqual(info.hits, 3)
+        self.assertEqual(info.misses, 5)
+        self.assertEqual(info.evictions, 2)
+        self.assertEqual(info.maxsize, 3)
+        self.assertEqual(info.currsize, 3)
+
+        foo.cache_clear()
+        self.assertEqual(foo.cache_info().currsize, 0)
+        foo(1)
+        self.assertEqual(foo.calls, [1, 2, 3, 4, 2, 1])
+
+    #--------------------------------------------------------------------------
+    def test_memoize_unhashable_arguments(self):
+
+        @memoize()
+        def foo(a):
+            foo.counter += 1
+            return len(a)
+        foo.counter = 0
+
+        self.assertEqual(foo([1, 2]), 2)
+        self.assertEqual(foo([1, 2]), 2)
+        self.assertEqual(foo.counter, 2)
+        self.assertEqual(foo.cache_info().uncacheable, 2)
+        self.assertEqual(foo.cache_info().misses, 0)
+
+    #--------------------------------------------------------------------------
+    def test_memoize_instance_caches_are_separate_and_weak(self):
+
+        class A(object):
+            def __init__(self):
+                self.counter = 0
+
+            @memoize(max_cache_size=2)
+            def foo(self, a):
+                self.counter += 1
+                return a
+
+        a = A()
+        b = A()
+        for x in range(2):
+            a.foo(x)
+            b.foo(x)
+        # each instance has a cache of its own, so there were no evictions
+        self.assertEqual(A.foo.cache_info(a).currsize, 2)
+        self.assertEqual(A.foo.cache_info(b).currsize, 2)
+        self.assertEqual(A.foo.cache_info().evictions, 0)
+
+        A.foo.cache_clear(a)
+        self.assertEqual(A.foo.cache_info(a).currsize, 0)
+        self.assertEqual(A.foo.cache_info(b).currsize, 2)
+
+        # the cache doesn't keep the instance alive
+        a_reference = weakref.ref(a)
+        del a
+        gc.collect()
+        self.assertTrue(a_reference() is None)
+        self.assertEqual(A.foo.cache_info().currsize, 2)
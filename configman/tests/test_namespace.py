@@ -6,12 +6,15 @@ from __future__ import absolute_import, division, print_function
 import unittest
 import datetime
 import functools
+import pickle
+import mock
 
 import configman.config_manager as config_manager
 from configman.datetime_util import datetime_from_ISO_string
 
 from configman.option import Option
-from configman.orderedset import OrderedSet
+from configman.namespace import OutputNamespace
+from configman.orderedset import CompactOrderedSet
 
 
 #==============================================================================
@@ -250,7 +253,7 @@ class TestCase(unittest.TestCase):
         d.a.b.add_option('d')
         d.a.add_option('x')
         d.add_aggregation('b', lambda x, y, z: None)
-        self.assertTrue(isinstance(d._key_order, OrderedSet))
+        self.assertTrue(isinstance(d._key_order, CompactOrderedSet))
         # the keys should be in order of insertion within each level of the
         # nested dicts
         keys_in_breadth_first_order = [
@@ -288,3 +291,172 @@ class TestCase(unittest.TestCase):
         namespace = n.namespace('deeper', 'My doc')
         self.assertEqual(namespace, n.deeper)
         self.assertEqual(namespace._doc, 'My doc')
+
+    #--------------------------------------------------------------------------
+    def test_safe_copy(self):
+        n = config_manager.Namespace()
+        n.add_option('a', default=1)
+        n.namespace('b')
+        n.b.add_option('c', default=2, reference_value_from='x.y')
+        n.b.add_option('d', default=3)
+        n2 = n.safe_copy('z')
+        self.assertEqual(
+            n2.keys_breadth_first(include_dicts=True),
+            ('a', 'b', 'b.c', 'b.d')
+        )
+        # 'a' needed a new reference_value_from, the others are shared
+        self.assertEqual(n2._borrowed, None)
+        self.assertEqual(sorted(n2.b._borrowed.keys()), ['c', 'd'])
+        a = n2.a
+        self.assertTrue(a is not n.a)
+        self.assertTrue(n2.a is a)
+        self.assertEqual(a.value, 1)
+        self.assertEqual(a.reference_value_from, 'z')
+        self.assertEqual(n.a.reference_value_from, None)
+        # nested namespaces don't get the new reference_value_from
+        self.assertTrue(n2.b.peek('c') is n.b.c)
+        self.assertTrue(n2.peek('b.d') is n.b.d)
+        self.assertEqual(n2['b.c'].reference_value_from, 'x.y')
+        self.assertEqual(n2['b.d'].reference_value_from, None)
+        n2.b.d.default = 33
+        self.assertEqual(n.b.d.default, 3)
+        self.assertEqual(n2.b._borrowed, {})
+
+    #--------------------------------------------------------------------------
+    def test_safe_copy_shares_options_until_they_change(self):
+        n = config_manager.Namespace()
+        n.add_option('a', default=1)
+        n.add_option('b', default=2)
+        n.add_option('c', default=3)
+        n2 = n.safe_copy()
+        n3 = n.safe_copy()
+        n4 = n2.safe_copy()
+        n2.enable_key_index()
+        self.assertTrue(n2.peek('a') is n.a)
+        self.assertTrue(n4.peek('a') is n.a)
+        # changing the original leaves the copies as they were
+        n.a.default = 11
+        n.a.set_value(11)
+        self.assertEqual(n.a.value, 11)
+        for a_copy in (n2, n3, n4):
+            self.assertEqual(a_copy.peek('a').default, 1)
+            self.assertEqual(a_copy.a.value, 1)
+        self.assertTrue(n2['a'] is n2.a)
+        # as does changing a copy
+        n3.b.set_value(22)
+        self.assertEqual(n.b.value, 2)
+        self.assertEqual(n2.b.value, 2)
+        # setting an Option to what it already is changes nothing
+        self.assertTrue(n2.peek('c')._is_set_to(3))
+        self.assertFalse(n2.peek('c')._is_set_to(4))
+        self.assertEqual(len(n.c._borrowers), 3)
+        del n2.c, n3.c, n4.c
+        self.assertEqual(n.c._borrowers, None)
+        # a pickled copy has Options of its own, as does a pickled original
+        n5 = pickle.loads(pickle.dumps(n.safe_copy()))
+        self.assertEqual(n5._borrowed, None)
+        self.assertEqual(n5.c.value, 3)
+        self.assertEqual(n5.c._borrowers, None)
+        n6 = pickle.loads(pickle.dumps(n))
+        self.assertEqual(n6.c._borrowers, None)
+        self.assertEqual(n6, n)
+
+    #--------------------------------------------------------------------------
+    def test_safe_copy_of_derived_options(self):
+        class MyOption(Option):
+            pass
+
+        class MySlottedOption(Option):
+            __slots__ = ('extra',)
+
+        n = config_manager.Namespace()
+        n.add_option(MyOption('a', default=1))
+        n.a.extra = 'x'
+        n.add_option(MySlottedOption('b', default=2))
+        n.b.extra = 'y'
+        n2 = n.safe_copy()
+        self.assertTrue(n2.peek('a') is n.a)
+        self.assertTrue(n2.peek('b') is n.b)
+        n.a.set_value(11)
+        n.b.set_value(22)
+        self.assertEqual(n2.a.value, 1)
+        self.assertEqual(n2.b.value, 2)
+        self.assertTrue(type(n.a) is MyOption)
+        self.assertTrue(type(n.b) is MySlottedOption)
+        self.assertEqual((n.a.extra, n.b.extra), ('x', 'y'))
+
+    #--------------------------------------------------------------------------
+    def test_safe_copy_replace_and_delete_borrowed(self):
+        n = config_manager.Namespace()
+        n.add_option('a', default=1)
+        n.add_option('b', default=2)
+        n.add_option('c', default=3)
+        n2 = n.safe_copy()
+        n2.add_option('a', default=11)
+        del n2.b
+        self.assertEqual(list(n2.keys()), ['a', 'c'])
+        self.assertEqual(n2.a.default, 11)
+        self.assertEqual(n.a.default, 1)
+        self.assertTrue('b' in n)
+        # a copy of a copy
+        n3 = n2.safe_copy()
+        self.assertEqual(n3, n2)
+        self.assertTrue(n3.c is not n2.c)
+        self.assertTrue(n3.c is not n.c)
+
+    #--------------------------------------------------------------------------
+    def test_safe_copy_into_indexed_namespace(self):
+        n = config_manager.Namespace()
+        n.add_option('a', default=1)
+        root = config_manager.Namespace()
+        root.enable_key_index()
+        root.sub = n.safe_copy()
+        self.assertTrue(root['sub.a'] is root.sub.a)
+        self.assertTrue(root['sub.a'] is not n.a)
+
+    #--------------------------------------------------------------------------
+    def test_output_namespace(self):
+        n = config_manager.Namespace()
+        n.add_option('a', default=1)
+        n.add_option('password', default='xyzzy', secret=True)
+        n.namespace('admin')
+        n.admin.add_option('conf', default='x.ini')
+        n.admin.add_option('key', default='abc', secret=True)
+        n.namespace('db')
+        n.db.add_option('host', default='localhost')
+        n.db.add_option('password', default='plugh', secret=True)
+        n.db.namespace('empty')
+        view = OutputNamespace(
+            n,
+            blocked_keys=['admin.conf', 'db.host'],
+            mask_secrets=True
+        )
+        self.assertEqual(list(view.keys()), ['a', 'password', 'admin', 'db'])
+        self.assertEqual(
+            view.keys_breadth_first(),
+            ('a', 'password', 'admin.key', 'db.password')
+        )
+        self.assertTrue('db.host' not in view)
+        self.assertTrue('db.empty' not in view)
+        self.assertEqual(len(view.db), 1)
+        self.assertTrue(isinstance(view.db, config_manager.Namespace))
+        # a nested view is made and checked for emptiness only once
+        self.assertTrue(view.db is view.db)
+        with mock.patch.object(
+            OutputNamespace,
+            '__init__',
+            side_effect=AssertionError('a view was made again')
+        ):
+            self.assertEqual(
+                view.keys_breadth_first(include_dicts=True),
+                ('a', 'password', 'admin', 'db', 'admin.key', 'db.password')
+            )
+        self.assertEqual(view.password.value, '*' * 16)
+        self.assertEqual(view['db.password'].value, '*' * 16)
+        # secrets in 'admin' are left alone
+        self.assertEqual(view.admin.key.value, 'abc')
+        # the viewed Namespace is unchanged
+        self.assertEqual(n.password.value, 'xyzzy')
+        self.assertEqual(n.db.password.value, 'plugh')
+        self.assertTrue('empty' in n.db)
+        self.assertRaises(AttributeError, setattr, view, 'a', 2)
@@ -362,6 +362,42 @@ class TestCase(unittest.TestCase):
         o1.set_value(val)
         self.assertEqual(o1.value, val)
 
+    #--------------------------------------------------------------------------
+    def test_set_value_reuses_the_last_conversion(self):
+        calls = []
+
+        def counting_int(a_string):
+            calls.append(a_string)
+            return int(a_string)
+
+        def counting_list(a_string):
+            calls.append(a_string)
+            return a_string.split(',')
+
+        o = Option('number', from_string_converter=counting_int)
+        o.set_value('17')
+        self.assertTrue(o.has_changed)
+        o.set_value('17')
+        self.assertEqual(o.value, 17)
+        self.assertFalse(o.has_changed)
+        self.assertEqual(calls, ['17'])
+        o.set_value('18')
+        self.assertEqual(o.value, 18)
+        self.assertTrue(o.has_changed)
+        self.assertEqual(calls, ['17', '18'])
+        # a new converter converts again
+        o.from_string_converter = float
+        o.set_value('18')
+        self.assertEqual(o.value, 18.0)
+        self.assertTrue(isinstance(o.value, float))
+        # values that could be changed in place are converted every time
+        o = Option('names', from_string_converter=counting_list)
+        o.set_value('a,b')
+        o.value.append('c')
+        o.set_value('a,b')
+        self.assertEqual(o.value, ['a', 'b'])
+        self.assertEqual(calls, ['17', '18', 'a,b', 'a,b'])
+
     #--------------------------------------------------------------------------
     def test_set_default(self):
         o1 = Option(
@@ -432,3 +468,29 @@ class TestCase(unittest.TestCase):
         )
         o2 = o.copy()
         self.assertEqual(o, o2)
+        for an_attribute in Option.__slots__:
+            self.assertEqual(
+                getattr(o, an_attribute),
+                getattr(o2, an_attribute)
+            )
+        o2.value = 10
+        self.assertEqual(o.value, 0)
+
+    #--------------------------------------------------------------------------
+    def test_copy_repeats_constructor_defaulting(self):
+        o = Option(name='dwight')
+        # these assignments bypass the constructor's defaulting
+        o.default = 17
+        o.from_string_converter = 'int'
+        o2 = o.copy()
+        self.assertEqual(o2.value, 17)
+        self.assertTrue(o2.from_string_converter is int)
+        o.from_string_converter = None
+        o3 = o.copy()
+        self.assertTrue(o3.from_string_converter is int)
+
+    #--------------------------------------------------------------------------
+    def test_slots(self):
+        o = Option(name='dwight', default=17)
+        self.assertFalse(hasattr(o, '__dict__'))
+        self.assertRaises(AttributeError, setattr, o, 'not_an_attribute', 1)
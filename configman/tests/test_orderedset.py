@@ -0,0 +1,71 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import copy
+import pickle
+import unittest
+
+from configman.orderedset import OrderedSet, CompactOrderedSet
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def test_behaves_like_ordered_set(self):
+        keys = ['k%d' % x for x in range(50)]
+        compact = CompactOrderedSet(keys)
+        linked = OrderedSet(keys)
+        for a_key in keys[::3] + ['not there']:
+            compact.discard(a_key)
+            linked.discard(a_key)
+        compact.add('k0')
+        linked.add('k0')
+        compact.add('k1')
+        self.assertEqual(list(compact), list(linked))
+        self.assertEqual(list(reversed(compact)), list(reversed(linked)))
+        self.assertEqual(len(compact), len(linked))
+        self.assertEqual(compact, linked)
+        self.assertTrue('k1' in compact)
+        self.assertTrue('k3' not in compact)
+        self.assertEqual(compact.pop(), 'k0')
+        self.assertEqual(compact.pop(last=False), 'k1')
+        self.assertEqual(compact, set(linked) - set(['k0', 'k1']))
+
+    #--------------------------------------------------------------------------
+    def test_holes_are_compacted(self):
+        compact = CompactOrderedSet(range(100))
+        for x in range(90):
+            compact.discard(x)
+        self.assertTrue(len(compact._keys) < 100)
+        self.assertEqual(list(compact), list(range(90, 100)))
+        compact.add(0)
+        self.assertEqual(list(compact)[-1], 0)
+
+    #--------------------------------------------------------------------------
+    def test_change_during_iteration(self):
+        compact = CompactOrderedSet(range(100))
+        seen = []
+        for x in compact:
+            seen.append(x)
+            if x == 10:
+                # enough to rebuild the array in the middle of the iteration
+                for y in range(11, 80):
+                    compact.discard(y)
+                compact.add(100)
+        self.assertEqual(seen, list(range(11)) + list(range(80, 101)))
+
+    #--------------------------------------------------------------------------
+    def test_copy_and_pickle(self):
+        compact = CompactOrderedSet('abc')
+        compact.discard('b')
+        for a_copy in (
+            copy.copy(compact),
+            copy.deepcopy(compact),
+            pickle.loads(pickle.dumps(compact)),
+        ):
+            self.assertEqual(list(a_copy), ['a', 'c'])
+            a_copy.add('d')
+            self.assertEqual(list(compact), ['a', 'c'])
@@ -0,0 +1,231 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import getopt
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+from configman import Namespace, ConfigurationManager
+from configman import reloader
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ini_pathname = os.path.join(self.tmp_dir, 'app.ini')
+        self.json_pathname = os.path.join(self.tmp_dir, 'app.json')
+        self._write(self.ini_pathname, '[db]\nhost=localhost\nport=5432\n')
+        self._write(self.json_pathname, json.dumps({'name': 'wilma'}))
+
+    #--------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    #--------------------------------------------------------------------------
+    def _write(self, pathname, content):
+        # write and rename, the way many editors do
+        with open(pathname + '.tmp', 'w') as f:
+            f.write(content)
+        os.rename(pathname + '.tmp', pathname)
+
+    #--------------------------------------------------------------------------
+    def _config_manager(self, argv_source=None):
+        n = Namespace()
+        n.add_option('name', default='fred')
+        n.add_option('user', default='betty')
+        n.namespace('db')
+        n.db.add_option('host', default='nowhere')
+        n.db.add_option('port', default=1, from_string_converter=int)
+        return ConfigurationManager(
+            [n],
+            values_source_list=[self.ini_pathname, self.json_pathname, getopt],
+            argv_source=argv_source or [],
+            use_admin_controls=False,
+            use_auto_help=False,
+        )
+
+    #--------------------------------------------------------------------------
+    def test_reload_applies_only_the_changes(self):
+        cm = self._config_manager(argv_source=['--user=barney'])
+        a_reloader = reloader.ConfigReloader(
+            cm,
+            watcher=reloader.PollingWatcher([])
+        )
+        self.assertEqual(
+            sorted(a_reloader.watched_pathnames()),
+            sorted([self.ini_pathname, self.json_pathname])
+        )
+        published = []
+        a_reloader.subscribe(published.append)
+
+        self._write(self.ini_pathname, '[db]\nhost=db.example.com\n')
+        self._write(self.json_pathname, json.dumps({
+            'name': 'wilma',
+            'user': 'fred',
+        }))
+        port_option = cm.option_definitions.db.port
+        old_config = a_reloader.config
+        changes = a_reloader.reload()
+        # the port is back to its default, the command line still wins for
+        # the user
+        self.assertEqual(changes, [
+            ('db.host', 'localhost', 'db.example.com'),
+            ('db.port', 5432, 1),
+        ])
+        self.assertEqual(published, [changes])
+        self.assertTrue(cm.option_definitions.db.port is port_option)
+        config = cm.get_config()
+        self.assertEqual(config.db.host, 'db.example.com')
+        self.assertEqual(config.user, 'barney')
+        self.assertEqual(config.name, 'wilma')
+        # the published configuration was replaced, not changed
+        self.assertEqual(a_reloader.config, config)
+        self.assertEqual(old_config.db.host, 'localhost')
+        self.assertEqual(old_config.db.port, 5432)
+
+        # nothing changed, nothing published
+        self.assertEqual(a_reloader.reload(), [])
+        self.assertEqual(len(published), 1)
+
+    #--------------------------------------------------------------------------
+    def test_broken_file_keeps_the_old_values(self):
+        cm = self._config_manager()
+        a_reloader = reloader.ConfigReloader(
+            cm,
+            watcher=reloader.PollingWatcher([])
+        )
+        self._write(self.json_pathname, '{"name": ')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(a_reloader.reload([self.json_pathname]), [])
+        self.assertEqual(len(caught), 1)
+        self.assertEqual(cm.get_config().name, 'wilma')
+
+    #--------------------------------------------------------------------------
+    def test_reload_after_a_change_to_an_included_file(self):
+        db_pathname = os.path.join(self.tmp_dir, 'db.ini')
+        self._write(db_pathname, 'host=localhost\n')
+        self._write(self.ini_pathname, '[db]\n+include ./db.ini\n')
+        cm = self._config_manager()
+        a_reloader = reloader.ConfigReloader(cm, interval=0.01)
+        try:
+            self.assertTrue(db_pathname in a_reloader.watched_pathnames())
+            self._write(db_pathname, 'host=db.example.com\n')
+            self.assertEqual(
+                a_reloader.check(5),
+                [('db.host', 'localhost', 'db.example.com')]
+            )
+            # an include that is no longer included is no longer watched
+            self._write(self.ini_pathname, '[db]\nhost=elsewhere\n')
+            a_reloader.check(5)
+            self.assertEqual(cm.get_config().db.host, 'elsewhere')
+            self.assertTrue(
+                db_pathname not in a_reloader.watcher.pathnames
+            )
+        finally:
+            a_reloader.stop()
+
+    #--------------------------------------------------------------------------
+    def test_reload_of_a_referenced_value(self):
+        n = Namespace()
+        n.namespace('source')
+        n.source.add_option(
+            'host',
+            default='nowhere',
+            reference_value_from='resource.db'
+        )
+        n.namespace('destination')
+        n.destination.add_option(
+            'host',
+            default='nowhere',
+            reference_value_from='resource.db'
+        )
+        self._write(
+            self.ini_pathname,
+            '[resource]\n[[db]]\nhost=localhost\n'
+            '[destination]\nhost=elsewhere\n'
+        )
+        cm = ConfigurationManager(
+            [n],
+            values_source_list=[self.ini_pathname],
+            argv_source=[],
+            use_admin_controls=False,
+            use_auto_help=False,
+        )
+        config = cm.get_config()
+        self.assertEqual(config.source.host, 'localhost')
+        self.assertEqual(config.destination.host, 'elsewhere')
+        a_reloader = reloader.ConfigReloader(
+            cm,
+            watcher=reloader.PollingWatcher([])
+        )
+        self._write(
+            self.ini_pathname,
+            '[resource]\n[[db]]\nhost=db.example.com\n'
+            '[destination]\nhost=elsewhere\n'
+        )
+        # the option that refers to the changed value follows it, the one
+        # with a value of its own keeps it
+        self.assertEqual(a_reloader.reload(), [
+            ('resource.db.host', 'localhost', 'db.example.com'),
+            ('source.host', 'localhost', 'db.example.com'),
+        ])
+        config = cm.get_config()
+        self.assertEqual(config.source.host, 'db.example.com')
+        self.assertEqual(config.destination.host, 'elsewhere')
+
+    #--------------------------------------------------------------------------
+    def _check_watcher(self, a_watcher):
+        try:
+            self.assertEqual(a_watcher.wait_for_changes(0), set())
+            self._write(self.ini_pathname, '[db]\nhost=db.example.com\n')
+            self.assertEqual(
+                a_watcher.wait_for_changes(5),
+                set([self.ini_pathname])
+            )
+            # the same content again is not a change
+            self._write(self.ini_pathname, '[db]\nhost=db.example.com\n')
+            self.assertEqual(a_watcher.wait_for_changes(0.1), set())
+        finally:
+            a_watcher.close()
+
+    #--------------------------------------------------------------------------
+    def test_polling_watcher(self):
+        self._check_watcher(reloader.PollingWatcher(
+            [self.ini_pathname, self.json_pathname],
+            interval=0.01
+        ))
+
+    #--------------------------------------------------------------------------
+    def test_inotify_watcher(self):
+        if not reloader.inotify_is_available():
+            return
+        self._check_watcher(reloader.InotifyWatcher(
+            [self.ini_pathname, self.json_pathname]
+        ))
+
+    #--------------------------------------------------------------------------
+    def test_background_thread(self):
+        cm = self._config_manager()
+        a_reloader = reloader.ConfigReloader(cm, interval=0.01)
+        published = []
+        a_reloader.subscribe(published.append)
+        a_reloader.start()
+        try:
+            self._write(self.json_pathname, json.dumps({'name': 'pebbles'}))
+            for x in range(500):
+                if published:
+                    break
+                a_reloader._stop_requested.wait(0.01)
+        finally:
+            a_reloader.stop()
+        self.assertEqual(published, [[('name', 'wilma', 'pebbles')]])
+        self.assertEqual(cm.get_config().name, 'pebbles')
@@ -0,0 +1,190 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import getopt
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+import configman.config_manager as config_manager
+from configman import Namespace, RequiredConfig, reloader, snapshot
+from configman.converters import class_converter
+from configman.environment import LazyEnvironment
+
+
+#==============================================================================
+class Alpha(RequiredConfig):
+    required_config = Namespace()
+    required_config.add_option('size', default=17)
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.snapshot_pathname = os.path.join(self.tmp_dir, 'config.snapshot')
+        self.ini_pathname = os.path.join(self.tmp_dir, 'app.ini')
+        with open(self.ini_pathname, 'w') as f:
+            f.write('[alpha]\nsize=4\n')
+
+    #--------------------------------------------------------------------------
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    #--------------------------------------------------------------------------
+    def _definitions(self):
+        n = Namespace()
+        n.add_option('name', default='fred')
+        n.namespace('alpha')
+        n.alpha.add_option(
+            'cls',
+            default=Alpha,
+            from_string_converter=class_converter
+        )
+        return n
+
+    #--------------------------------------------------------------------------
+    def _config_manager(self, definitions=None, argv_source=None):
+        if definitions is None:
+            definitions = self._definitions()
+        return config_manager.ConfigurationManager(
+            [definitions],
+            values_source_list=[self.ini_pathname, getopt],
+            argv_source=argv_source or [],
+            use_admin_controls=False,
+            use_auto_help=False,
+            snapshot_pathname=self.snapshot_pathname,
+        )
+
+    #--------------------------------------------------------------------------
+    def test_snapshot_is_written_and_used(self):
+        cm = self._config_manager(argv_source=['--name=wilma'])
+        self.assertTrue(os.path.exists(self.snapshot_pathname))
+        # only the owner may read the values within
+        mode = os.stat(self.snapshot_pathname).st_mode
+        self.assertEqual(mode & 0o777, 0o600)
+        self.assertTrue(cm.restored_from_snapshot is None)
+        config = cm.get_config()
+        self.assertEqual(config.name, 'wilma')
+        self.assertEqual(config.alpha.size, 4)
+
+        with mock.patch.object(
+            config_manager.ConfigurationManager,
+            '_build_option_definitions'
+        ) as mocked_build:
+            cm = self._config_manager(argv_source=['--name=wilma'])
+            self.assertFalse(mocked_build.called)
+        config = cm.get_config()
+        self.assertEqual(config.name, 'wilma')
+        self.assertEqual(config.alpha.size, 4)
+        self.assertTrue(config.alpha.cls is Alpha)
+        self.assertEqual(cm.option_definitions['alpha.size'].value, 4)
+        # with no value sources, there is nothing to reload
+        self.assertEqual(cm.restored_from_snapshot, self.snapshot_pathname)
+        self.assertRaises(
+            reloader.ReloadNotPossible,
+            reloader.ConfigReloader,
+            cm
+        )
+
+    #--------------------------------------------------------------------------
+    def test_changed_inputs_force_a_full_build(self):
+        self._config_manager()
+        # a different commandline
+        cm = self._config_manager(argv_source=['--name=betty'])
+        self.assertEqual(cm.get_config().name, 'betty')
+        # a different config file, the mtime may not have changed if the
+        # file system has a coarse time resolution, the size will have
+        with open(self.ini_pathname, 'w') as f:
+            f.write('[alpha]\nsize=400\n')
+        cm = self._config_manager(argv_source=['--name=betty'])
+        self.assertEqual(cm.get_config().alpha.size, 400)
+        # different definitions
+        definitions = self._definitions()
+        definitions.add_option('extra', default=3)
+        cm = self._config_manager(definitions, argv_source=['--name=betty'])
+        self.assertEqual(cm.get_config().extra, 3)
+
+    #--------------------------------------------------------------------------
+    def test_only_mapping_values_for_the_options_count(self):
+        environ = {'name': 'barney', 'alpha__size': '6', 'FOO': '1'}
+        mapping = {'name': 'pebbles', 'unrelated': 1}
+
+        def a_config_manager():
+            return config_manager.ConfigurationManager(
+                [self._definitions()],
+                values_source_list=[
+                    mapping,
+                    LazyEnvironment(environ=environ),
+                    self.ini_pathname,
+                ],
+                argv_source=[],
+                use_auto_help=False,
+                snapshot_pathname=self.snapshot_pathname,
+            )
+
+        config = a_config_manager().get_config()
+        self.assertEqual((config.name, config.alpha.size), ('barney', 4))
+        # an unrelated variable or a mapping's unrelated value
+        environ['FOO'] = '2'
+        mapping['unrelated'] = 2
+        cm = a_config_manager()
+        self.assertEqual(cm.restored_from_snapshot, self.snapshot_pathname)
+        # a variable for an option that the expansion brought in
+        environ['alpha__size'] = '7'
+        mapping['name'] = 'bamm-bamm'
+        cm = a_config_manager()
+        self.assertTrue(cm.restored_from_snapshot is None)
+        del environ['name']
+        cm = a_config_manager()
+        self.assertTrue(cm.restored_from_snapshot is None)
+        self.assertEqual(cm.get_config().name, 'bamm-bamm')
+        # a new key in a mapping could fail the check for mismatches
+        mapping['new'] = 3
+        cm = a_config_manager()
+        self.assertTrue(cm.restored_from_snapshot is None)
+
+    #--------------------------------------------------------------------------
+    def test_unpicklable_configuration_is_not_snapshot(self):
+        definitions = self._definitions()
+        definitions.add_option(
+            'number',
+            default=1,
+            from_string_converter=lambda s: int(s)
+        )
+        cm = self._config_manager(definitions)
+        self.assertEqual(cm.get_config().number, 1)
+        self.assertFalse(os.path.exists(self.snapshot_pathname))
+
+    #--------------------------------------------------------------------------
+    def test_corrupt_snapshot_is_ignored(self):
+        with open(self.snapshot_pathname, 'wb') as f:
+            f.write(b'this is not a pickle')
+        cm = self._config_manager()
+        self.assertEqual(cm.get_config().name, 'fred')
+        self.assertTrue(
+            snapshot.load_snapshot(self.snapshot_pathname, 'nonsense') is None
+        )
+
+    #--------------------------------------------------------------------------
+    def test_stamp_is_current(self):
+        stamp = snapshot.file_stamp(self.ini_pathname)
+        self.assertTrue(snapshot.stamp_is_current(self.ini_pathname, stamp))
+        # touching a file without changing it doesn't make it stale
+        later = time.time() + 10
+        os.utime(self.ini_pathname, (later, later))
+        self.assertTrue(snapshot.stamp_is_current(self.ini_pathname, stamp))
+        with open(self.ini_pathname, 'w') as f:
+            f.write('[alpha]\nsize=5\n')
+        self.assertFalse(snapshot.stamp_is_current(self.ini_pathname, stamp))
+        # a file that didn't exist must continue not to exist
+        missing = os.path.join(self.tmp_dir, 'missing.ini')
+        self.assertTrue(snapshot.stamp_is_current(missing, None))
+        self.assertFalse(snapshot.stamp_is_current(self.ini_pathname, None))
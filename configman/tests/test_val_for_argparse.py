@@ -28,9 +28,11 @@ from configman.converters import (
 )
 
 from configman.def_sources.for_argparse import ArgumentParser
+from configman.option import Option
 from configman.value_sources.for_argparse import (
     #issubclass_with_no_type_error,
     ValueSource,
+    HelplessConfigmanParser,
 )
 
 
@@ -343,3 +345,83 @@ class TestCaseForValSourceArgparse(TestCase):
 
         for k in config.keys_breadth_first():
             self.assertEqual(config[k], expected[k])
+
+    #--------------------------------------------------------------------------
+    def test_lenient_parse_repeated_only_for_new_options(self):
+        option_definitions = self.setup_configman_namespace()
+        cm = ConfigurationManager(
+            definition_source=[option_definitions],
+            values_source_list=[command_line],
+            argv_source=["0", "--delta"],
+            use_auto_help=False,
+            use_admin_controls=False,
+        )
+        cm.argv_source = ["0", "--delta", "--extra=1"]
+        vs = ValueSource(command_line, cm)
+        values = vs.get_values(cm, True)
+        self.assertEqual(vs.extra_args, ["--extra=1"])
+        vs.extra_args = []
+        self.assertTrue(vs.get_values(cm, True) is values)
+        self.assertEqual(vs.extra_args, ["--extra=1"])
+        self.assertEqual(vs.parse_cache.hits, 1)
+
+        cm.option_definitions.add_option('extra', default=0)
+        values = vs.get_values(cm, True)
+        self.assertEqual(values.extra, '1')
+        self.assertEqual(vs.extra_args, [])
+        self.assertEqual(vs.parse_cache.misses, 2)
+
+    #--------------------------------------------------------------------------
+    def test_parser_is_extended_for_new_options(self):
+        option_definitions = self.setup_configman_namespace()
+        cm = ConfigurationManager(
+            definition_source=[option_definitions],
+            values_source_list=[command_line],
+            argv_source=["0"],
+            use_auto_help=False,
+        )
+        cm.argv_source = ["0", "--extra=1", "--ns.more=2", "3"]
+        vs = ValueSource(command_line, cm)
+        parser_classes = {
+            "main_parser_class": HelplessConfigmanParser,
+        }
+        parser = vs._create_new_argparse_instance(parser_classes, cm, False)
+        self.assertTrue(
+            vs._create_new_argparse_instance(parser_classes, cm, False)
+            is parser
+        )
+
+        # new optional arguments are added to the existing parser
+        cm.option_definitions.add_option('extra', default=0)
+        cm.option_definitions.namespace('ns')
+        cm.option_definitions.ns.add_option('more', default=0)
+        self.assertTrue(
+            vs._create_new_argparse_instance(parser_classes, cm, False)
+            is parser
+        )
+        values = vs.get_values(cm, True)
+        self.assertEqual(values.extra, '1')
+        self.assertEqual(values.ns.more, '2')
+        self.assertEqual(values.alpha, '0')
+
+        # a new positional argument forces a new parser
+        cm.option_definitions.add_option(
+            'omega',
+            default=0,
+            is_argument=True
+        )
+        new_parser = vs._create_new_argparse_instance(
+            parser_classes,
+            cm,
+            False
+        )
+        self.assertTrue(new_parser is not parser)
+        values = vs.get_values(cm, True)
+        self.assertEqual(values.omega, '3')
+
+    #--------------------------------------------------------------------------
+    def test_option_to_args_list_leaves_the_option_alone(self):
+        vs = self.setup_value_source()
+        an_option = Option('name', default=b'fred', is_argument=True)
+        self.assertEqual(vs._option_to_args_list(an_option, 'name'), 'fred')
+        self.assertEqual(an_option.value, b'fred')
@@ -93,6 +93,28 @@ class TestCase(unittest.TestCase):
             if os.path.isfile(tmp_filename):
                 os.remove(tmp_filename)
 
+    #--------------------------------------------------------------------------
+    def test_values_from_lines(self):
+        lines = [
+            '# comment\n',
+            '  # indented comment\n',
+            'limit = 20\n',
+            'query=select *\n',
+            '  from t\n',
+            '\twhere x\n',
+            '\n',
+            'flag\n',
+            'name=fred\n',
+            b'bytes=wilma\n',
+        ]
+        self.assertEqual(for_conf.values_from_lines(lines), {
+            'limit': '20',
+            'query': 'select * from twhere x',
+            'flag': '',
+            'name': 'fred',
+            'bytes': 'wilma',
+        })
+
     #--------------------------------------------------------------------------
     def donttest_for_conf_nested_namespaces(self):
         n = self._some_namespaces()
@@ -5,6 +5,7 @@ from __future__ import absolute_import, division, print_function
 
 import unittest
 import os
+import shutil
 import tempfile
 from six.moves import cStringIO as StringIO
 import contextlib
@@ -567,3 +568,141 @@ bad_option=bar  # other comment
                     os.rmdir(db_creds_dir)
                 if os.path.isdir(ini_repo_dir):
                     os.rmdir(ini_repo_dir)
+
+        #----------------------------------------------------------------------
+        def _write_files(self, directory, files):
+            for a_name, contents in files.items():
+                with open(os.path.join(directory, a_name), 'w') as f:
+                    f.write(contents)
+
+        #----------------------------------------------------------------------
+        def test_configobj_include_graph(self):
+            tmp_dir = os.path.realpath(tempfile.mkdtemp())
+            try:
+                self._write_files(tmp_dir, {
+                    'app.ini': (
+                        'name=app\n'
+                        '[source]\n'
+                        '+include ./db.ini\n'
+                        '[destination]\n'
+                        '+include ./db.ini\n'
+                    ),
+                    'db.ini': (
+                        'dbname=some_database\n'
+                        '+include ./creds.ini\n'
+                    ),
+                    'creds.ini': 'dbuser=dwight\n',
+                })
+                app_ini = os.path.join(tmp_dir, 'app.ini')
+                db_ini = os.path.join(tmp_dir, 'db.ini')
+                creds_ini = os.path.join(tmp_dir, 'creds.ini')
+                o = for_configobj.ValueSource(app_ini)
+                expected_section = {
+                    'dbname': 'some_database',
+                    'dbuser': 'dwight',
+                }
+                self.assertEqual(o.get_values(1, True), {
+                    'name': 'app',
+                    'source': expected_section,
+                    'destination': expected_section,
+                })
+                self.assertEqual(o.include_graph, {
+                    app_ini: [db_ini, db_ini],
+                    db_ini: [creds_ini],
+                    creds_ini: [],
+                })
+                self.assertEqual(
+                    o.included_pathnames,
+                    frozenset([db_ini, creds_ini])
+                )
+            finally:
+                shutil.rmtree(tmp_dir)
+
+        #----------------------------------------------------------------------
+        def test_configobj_includes_are_keyed_on_the_real_pathname(self):
+            tmp_dir = os.path.realpath(tempfile.mkdtemp())
+            try:
+                os.mkdir(os.path.join(tmp_dir, 'conf'))
+                self._write_files(tmp_dir, {
+                    'app.ini': (
+                        '[source]\n'
+                        '+include ./conf/db.ini\n'
+                        '[destination]\n'
+                        '+include ./linked/./db.ini\n'
+                    ),
+                    'conf/db.ini': 'dbname=some_database\n',
+                })
+                os.symlink(
+                    os.path.join(tmp_dir, 'conf'),
+                    os.path.join(tmp_dir, 'linked')
+                )
+                app_ini = os.path.join(tmp_dir, 'app.ini')
+                db_ini = os.path.join(tmp_dir, 'conf', 'db.ini')
+                o = for_configobj.ValueSource(
+                    os.path.join(tmp_dir, 'linked', '..', 'app.ini')
+                )
+                self.assertEqual(o.get_values(1, True), {
+                    'source': {'dbname': 'some_database'},
+                    'destination': {'dbname': 'some_database'},
+                })
+                self.assertEqual(o.include_graph, {
+                    app_ini: [db_ini, db_ini],
+                    db_ini: [],
+                })
+                # a cycle through a symlink is still a cycle
+                self._write_files(tmp_dir, {
+                    'conf/db.ini': '+include ../linked/db.ini\n',
+                })
+                self.assertRaises(
+                    for_configobj.LoadingIniFileFailsException,
+                    for_configobj.ValueSource,
+                    app_ini
+                )
+            finally:
+                shutil.rmtree(tmp_dir)
+
+        #----------------------------------------------------------------------
+        def test_configobj_same_size_change_in_the_same_mtime(self):
+            tmp_dir = tempfile.mkdtemp()
+            try:
+                self._write_files(tmp_dir, {
+                    'app.ini': '[source]\n+include ./db.ini\n',
+                    'db.ini': 'dbname=aaa\n',
+                })
+                app_ini = os.path.join(tmp_dir, 'app.ini')
+                db_ini = os.path.join(tmp_dir, 'db.ini')
+                o = for_configobj.ValueSource(app_ini)
+                self.assertEqual(o.get_values(1, True)['source.dbname'], 'aaa')
+                stat = os.stat(db_ini)
+                self._write_files(tmp_dir, {'db.ini': 'dbname=bbb\n'})
+                os.utime(db_ini, (stat.st_atime, stat.st_mtime))
+                o = for_configobj.ValueSource(app_ini)
+                self.assertEqual(o.get_values(1, True)['source.dbname'], 'bbb')
+            finally:
+                shutil.rmtree(tmp_dir)
+
+        #----------------------------------------------------------------------
+        def test_configobj_cyclic_include(self):
+            tmp_dir = os.path.realpath(tempfile.mkdtemp())
+            try:
+                self._write_files(tmp_dir, {
+                    'app.ini': '[source]\n+include ./db.ini\n',
+                    'db.ini': 'dbname=x\n+include ./more.ini\n',
+                    'more.ini': '+include ./db.ini\n',
+                })
+                try:
+                    for_configobj.ValueSource(
+                        os.path.join(tmp_dir, 'app.ini')
+                    )
+                except for_configobj.LoadingIniFileFailsException as x:
+                    self.assertTrue('cyclic include' in str(x))
+                    self.assertTrue(
+                        'db.ini -> %s -> %s' % (
+                            os.path.join(tmp_dir, 'more.ini'),
+                            os.path.join(tmp_dir, 'db.ini'),
+                        ) in str(x)
+                    )
+                else:
+                    self.fail('the cycle was not detected')
+            finally:
+                shutil.rmtree(tmp_dir)
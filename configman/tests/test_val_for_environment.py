@@ -0,0 +1,208 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import unittest
+
+from configman import Namespace, ConfigurationManager, environment
+from configman.dotdict import configman_keys, DotDictWithAcquisition
+from configman.environment import LazyEnvironment, PrefixedEnvironment
+from configman.value_sources import for_environment, type_handler_dispatch
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def _an_environment(self):
+        return {
+            'HOME': '/home/fred',
+            'db__host': 'localhost',
+            'DB__PORT': '5432',
+            'port': '80',
+            'MYAPP_db__host': 'db.example.com',
+            'MYAPP_user': 'wilma',
+        }
+
+    #--------------------------------------------------------------------------
+    def test_default_environment_is_lazy(self):
+        self.assertTrue(isinstance(environment, LazyEnvironment))
+        self.assertTrue(environment.always_ignore_mismatches)
+        handlers = type_handler_dispatch.get_handlers(environment)
+        self.assertTrue(list(handlers)[0] is for_environment)
+
+    #--------------------------------------------------------------------------
+    def test_keys_are_translated_like_configman_keys(self):
+        environ = self._an_environment()
+        lazy = LazyEnvironment(environ=environ)
+        self.assertEqual(lazy['db.host'], 'localhost')
+        self.assertEqual(lazy['DB__PORT'], '5432')
+        self.assertEqual(lazy['HOME'], '/home/fred')
+        # uppercase names are not translated
+        self.assertFalse('DB.PORT' in lazy)
+        self.assertFalse('db__host' in lazy)
+        self.assertRaises(KeyError, lambda: lazy['nothing.here'])
+        self.assertEqual(
+            sorted(lazy),
+            sorted(configman_keys(environ).keys_breadth_first())
+        )
+        self.assertEqual(len(lazy), len(environ))
+
+    #--------------------------------------------------------------------------
+    def test_read_like_a_dotdict(self):
+        environ = self._an_environment()
+        environ['db__server__name'] = 'fred'
+        lazy = LazyEnvironment(environ=environ)
+        eager = configman_keys(environ)
+        self.assertEqual(lazy.HOME, eager.HOME)
+        self.assertEqual(lazy.db.host, eager.db.host)
+        self.assertEqual(lazy.db.server.name, 'fred')
+        self.assertEqual(lazy.db['server.name'], 'fred')
+        self.assertEqual(sorted(lazy.db), ['host', 'server.name'])
+        self.assertRaises(KeyError, lambda: lazy.nothing)
+        self.assertRaises(KeyError, lambda: lazy.db.nothing)
+        self.assertRaises(AttributeError, lambda: lazy.__nothing__)
+        self.assertEqual(
+            lazy.keys_breadth_first(),
+            tuple(sorted(
+                eager.keys_breadth_first(),
+                key=lambda k: (k.count('.'), k)
+            ))
+        )
+        self.assertEqual(
+            set(lazy.keys_breadth_first(include_dicts=True)),
+            set(eager.keys_breadth_first(include_dicts=True))
+        )
+        self.assertEqual(lazy.peek('port'), '80')
+        self.assertEqual(lazy.parent('db.server.name').name, 'fred')
+        self.assertTrue(lazy.parent('port') is None)
+        # the default environment is the same kind of view
+        self.assertEqual(environment.keys_breadth_first(), tuple(sorted(
+            environment,
+            key=lambda k: (k.count('.'), k)
+        )))
+
+    #--------------------------------------------------------------------------
+    def test_changes_to_the_environment_are_seen(self):
+        environ = {}
+        lazy = LazyEnvironment(environ=environ)
+        self.assertFalse('db.host' in lazy)
+        environ['db__host'] = 'localhost'
+        self.assertEqual(lazy['db.host'], 'localhost')
+
+    #--------------------------------------------------------------------------
+    def test_prefix(self):
+        lazy = LazyEnvironment('MYAPP_', environ=self._an_environment())
+        self.assertEqual(lazy['db.host'], 'db.example.com')
+        self.assertEqual(lazy['user'], 'wilma')
+        self.assertFalse('HOME' in lazy)
+        self.assertEqual(sorted(lazy), ['db.host', 'user'])
+
+    #--------------------------------------------------------------------------
+    def test_acquisition(self):
+        lazy = LazyEnvironment(environ=self._an_environment())
+        self.assertFalse('web.server.port' in lazy)
+        acquiring = lazy.with_acquisition()
+        self.assertEqual(acquiring['web.server.port'], '80')
+        self.assertEqual(acquiring['db.server.host'], 'localhost')
+        self.assertEqual(
+            acquiring.variable_names_for('a.b.c'),
+            ('a__b__c', 'a.b.c', 'a__c', 'a.c', 'c')
+        )
+
+    #--------------------------------------------------------------------------
+    def test_get_values_does_not_copy(self):
+        lazy = LazyEnvironment(environ=self._an_environment())
+        value_source = for_environment.ValueSource(lazy)
+        self.assertTrue(value_source.always_ignore_mismatches)
+        self.assertTrue(value_source.get_values(None, True) is lazy)
+        acquiring = value_source.get_values(
+            None,
+            True,
+            DotDictWithAcquisition
+        )
+        self.assertTrue(acquiring.acquisition)
+        self.assertEqual(acquiring['web.port'], '80')
+
+    #--------------------------------------------------------------------------
+    def test_with_config_manager(self):
+        n = Namespace()
+        n.namespace('db')
+        n.db.add_option('host', default='nowhere')
+        n.db.add_option('port', default=1, from_string_converter=int)
+        n.add_option('user', default='fred')
+        environ = self._an_environment()
+        environ['UNRELATED'] = 'noise'
+        cm = ConfigurationManager(
+            [n],
+            [LazyEnvironment('MYAPP_', environ=environ)],
+            argv_source=[],
+            use_admin_controls=True,
+            use_auto_help=False,
+        )
+        config = cm.get_config()
+        self.assertEqual(config.db.host, 'db.example.com')
+        self.assertEqual(config.db.port, 1)
+        self.assertEqual(config.user, 'wilma')
+
+    #--------------------------------------------------------------------------
+    def test_prefixed_environment_translation(self):
+        environ = {
+            'MYAPP_DB__HOST': 'db.example.com',
+            'MYAPP_PORT': '80',
+            'OTHER_DB__HOST': 'elsewhere',
+        }
+        prefixed = PrefixedEnvironment('MYAPP_', uppercase=True,
+                                       environ=environ)
+        self.assertEqual(prefixed['db.host'], 'db.example.com')
+        self.assertEqual(sorted(prefixed), ['db.host', 'port'])
+        self.assertEqual(
+            prefixed.with_acquisition().variable_names_for('db.host'),
+            ('MYAPP_DB__HOST', 'MYAPP_HOST')
+        )
+        dashed = PrefixedEnvironment('app-', separator='-', environ={
+            'app-db-host': 'localhost'
+        })
+        self.assertEqual(dashed['db.host'], 'localhost')
+        table = dashed.compile(['db.host', 'db.port'])
+        self.assertEqual(
+            table,
+            [('db.host', ('app-db-host',)), ('db.port', ('app-db-port',))]
+        )
+        self.assertEqual(dashed.probe(table), {'db.host': 'localhost'})
+
+    #--------------------------------------------------------------------------
+    def test_prefixed_environment_with_config_manager(self):
+        n = Namespace()
+        n.namespace('db')
+        n.db.add_option('host', default='nowhere')
+        n.add_option('port', default=1, from_string_converter=int)
+        environ = {
+            'MYAPP_DB__HOST': 'db.example.com',
+            'MYAPP_PORT': '80',
+            'MYAPP_USER': 'wilma',
+        }
+        prefixed = PrefixedEnvironment('MYAPP_', uppercase=True,
+                                       environ=environ)
+        cm = ConfigurationManager(
+            [n],
+            [prefixed],
+            argv_source=[],
+            use_auto_help=False,
+        )
+        config = cm.get_config()
+        self.assertEqual(config.db.host, 'db.example.com')
+        self.assertEqual(config.port, 80)
+
+        value_source = for_environment.ValueSource(prefixed)
+        values = value_source.get_values(cm, True)
+        self.assertEqual(sorted(values.keys_breadth_first()),
+                         ['db.host', 'port'])
+        value_source.get_values(cm, True)
+        self.assertEqual(value_source.translation_tables.hits, 1)
+        # the table is compiled again once there is a new option
+        cm.option_definitions.add_option('user', default='fred')
+        values = value_source.get_values(cm, True)
+        self.assertEqual(values.user, 'wilma')
+        self.assertEqual(value_source.translation_tables.misses, 2)
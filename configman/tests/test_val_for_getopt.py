@@ -166,3 +166,41 @@ class TestCase(unittest.TestCase):
         self.assertEqual(c.option_definitions.c.extra.doc, 'the x')
         self.assertEqual(c.option_definitions.c.extra.default, '11.0')
         self.assertEqual(c.option_definitions.c.extra.value, 11.0)
+
+    #--------------------------------------------------------------------------
+    def test_for_getopt_parses_only_for_new_options(self):
+        c = config_manager.ConfigurationManager(
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=[]
+        )
+        o = ValueSource(['--limit', '10', 'an_arg'])
+        self.assertEqual(o.get_values(c, True), {})
+        self.assertEqual(o.get_values(c, True), {})
+        self.assertEqual(o.parse_cache.hits, 1)
+        # '--limit' had to be ignored, so the strict parse must happen
+        self.assertRaises(NotAnOptionError, o.get_values, c, False)
+        self.assertEqual(o.parse_cache.misses, 2)
+
+        c.option_definitions.add_option('limit', default=0)
+        c.args = []
+        self.assertEqual(o.get_values(c, True), {'limit': '10'})
+        self.assertEqual(c.args, ['an_arg'])
+        # nothing was ignored, the strict parse comes from the cache
+        c.args = []
+        self.assertEqual(o.get_values(c, False), {'limit': '10'})
+        self.assertEqual(c.args, ['an_arg'])
+        self.assertEqual(o.parse_cache.hits, 2)
+        self.assertEqual(o.parse_cache.misses, 3)
+
+    #--------------------------------------------------------------------------
+    def test_for_getopt_with_ignore_reports_ignored(self):
+        ignored = []
+        result = ValueSource.getopt_with_ignore(
+            ['--a=1', '--b', '-', '-x', 'arg'],
+            '',
+            ['a='],
+            ignored
+        )
+        self.assertEqual(result, ([('--a', '1')], ['arg']))
+        self.assertEqual(ignored, ['--b', '-', '-x'])
@@ -7,13 +7,15 @@ import unittest
 import os
 import json
 import tempfile
+import warnings
 import contextlib
+import mock
 from six.moves import cStringIO as StringIO
 
 from configman.namespace import Namespace
 from configman.config_manager import ConfigurationManager
 from configman.datetime_util import datetime_from_ISO_string
-from configman.value_sources import for_json
+from configman.value_sources import for_json, LazyValues
 from configman.value_sources.for_json import ValueSource
 from configman.dotdict import DotDict, DotDictWithAcquisition
 
@@ -88,6 +90,33 @@ class TestCase(unittest.TestCase):
         for key, value in expect_to_find.items():
             self.assertEqual(jrec['aaa'][key], value)
 
+    #--------------------------------------------------------------------------
+    def test_write_json_nested_namespaces(self):
+        n = Namespace(doc='top')
+        n.add_option('aaa', 1, 'the a')
+        n.namespace('x')
+        n.x.add_option('bbb', 'two', 'the b')
+        n.x.namespace('y')
+        n.x.y.add_option('ccc', 3.0, 'the c')
+
+        c = ConfigurationManager(
+            [n],
+            use_admin_controls=True,
+            use_auto_help=False,
+            argv_source=[]
+        )
+
+        out = StringIO()
+        c.write_conf(for_json, opener=stringIO_context_wrapper(out))
+        jrec = json.loads(out.getvalue())
+        out.close()
+        self.assertEqual(jrec['aaa']['value'], '1')
+        self.assertEqual(jrec['x']['bbb']['value'], 'two')
+        self.assertEqual(jrec['x']['y']['ccc']['default'], '3.0')
+        # every key of the admin namespace is blocked, so it is left out
+        self.assertTrue('admin' not in jrec)
+        self.assertTrue('help' not in jrec)
+
     #--------------------------------------------------------------------------
     def test_json_round_trip(self):
         n = Namespace(doc='top')
@@ -167,3 +196,59 @@ class TestCase(unittest.TestCase):
         finally:
             if os.path.isfile(tmp_filename):
                 os.remove(tmp_filename)
+
+    def test_lookups_without_copying(self):
+        j = {
+            'a': '1',
+            'c': {
+                'd': 'x',
+                'e.f': 'y'
+            },
+            'unrelated': dict(('k%d' % i, i) for i in range(10)),
+        }
+        tmp_filename = os.path.join(tempfile.gettempdir(), 'test.json')
+        with open(tmp_filename, 'w') as f:
+            json.dump(j, f)
+        try:
+            jvs = ValueSource(tmp_filename)
+            self.assertEqual(jvs.get('c.d'), 'x')
+            self.assertEqual(jvs.get('c.e.f'), 'y')
+            self.assertEqual(jvs.get('c.q', 17), 17)
+            self.assertTrue('c.e.f' in jvs)
+            self.assertFalse('c.e' in jvs)
+            self.assertEqual(len(jvs.keys()), 13)
+
+            lazy = LazyValues(jvs, DotDictWithAcquisition)
+            self.assertEqual(lazy['c.d'], 'x')
+            # acquired from the root like the DotDictWithAcquisition
+            self.assertEqual(lazy['c.a'], '1')
+            self.assertTrue('c.a' in lazy)
+            self.assertTrue(isinstance(lazy['c'], DotDictWithAcquisition))
+            self.assertRaises(KeyError, lambda: lazy['c.q'])
+
+            n = Namespace()
+            n.add_option('a', default=0, from_string_converter=int)
+            n.namespace('c')
+            n.c.add_option('d', default='')
+            with mock.patch.object(
+                ValueSource,
+                'get_values'
+            ) as mocked_get_values:
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always')
+                    config = ConfigurationManager(
+                        (n,),
+                        (tmp_filename,),
+                        use_admin_controls=True,
+                        use_auto_help=False,
+                        argv_source=[]
+                    ).get_config()
+                self.assertEqual(mocked_get_values.call_count, 0)
+            # the mismatches were found with 'keys' instead
+            self.assertEqual(len(caught), 1)
+            self.assertTrue('unrelated.k9' in str(caught[0].message))
+            self.assertEqual(config.a, 1)
+            self.assertEqual(config.c.d, 'x')
+        finally:
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
@@ -0,0 +1,187 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+import collections
+import types
+import unittest
+
+import mock
+
+from configman import Namespace, ConfigurationManager
+from configman import value_sources
+from configman.converters import LazilyImportedModules
+from configman.orderedset import OrderedSet
+from configman.value_sources import (
+    DispatchByType,
+    FileExtensionDispatch,
+    register_value_source_module,
+    for_json,
+    for_mapping,
+)
+from configman.value_sources.source_exceptions import (
+    NoHandlerForType,
+    ModuleHandlesNothingException,
+)
+
+
+#==============================================================================
+class TestCase(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    def test_get_handlers_remembers_its_answers(self):
+        mapping_handler, dict_handler, module_handler, modules_handler, \
+            int_handler, float_handler = [object() for x in range(6)]
+        dispatch = DispatchByType(list)
+        dispatch.register(collections.Mapping, mapping_handler)
+        dispatch.register(dict, dict_handler)
+        a_module = types.ModuleType('a_module')
+        dispatch.register(a_module, module_handler)
+        dispatch.register(types.ModuleType, modules_handler)
+
+        with mock.patch.object(
+            dispatch,
+            '_find_handlers',
+            wraps=dispatch._find_handlers
+        ) as mocked_find_handlers:
+            self.assertEqual(
+                set(dispatch.get_handlers({})),
+                set([mapping_handler, dict_handler])
+            )
+            dispatch.get_handlers({'a': 1})
+            self.assertEqual(mocked_find_handlers.call_count, 1)
+            # the registered object itself comes first, then its type
+            handlers = dispatch.get_handlers(a_module)
+            self.assertTrue(isinstance(handlers, OrderedSet))
+            self.assertEqual(
+                list(handlers),
+                [module_handler, modules_handler]
+            )
+            # changing the answer doesn't change the remembered answer
+            handlers.discard(module_handler)
+            self.assertEqual(
+                list(dispatch.get_handlers(a_module)),
+                [module_handler, modules_handler]
+            )
+            self.assertEqual(
+                list(dispatch.get_handlers(types.ModuleType('another'))),
+                [modules_handler]
+            )
+            self.assertEqual(mocked_find_handlers.call_count, 3)
+            self.assertRaises(NoHandlerForType, dispatch.get_handlers, 17)
+            self.assertRaises(NoHandlerForType, dispatch.get_handlers, 18)
+            self.assertEqual(mocked_find_handlers.call_count, 4)
+
+            # registering forgets the answers
+            dispatch.register(int, int_handler)
+            self.assertEqual(list(dispatch.get_handlers(17)), [int_handler])
+            self.assertEqual(mocked_find_handlers.call_count, 5)
+            dispatch[float] = [float_handler]
+            self.assertEqual(
+                list(dispatch.get_handlers(1.5)),
+                [float_handler]
+            )
+            del dispatch[int]
+            self.assertRaises(NoHandlerForType, dispatch.get_handlers, 17)
+
+    #--------------------------------------------------------------------------
+    def test_register_value_source_module(self):
+
+        class Pair(object):
+            def __init__(self, key, value):
+                self.key = key
+                self.value = value
+
+        class PairValueSource(for_mapping.ValueSource):
+            def __init__(self, source, the_config_manager=None):
+                super(PairValueSource, self).__init__(
+                    {source.key: source.value},
+                    the_config_manager
+                )
+
+        for_pairs = types.ModuleType('for_pairs')
+        for_pairs.can_handle = (Pair,)
+        for_pairs.ValueSource = PairValueSource
+        for_pairs.file_name_extension = 'pair'
+
+        dispatch = DispatchByType(list)
+        dispatch.register(collections.Mapping, for_mapping)
+        with mock.patch.multiple(
+            value_sources,
+            type_handler_dispatch=dispatch,
+            file_extension_dispatch=FileExtensionDispatch(),
+            for_handlers=[],
+        ):
+            self.assertRaises(
+                NoHandlerForType,
+                dispatch.get_handlers,
+                Pair('a', 1)
+            )
+            register_value_source_module(for_pairs)
+            register_value_source_module(for_pairs)
+            self.assertEqual(value_sources.for_handlers, [for_pairs])
+            self.assertTrue(value_sources.has_registration_for('pair'))
+
+            n = Namespace()
+            n.add_option('a', default=0)
+            config = ConfigurationManager(
+                [n],
+                values_source_list=[Pair('a', 17)],
+                argv_source=[],
+                use_admin_controls=False,
+                use_auto_help=False,
+            ).get_config()
+            self.assertEqual(config.a, 17)
+
+            self.assertRaises(
+                ModuleHandlesNothingException,
+                register_value_source_module,
+                for_json.json
+            )
+
+    #--------------------------------------------------------------------------
+    def test_dispatch_tables_are_built_from_the_modules(self):
+        for a_module in value_sources.for_handlers:
+            self.assertTrue(isinstance(a_module, types.ModuleType))
+            for a_key in a_module.can_handle:
+                try:
+                    handlers = value_sources.type_handler_dispatch[a_key]
+                except TypeError:
+                    handlers = value_sources.type_handler_dispatch[
+                        type(a_key)
+                    ]
+                self.assertTrue(a_module in handlers)
+                self.assertTrue(
+                    all(isinstance(x, types.ModuleType) for x in handlers)
+                )
+            if hasattr(a_module, 'file_name_extension'):
+                self.assertEqual(
+                    value_sources.file_extension_dispatch[
+                        a_module.file_name_extension
+                    ],
+                    a_module.ValueSource.write
+                )
+
+    #--------------------------------------------------------------------------
+    def test_dispatch_is_filled_on_first_read(self):
+        modules = LazilyImportedModules(
+            ['configman.value_sources.for_mapping']
+        )
+        self.assertEqual(repr(modules), "LazilyImportedModules(%r)" % (
+            ['configman.value_sources.for_mapping'],
+        ))
+        dispatch = DispatchByType(list)
+        dispatch._unread_modules = modules
+        self.assertEqual(
+            list(dispatch.get_handlers({})),
+            [for_mapping]
+        )
+        self.assertEqual(modules, [for_mapping])
+        self.assertEqual(dispatch[collections.Mapping], [for_mapping])
+        # filled only once
+        dispatch.register(collections.Mapping, for_json)
+        self.assertEqual(
+            list(dispatch.get_handlers({})),
+            [for_mapping, for_json]
+        )
@@ -15,39 +15,110 @@ from configman.value_sources.source_exceptions import (
     ValueException,
 )
 from configman.orderedset import OrderedSet
-from configman.converters import str_to_python_object, to_str
+from configman.converters import (
+    FilledOnFirstRead,
+    LazilyImportedModules,
+    str_to_python_object,
+    to_str
+)
 
 from configman.config_file_future_proxy import ConfigFileFutureProxy
 from configman.config_exceptions import CannotConvertError
+from configman.dotdict import (
+    DotDict,
+    DotDictWithAcquisition,
+    acquisition_keys,
+    _NOTHING
+)
+
 
-# replace with dynamic discovery and loading
-from configman.value_sources import for_argparse
-#from configman.value_sources import or_xml
-from configman.value_sources import for_getopt
-from configman.value_sources import for_json
-from configman.value_sources import for_conf
-from configman.value_sources import for_mapping
-from configman.value_sources import for_configobj
-from configman.value_sources import for_modules
-
-# please replace with dynamic discovery
-for_handlers = [
-    for_argparse,
-    for_mapping,
-    for_getopt,
-    for_json,
-    for_conf,
-    for_configobj,
-    for_modules,
-]
+# the value source modules in the order that they're tried.  They're
+# imported when the dispatch tables below are first read, not along with
+# configman.  Others can be added with 'register_value_source_module'
+for_handlers = LazilyImportedModules([
+    'configman.value_sources.for_argparse',
+    'configman.value_sources.for_environment',
+    'configman.value_sources.for_mapping',
+    'configman.value_sources.for_getopt',
+    'configman.value_sources.for_json',
+    'configman.value_sources.for_conf',
+    'configman.value_sources.for_configobj',
+    'configman.value_sources.for_modules',
+])
 
 
 #==============================================================================
 # create a dispatch table of types/objects to modules.  Each type should have
 # a list of modules that can handle that type.
-class DispatchByType(collections.defaultdict):
+class DispatchByType(FilledOnFirstRead, collections.defaultdict):
+    """The handlers for a candidate are those registered for the candidate
+    itself followed by those registered for any type that it is an instance
+    of.  Either way, the answer only depends on the identity of the
+    candidate, if it is registered itself, or on its type.  It is
+    remembered accordingly until the registrations change.  Add handlers
+    with 'register' so that the remembered answers are forgotten."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, *args, **kwargs):
+        super(DispatchByType, self).__init__(*args, **kwargs)
+        # id of a registered key -> the key, for matches by identity
+        self._keys_by_id = dict((id(key), key) for key in self)
+        # ('is', id of the candidate) or type of the candidate -> handlers
+        self._resolved = {}
+
+    #--------------------------------------------------------------------------
+    def __setitem__(self, key, handler_list):
+        super(DispatchByType, self).__setitem__(key, handler_list)
+        self._keys_by_id[id(key)] = key
+        self._resolved.clear()
+
+    #--------------------------------------------------------------------------
+    def __delitem__(self, key):
+        super(DispatchByType, self).__delitem__(key)
+        del self._keys_by_id[id(key)]
+        self._resolved.clear()
+
+    #--------------------------------------------------------------------------
+    def _fill_from(self, a_handler):
+        for a_supported_value_source in a_handler.can_handle:
+            self.register(a_supported_value_source, a_handler)
+
+    #--------------------------------------------------------------------------
+    def register(self, key, a_handler):
+        """add a handler for a type or for a specific object"""
+        try:
+            handler_list = self[key]
+        except TypeError:
+            # likely this is an instance of a handleable type that is not
+            # hashable. Replace it with its base type and try to continue.
+            handler_list = self[type(key)]
+        if a_handler not in handler_list:
+            handler_list.append(a_handler)
+        self._resolved.clear()
+
     #--------------------------------------------------------------------------
     def get_handlers(self, candidate):
+        """return an OrderedSet of the handlers for the candidate, most
+        specific first"""
+        self._fill()
+        if self._keys_by_id.get(id(candidate), _NOTHING) is candidate:
+            cache_key = ('is', id(candidate))
+        else:
+            cache_key = type(candidate)
+        try:
+            handlers = self._resolved[cache_key]
+        except KeyError:
+            handlers = self._resolved[cache_key] = self._find_handlers(
+                candidate
+            )
+        if not handlers:
+            raise NoHandlerForType("no hander for %s is available" %
+                                   candidate)
+        # the remembered answer is not to be changed by the caller
+        return OrderedSet(handlers)
+
+    #--------------------------------------------------------------------------
+    def _find_handlers(self, candidate):
         handlers_set = OrderedSet()
         # find exact candidate matches first
         for key, handler_list in six.iteritems(self):
@@ -59,10 +130,7 @@ class DispatchByType(collections.defaultdict):
             if self._is_instance_of(candidate, key):
                 for a_handler in handler_list:
                     handlers_set.add(a_handler)
-        if not handlers_set:
-            raise NoHandlerForType("no hander for %s is available" %
-                                   candidate)
-        return handlers_set
+        return tuple(handlers_set)
 
     #--------------------------------------------------------------------------
     @staticmethod
@@ -73,38 +141,50 @@ class DispatchByType(collections.defaultdict):
             return False
 
 
+#==============================================================================
+class FileExtensionDispatch(FilledOnFirstRead, dict):
+    """file name extension -> the 'ValueSource.write' of the module that
+    writes configuration files with that extension"""
+
+    #--------------------------------------------------------------------------
+    def _fill_from(self, a_handler):
+        try:
+            self[a_handler.file_name_extension] = a_handler.ValueSource.write
+        except AttributeError:
+            # this handler doesn't have a 'file_name_extension' or
+            # ValueSource therefore it is not eligible for the write file
+            # dispatcher
+            pass
+
+
 #------------------------------------------------------------------------------
 type_handler_dispatch = DispatchByType(list)
-for a_handler in for_handlers:
-    try:
-        for a_supported_value_source in a_handler.can_handle:
-            try:
-                type_handler_dispatch[a_supported_value_source].append(
-                    a_handler
-                )
-            except TypeError:
-                # likely this is an instance of a handleable type that is not
-                # hashable. Replace it with its base type and try to continue.
-                type_handler_dispatch[type(a_supported_value_source)].append(
-                    a_handler
-                )
-    except AttributeError:
+type_handler_dispatch._unread_modules = for_handlers
+file_extension_dispatch = FileExtensionDispatch()
+file_extension_dispatch._unread_modules = for_handlers
+
+
+#------------------------------------------------------------------------------
+def register_value_source_module(a_handler):
+    """make a value source module available to all configuration managers.
+    The module must have a 'can_handle' sequence of the types and objects
+    that its 'ValueSource' class accepts.  If it also has a
+    'file_name_extension', its 'ValueSource.write' becomes the writer for
+    configuration files with that extension.  Modules registered later are
+    tried after the others for the same type."""
+    if not hasattr(a_handler, 'can_handle'):
         # this module has no can_handle attribute, therefore cannot really
         # be a handler and an error should be raised
         raise ModuleHandlesNothingException(
             "%s has no 'can_handle' attribute" % str(a_handler)
         )
-
-file_extension_dispatch = {}
-for a_handler in for_handlers:
-    try:
-        file_extension_dispatch[a_handler.file_name_extension] = (
-            a_handler.ValueSource.write
-        )
-    except AttributeError:
-        # this handler doesn't have a 'file_name_extension' or ValueSource
-        # therefore it is not eligible for the write file dispatcher
-        pass
+    # the modules already in 'for_handlers' come first
+    type_handler_dispatch._fill()
+    type_handler_dispatch._fill_from(a_handler)
+    file_extension_dispatch._fill()
+    file_extension_dispatch._fill_from(a_handler)
+    if a_handler not in for_handlers:
+        for_handlers.append(a_handler)
 
 
 #------------------------------------------------------------------------------
@@ -155,6 +235,92 @@ def wrap_with_value_source_api(value_source_list, a_config_manager):
     return wrapped_sources
 
 
+#==============================================================================
+class LazyValues(collections.Mapping):
+    """the values of a value source that offers lookups of single keys.
+
+    A value source's 'get_values' returns a copy of everything that it holds
+    in the form of the object hook, even though the overlay of values onto
+    the options only ever asks for the keys of known options.  A value
+    source may instead offer three methods:
+
+        get(key, default) - the value of a fully qualified key of the form
+                            'x.y.z' or the default if it has none
+        __contains__(key) - True if 'get' would find the key
+        keys() - all of the fully qualified keys that it has values for.
+                 Only used when checking for mismatches.
+
+    This mapping puts those methods behind the interface of the mapping that
+    'get_values' would have returned, acquisition included, without copying
+    anything."""
+
+    #--------------------------------------------------------------------------
+    def __init__(self, value_source, obj_hook):
+        self.value_source = value_source
+        self.obj_hook = obj_hook
+        self.acquisition = issubclass(obj_hook, DotDictWithAcquisition)
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, key):
+        get = self.value_source.get
+        if self.acquisition:
+            candidate_keys = acquisition_keys(key)
+        else:
+            candidate_keys = (key,)
+        for a_key in candidate_keys:
+            value = get(a_key, _NOTHING)
+            if value is not _NOTHING:
+                if isinstance(value, collections.Mapping):
+                    # a namespace, in the form get_values would have given
+                    value = self.obj_hook(initializer=value)
+                return value
+        raise KeyError(key)
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        if self.acquisition:
+            return any(
+                a_key in self.value_source for a_key in acquisition_keys(key)
+            )
+        return key in self.value_source
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(self.value_source.keys())
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.value_source.keys())
+
+
+#------------------------------------------------------------------------------
+def offers_lookups(a_value_source):
+    """True if the value source offers the lookup protocol of LazyValues"""
+    return (
+        hasattr(a_value_source, 'get')
+        and hasattr(a_value_source, '__contains__')
+        and hasattr(a_value_source, 'keys')
+    )
+
+
+#------------------------------------------------------------------------------
+def values_of(a_value_source, config_manager, ignore_mismatches, obj_hook):
+    """return the values of a value source as a mapping: a LazyValues for a
+    value source that offers lookups, whatever 'get_values' returns for the
+    others.  An object hook other than DotDict or DotDictWithAcquisition may
+    translate the keys as they are copied, so it always gets the copy."""
+    if (
+        obj_hook in (DotDict, DotDictWithAcquisition)
+        and offers_lookups(a_value_source)
+    ):
+        return LazyValues(a_value_source, obj_hook)
+    return a_value_source.get_values(
+        config_manager,
+        ignore_mismatches,
+        obj_hook
+    )
+
+
 #------------------------------------------------------------------------------
 def has_registration_for(config_file_type):
     return config_file_type in file_extension_dispatch
@@ -189,6 +355,7 @@ def dispatch_request_to_write(
 
 #------------------------------------------------------------------------------
 def config_filename_from_commandline(config_manager):
+    from configman.value_sources import for_getopt
     command_line_value_source = for_getopt.ValueSource(
         for_getopt.getopt,
         config_manager
@@ -38,6 +38,7 @@ import collections
 
 from configman.option import Option
 from configman.dotdict import DotDict
+from configman.memoize import DefinitionGenerationCache
 from configman.converters import (
     boolean_converter,
     to_str,
@@ -291,9 +292,16 @@ class ParserContainer(object):
                 self.subparsers[subparser_name] = local_subparser
 
         # add the actual arguments to the appropriate main or subparsers
-        for args_for_an_argparse_argument in (
+        self._add_arguments_to_parsers(
+            main_parser,
             self.arguments_for_building_argparse
-        ):
+        )
+
+        return main_parser
+
+    #--------------------------------------------------------------------------
+    def _add_arguments_to_parsers(self, main_parser, arguments):
+        for args_for_an_argparse_argument in arguments:
             args = args_for_an_argparse_argument.args
             kwargs = args_for_an_argparse_argument.kwargs
             owning_subparser_name = args_for_an_argparse_argument.get(
@@ -306,7 +314,48 @@ class ParserContainer(object):
             else:
                 main_parser.add_argument(*args, **kwargs)
 
-        return main_parser
+    #--------------------------------------------------------------------------
+    def can_extend_argparse_parser(self, qualified_name, option):
+        """return True if the argument for an option can be added to an
+        already built parser with the same result as building the parser
+        from scratch.  That is not the case for admin options, they live in
+        a parent parser that was copied into the main parser and subparsers.
+        Nor is it the case for subcommands or for positional arguments, whose
+        order matters."""
+        if qualified_name.startswith('admin'):
+            return False
+        if (
+            option.foreign_data is not None
+            and "argparse" in option.foreign_data
+        ):
+            argparse_foreign_data = option.foreign_data.argparse
+            if argparse_foreign_data.flags.subcommand:
+                return False
+            owning_subparser_name = \
+                argparse_foreign_data.owning_subparser_name
+            if (
+                owning_subparser_name
+                and owning_subparser_name not in self.subparsers
+            ):
+                return False
+            return bool(argparse_foreign_data.args) and all(
+                an_arg.startswith('-')
+                for an_arg in argparse_foreign_data.args
+            )
+        return not option.is_argument
+
+    #--------------------------------------------------------------------------
+    def extend_argparse_parser(self, main_parser, options):
+        """add the arguments for the (qualified_name, option) pairs to a
+        parser previously built by 'create_argparse_parser'.  Only options
+        for which 'can_extend_argparse_parser' is True may be added."""
+        number_of_arguments = len(self.arguments_for_building_argparse)
+        for qualified_name, option in options:
+            self.add_argument_from_option(qualified_name, option)
+        self._add_arguments_to_parsers(
+            main_parser,
+            self.arguments_for_building_argparse[number_of_arguments:]
+        )
 
     #--------------------------------------------------------------------------
     def _add_argument_from_original_source(self, qualified_name, option):
@@ -406,6 +455,11 @@ class ValueSource(object):
         self.source = source
         self.parent_parsers = []
         self.argv_source = tuple(conf_manager.argv_source)
+        # the lenient parses need only be redone when new options appear.
+        # The 'hits' of this cache are the parses that were avoided.
+        self.parse_cache = DefinitionGenerationCache()
+        # the most recently built parsers, see _create_new_argparse_instance
+        self.parser_builds = {}
 
     # frequently, command line data sources must be treated differently.  For
     # example, even when the overall option for configman is to allow
@@ -433,8 +487,7 @@ class ValueSource(object):
                 )
             else:
                 if isinstance(an_option.value, (six.binary_type, six.text_type)):
-                    an_option.value = to_str(an_option.value)
-                    return an_option.value
+                    return to_str(an_option.value)
                 if an_option.to_string_converter:
                     return an_option.to_string_converter(an_option.value)
                 return to_str(an_option.value)
@@ -443,8 +496,7 @@ class ValueSource(object):
                 and isinstance(an_option.value, collections.Sequence)
             ):
                 if isinstance(an_option.value, (six.binary_type, six.text_type)):
-                    an_option.value = to_str(an_option.value)
-                    return an_option.value
+                    return to_str(an_option.value)
                 return [to_str(x) for x in an_option.value]
             if an_option.value is None:
                 return []
@@ -470,16 +522,16 @@ class ValueSource(object):
         # needs to cope using this placebo argv
         args = [
             self._option_to_args_list(
-                config_manager.option_definitions[key],
+                config_manager.option_definitions.peek(key),
                 key
             )
             for key in config_manager.option_definitions.keys_breadth_first()
             if (
                 isinstance(
-                    config_manager.option_definitions[key],
+                    config_manager.option_definitions.peek(key),
                     Option
                 )
-                and config_manager.option_definitions[key].is_argument
+                and config_manager.option_definitions.peek(key).is_argument
             )
         ]
 
@@ -502,6 +554,17 @@ class ValueSource(object):
     #--------------------------------------------------------------------------
     def get_values(self, config_manager, ignore_mismatches, object_hook=None):
         if ignore_mismatches:
+            # the lenient parse depends only on the options defined so far.
+            # The strict parse uses the current values of the options to
+            # fake the arguments, so it cannot be cached this way.
+            cached_result = self.parse_cache.get(
+                config_manager.option_definitions,
+                object_hook
+            )
+            if cached_result is not None:
+                values, extra_args = cached_result
+                self.extra_args = list(extra_args)
+                return values
             self.extra_args = []
             parser = self._create_new_argparse_instance(
                 {
@@ -522,6 +585,16 @@ class ValueSource(object):
             except TypeError:
                 argparse_namespace = argparse.Namespace()
                 self.extra_args.extend(namespace_and_extra_args)
+            values = parser.argparse_namespace_to_dotdict(
+                argparse_namespace,
+                object_hook,
+            )
+            self.parse_cache.put(
+                config_manager.option_definitions,
+                object_hook,
+                (values, list(self.extra_args))
+            )
+            return values
 
         else:
             fake_args = self.create_fake_args(config_manager)
@@ -556,6 +629,52 @@ class ValueSource(object):
         config_manager,
         create_auto_help,
     ):
+        """return an argparse parser for the options defined so far.  The
+        parser built by the previous call with the same parser classes is
+        reused: if options have only been added since then, it is extended
+        with just the arguments for the new options."""
+        option_definitions = config_manager.option_definitions
+        options = [
+            (opt_name, option_definitions.peek(opt_name))
+            for opt_name in option_definitions.keys_breadth_first()
+            if isinstance(option_definitions.peek(opt_name), Option)
+        ]
+        build_key = (
+            tuple(sorted(parser_classes.items())),
+            create_auto_help,
+            config_manager.app_name,
+            config_manager.app_description,
+        )
+        try:
+            (
+                previous_option_definitions,
+                a_parser,
+                main_parser,
+                names_in_parser
+            ) = self.parser_builds[build_key]
+        except KeyError:
+            previous_option_definitions = None
+        if previous_option_definitions is option_definitions:
+            new_options = [
+                (opt_name, an_option)
+                for opt_name, an_option in options
+                if opt_name not in names_in_parser
+            ]
+            if (
+                # nothing was removed
+                len(options) - len(new_options) == len(names_in_parser)
+                and all(
+                    a_parser.can_extend_argparse_parser(opt_name, an_option)
+                    for opt_name, an_option in new_options
+                )
+            ):
+                if new_options:
+                    a_parser.extend_argparse_parser(main_parser, new_options)
+                    names_in_parser.update(
+                        opt_name for opt_name, an_option in new_options
+                    )
+                return main_parser
+
         a_parser = ParserContainer(
             prog=config_manager.app_name,
             #version=config_manager.app_version,
@@ -564,6 +683,12 @@ class ValueSource(object):
         )
         self._setup_argparse(a_parser, parser_classes, config_manager)
         main_parser = a_parser.create_argparse_parser(**parser_classes)
+        self.parser_builds[build_key] = (
+            option_definitions,
+            a_parser,
+            main_parser,
+            set(opt_name for opt_name, an_option in options)
+        )
         return main_parser
 
     #--------------------------------------------------------------------------
@@ -572,7 +697,7 @@ class ValueSource(object):
         # go into a subparser and the subparser must be complete before
         # given to any other parser as a parent
         for opt_name in config_manager.option_definitions.keys_breadth_first():
-            an_option = config_manager.option_definitions[opt_name]
+            an_option = config_manager.option_definitions.peek(opt_name)
             if isinstance(an_option, Option):
                 parser.add_argument_from_option(opt_name, an_option)
 
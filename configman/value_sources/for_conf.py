@@ -26,7 +26,11 @@ from configman.value_sources.source_exceptions import (
     ValueException,
     CantHandleTypeException
 )
-from configman.dotdict import DotDict
+from configman.dotdict import (
+    DotDict,
+    iteritems_breadth_first,
+    lookup_dotted_key
+)
 from configman.memoize import memoize
 
 function_type = type(lambda x: x)  # TODO: just how do you express the Fuction
@@ -50,6 +54,48 @@ class NotAConfigFileError(ValueException):
     pass
 
 
+#------------------------------------------------------------------------------
+def values_from_lines(lines):
+    """return a mapping of the keys to the values in the lines of a conf
+    file.  The lines are read in a single pass:
+
+        # a comment, ignored like blank lines
+        key=value
+        long_key=the value continues
+          on the lines that follow, less their first character
+
+    A line without an '=' is a key with an empty value.  The pieces of a
+    value continued over several lines are joined once the value is
+    complete."""
+    values = {}
+    # the last key and, once it is continued, its value in pieces
+    key = None
+    fragments = None
+    for line in lines:
+        if type(line) is not str:
+            line = to_str(line)
+        stripped = line.strip()
+        if not stripped or stripped[0] == '#':
+            continue
+        if key is not None and line[0] in ' \t':
+            if fragments is None:
+                fragments = [values[key]]
+            fragments.append(line[1:].rstrip())
+            continue
+        a_key, separator, value = stripped.partition('=')
+        if not separator:
+            values[stripped] = ''
+            continue
+        if fragments is not None:
+            values[key] = ''.join(fragments)
+            fragments = None
+        key = a_key.rstrip()
+        values[key] = value.lstrip()
+    if fragments is not None:
+        values[key] = ''.join(fragments)
+    return values
+
+
 #==============================================================================
 class ValueSource(object):
 
@@ -63,32 +109,19 @@ class ValueSource(object):
         ):
             # we're trusting the string represents a filename
             opener = functools.partial(open, candidate)
+            # the file that can be watched for changes
+            self.pathname = candidate
         elif isinstance(candidate, function_type):
             # we're trusting that the function when called with no parameters
             # will return a Context Manager Type.
             opener = candidate
+            self.pathname = None
         else:
             raise CantHandleTypeException()
         self.values = {}
         try:
             with opener() as f:
-                previous_key = None
-                for line in f:
-                    line = to_str(line)
-                    if line.strip().startswith('#') or not line.strip():
-                        continue
-                    if line[0] in ' \t' and previous_key:
-                        line = line[1:]
-                        self.values[previous_key] = (
-                            '%s%s' % (self.values[previous_key], line.rstrip())
-                        )
-                        continue
-                    try:
-                        key, value = line.split("=", 1)
-                        self.values[key.strip()] = value.strip()
-                        previous_key = key
-                    except ValueError:
-                        self.values[line] = ''
+                self.values = values_from_lines(f)
         except Exception as x:
             raise NotAConfigFileError(
                 "Conf couldn't interpret %s as a config file: %s"
@@ -104,20 +137,40 @@ class ValueSource(object):
             return self.values
         return obj_hook(initializer=self.values)
 
+    #--------------------------------------------------------------------------
+    def get(self, key, default=None):
+        """look up a single key of the form 'x.y.z' without copying the
+        values into the object hook.  See configman.value_sources.LazyValues
+        """
+        try:
+            return lookup_dotted_key(self.values, key)
+        except KeyError:
+            return default
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        try:
+            lookup_dotted_key(self.values, key)
+        except KeyError:
+            return False
+        return True
+
+    #--------------------------------------------------------------------------
+    def keys(self):
+        """all of the keys in the form 'x.y.z', for checking mismatches"""
+        return [key for key, value in iteritems_breadth_first(self.values)]
+
     #--------------------------------------------------------------------------
     @staticmethod
     def write(source_dict, namespace_name=None, output_stream=sys.stdout):
-        options = [
-            value
-            for value in source_dict.values()
-            if isinstance(value, Option)
-        ]
+        options = []
+        namespaces = []
+        for key, value in six.iteritems(source_dict):
+            if isinstance(value, Option):
+                options.append(value)
+            elif isinstance(value, namespace.Namespace):
+                namespaces.append((key, value))
         options.sort(key=lambda x: x.name)
-        namespaces = [
-            (key, value)
-            for key, value in source_dict.items()
-            if isinstance(value, namespace.Namespace)
-        ]
         for an_option in options:
             if namespace_name:
                 option_name = "%s.%s" % (namespace_name, an_option.name)
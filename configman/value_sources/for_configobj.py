@@ -34,6 +34,18 @@ can_handle = (
 )
 
 
+#==============================================================================
+class CyclicIncludeException(ValueException):
+    pass
+
+
+#------------------------------------------------------------------------------
+def _lines_of(real_pathname):
+    """return the lines of a file without their line endings"""
+    with open(real_pathname) as f:
+        return [a_line.rstrip() for a_line in f]
+
+
 #==============================================================================
 class ConfigObjWithIncludes(configobj.ConfigObj):
     """This derived class is an extention to ConfigObj that adds nested
@@ -66,36 +78,62 @@ class ConfigObjWithIncludes(configobj.ConfigObj):
         dbname=some_database
         dbuser=dwight
         dbpassword=secrets
+
+    Each file is read and expanded only once per load, no matter how often
+    or by which path it is included.  A file that ends up including itself
+    raises a CyclicIncludeException.  After loading, 'include_graph' maps the
+    real pathname of every file that was read to the list of the real
+    pathnames of the files that it includes.
     """
     _include_re = re.compile(r'^(\s*)\+include\s+(.*?)\s*$')
 
     #--------------------------------------------------------------------------
     def _expand_files(self, file_name, original_path, indent=""):
-        """This recursive function accepts a file name, opens the file and then
-        spools the contents of the file into a list, examining each line as it
-        does so.  If it detects a line beginning with "+include", it assumes
-        the string immediately following is a file name.  Recursing, the file
-        new file is openned and its contents are spooled into the accumulating
-        list."""
-        expanded_file_contents = []
-        with open(file_name) as f:
-            for a_line in f:
-                match = ConfigObjWithIncludes._include_re.match(a_line)
-                if match:
-                    include_file = match.group(2)
-                    include_file = os.path.join(
-                        original_path,
-                        include_file
-                    )
-                    new_lines = self._expand_files(
-                        include_file,
-                        os.path.dirname(include_file),
-                        indent + match.group(1)
+        """This recursive function accepts a file name and returns its lines
+        with the contents of included files in place of the "+include"
+        lines.  Nested includes are expanded recursively."""
+        real_pathname = os.path.realpath(file_name)
+        if real_pathname not in self._expanded_files:
+            if real_pathname in self._files_being_expanded:
+                cycle = self._files_being_expanded[
+                    self._files_being_expanded.index(real_pathname):
+                ]
+                raise CyclicIncludeException(
+                    "cyclic include: %s" % ' -> '.join(
+                        cycle + [real_pathname]
                     )
-                    expanded_file_contents.extend(new_lines)
-                else:
-                    expanded_file_contents.append(indent + a_line.rstrip())
-        return expanded_file_contents
+                )
+            self._files_being_expanded.append(real_pathname)
+            try:
+                expanded_file_contents = []
+                included_files = []
+                for a_line in _lines_of(real_pathname):
+                    match = ConfigObjWithIncludes._include_re.match(a_line)
+                    if match:
+                        include_file = os.path.join(
+                            original_path,
+                            match.group(2)
+                        )
+                        included_files.append(
+                            os.path.realpath(include_file)
+                        )
+                        expanded_file_contents.extend(self._expand_files(
+                            include_file,
+                            os.path.dirname(include_file),
+                            match.group(1)
+                        ))
+                    else:
+                        expanded_file_contents.append(a_line)
+            finally:
+                self._files_being_expanded.pop()
+            self._expanded_files[real_pathname] = expanded_file_contents
+            self.include_graph[real_pathname] = included_files
+        if not indent:
+            return self._expanded_files[real_pathname]
+        return [
+            indent + a_line
+            for a_line in self._expanded_files[real_pathname]
+        ]
 
     #--------------------------------------------------------------------------
     def _load(self, infile, configspec):
@@ -104,10 +142,22 @@ class ConfigObjWithIncludes(configobj.ConfigObj):
         completed, this method submits the list of lines to the super class'
         function of the same name.  ConfigObj proceeds, completely unaware
         that it's input file has been preprocessed."""
+        self.include_graph = {}
         if isinstance(infile, (six.binary_type, six.text_type)):
             infile = to_str(infile)
             original_path = os.path.dirname(infile)
-            expanded_file_contents = self._expand_files(infile, original_path)
+            # the expanded files of this load by real pathname and the
+            # real pathnames of the files being expanded, outermost first
+            self._expanded_files = {}
+            self._files_being_expanded = []
+            try:
+                expanded_file_contents = self._expand_files(
+                    infile,
+                    original_path
+                )
+            finally:
+                del self._expanded_files
+                del self._files_being_expanded
             super(ConfigObjWithIncludes, self)._load(
                 expanded_file_contents,
                 configspec
@@ -132,6 +182,13 @@ class ValueSource(object):
     ):
         self.delayed_parser_instantiation = False
         self.top_level_section_name = top_level_section_name
+        # the file that can be watched for changes
+        self.pathname = None
+        # the files that it includes by pathname -> the files that they
+        # include.  See ConfigObjWithIncludes
+        self.include_graph = {}
+        # the files that it includes, directly or not, can be watched too
+        self.included_pathnames = frozenset()
         if source is configobj.ConfigObj:
             try:
                 app = config_manager._get_option('admin.application')
@@ -154,12 +211,19 @@ class ValueSource(object):
             isinstance(source, six.string_types) and
             source.endswith(file_name_extension)
         ):
+            self.pathname = source
             try:
                 self.config_obj = ConfigObjWithIncludes(source)
             except Exception as x:
                 raise LoadingIniFileFailsException(
                     "ConfigObj cannot load ini: %s" % str(x)
                 )
+            self.include_graph = self.config_obj.include_graph
+            self.included_pathnames = frozenset(
+                a_pathname
+                for included in six.itervalues(self.include_graph)
+                for a_pathname in included
+            )
         else:
             raise CantHandleTypeException()
 
@@ -203,11 +267,13 @@ class ValueSource(object):
                    output_stream=sys.stdout):
         """this function prints the components of a configobj ini file.  It is
         recursive for outputing the nested sections of the ini file."""
-        options = [
-            value
-            for value in source_dict.values()
-            if isinstance(value, Option)
-        ]
+        options = []
+        namespaces = []
+        for key, value in six.iteritems(source_dict):
+            if isinstance(value, Option):
+                options.append(value)
+            elif isinstance(value, Namespace):
+                namespaces.append((key, value))
         options.sort(key=lambda x: x.name)
         indent_spacer = " " * (level * indent_size)
         for an_option in options:
@@ -240,11 +306,6 @@ class ValueSource(object):
                                    option_value),
                   file=output_stream)
         next_level = level + 1
-        namespaces = [
-            (key, value)
-            for key, value in source_dict.items()
-            if isinstance(value, Namespace)
-        ]
         namespaces.sort(key=ValueSource._namespace_reference_value_from_sort)
         for key, namespace in namespaces:
             next_level_spacer = " " * next_level * indent_size
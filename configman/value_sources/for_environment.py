@@ -0,0 +1,74 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+from __future__ import absolute_import, division, print_function
+
+from configman.value_sources.source_exceptions import CantHandleTypeException
+from configman.dotdict import DotDict, DotDictWithAcquisition
+from configman.environment import LazyEnvironment, PrefixedEnvironment
+from configman.memoize import DefinitionGenerationCache
+from configman.option import Option
+
+# there is no 'file_name_extension' here, the environment is written in the
+# 'env' form of the for_mapping module
+can_handle = (
+    LazyEnvironment,
+)
+
+
+#==============================================================================
+class ValueSource(object):
+    """a value source for a LazyEnvironment.  Unlike the for_mapping value
+    source, it doesn't copy its source into an instance of the object hook:
+    configman looks up only the keys of the options that it defines and the
+    LazyEnvironment turns each of those into a few lookups in the
+    environment.
+
+    A PrefixedEnvironment is probed instead: the names of the environment
+    variables for every option defined are compiled into a table that is
+    kept until options are added or removed.  Only the values found are
+    copied into the object hook."""
+    #--------------------------------------------------------------------------
+    def __init__(self, source, the_config_manager=None):
+        if not isinstance(source, LazyEnvironment):
+            raise CantHandleTypeException()
+        self.source = source
+        self.always_ignore_mismatches = source.always_ignore_mismatches
+        self.translation_tables = DefinitionGenerationCache()
+
+    #--------------------------------------------------------------------------
+    def _translation_table(self, option_definitions, source):
+        table = self.translation_tables.get(
+            option_definitions,
+            source.acquisition
+        )
+        if table is None:
+            table = source.compile(
+                a_key
+                for a_key in option_definitions.keys_breadth_first()
+                if isinstance(option_definitions.peek(a_key), Option)
+            )
+            self.translation_tables.put(
+                option_definitions,
+                source.acquisition,
+                table
+            )
+        return table
+
+    #--------------------------------------------------------------------------
+    def get_values(self, config_manager, ignore_mismatches, obj_hook=DotDict):
+        source = self.source
+        if (
+            issubclass(obj_hook, DotDictWithAcquisition)
+            and not source.acquisition
+        ):
+            source = source.with_acquisition()
+        if (
+            config_manager is None
+            or not isinstance(source, PrefixedEnvironment)
+        ):
+            return source
+        option_definitions = config_manager.option_definitions
+        return obj_hook(initializer=source.probe(
+            self._translation_table(option_definitions, source)
+        ))
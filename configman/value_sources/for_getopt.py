@@ -14,6 +14,7 @@ passed in.  If specified as a list, the constructor will assume the list
 represents the argv source."""
 from __future__ import absolute_import, division, print_function
 
+import os
 import getopt
 import collections
 
@@ -22,6 +23,7 @@ from configman import namespace
 from configman.config_exceptions import NotAnOptionError
 from configman.converters import boolean_converter
 from configman.dotdict import DotDict
+from configman.memoize import DefinitionGenerationCache
 
 from configman.value_sources.source_exceptions import (
     ValueException,
@@ -51,6 +53,9 @@ class ValueSource(object):
             self.argv_source = source
         else:
             raise CantHandleTypeException()
+        # parsing only needs to be redone when new options appear.  The
+        # 'hits' of this cache are the parses that were avoided.
+        self.parse_cache = DefinitionGenerationCache()
 
     # frequently, command line data sources must be treated differently.  For
     # example, even when the overall option for configman is to allow
@@ -74,24 +79,41 @@ class ValueSource(object):
 
         Unlike many of the Value sources, this method cannot be "memoized".
         The return result depends on an internal state within the parameter
-        'config_manager'.  Any memoize decorator for this method would requrire
-        capturing that internal state in the memoize cache key.
+        'config_manager': the options defined so far.  Instead, the results
+        are cached for as long as no new options have been defined.
         """
+        option_definitions = config_manager.option_definitions
+        cached_result = self.parse_cache.get(
+            option_definitions,
+            (ignore_mismatches, obj_hook)
+        )
+        if cached_result is not None:
+            command_line_values, args = cached_result
+            config_manager.args = list(args)
+            return command_line_values
         short_options_str, long_options_list = self.getopt_create_opts(
-            config_manager.option_definitions
+            option_definitions
         )
+        ignored_args = []
         try:
             if ignore_mismatches:
-                fn = ValueSource.getopt_with_ignore
+                getopt_options, config_manager.args = \
+                    ValueSource.getopt_with_ignore(
+                        self.argv_source,
+                        short_options_str,
+                        long_options_list,
+                        ignored_args
+                    )
             else:
-                fn = getopt.gnu_getopt
-            # here getopt looks through the command line arguments and
-            # consumes the defined switches.  The things that are not
-            # consumed are then offered as the 'args' variable of the
-            # parent configuration_manager
-            getopt_options, config_manager.args = fn(self.argv_source,
-                                                     short_options_str,
-                                                     long_options_list)
+                # here getopt looks through the command line arguments and
+                # consumes the defined switches.  The things that are not
+                # consumed are then offered as the 'args' variable of the
+                # parent configuration_manager
+                getopt_options, config_manager.args = getopt.gnu_getopt(
+                    self.argv_source,
+                    short_options_str,
+                    long_options_list
+                )
         except getopt.GetoptError as x:
             raise NotAnOptionError(str(x))
         command_line_values = obj_hook()
@@ -121,6 +143,25 @@ class ValueSource(object):
             config_manager.args
         ):
             command_line_values[name] = value
+        result = (command_line_values, list(config_manager.args))
+        self.parse_cache.put(
+            option_definitions,
+            (ignore_mismatches, obj_hook),
+            result
+        )
+        if (
+            ignore_mismatches
+            and not ignored_args
+            and not os.environ.get("POSIXLY_CORRECT")
+        ):
+            # nothing had to be ignored, so a strict parse would come to the
+            # same result.  The final strict parse that checks for mismatches
+            # need not be done.
+            self.parse_cache.put(
+                option_definitions,
+                (False, obj_hook),
+                result
+            )
         return command_line_values
 
     #--------------------------------------------------------------------------
@@ -139,7 +180,8 @@ class ValueSource(object):
                                      prefix,
                                      short_options_list,
                                      long_options_list):
-        for key, val in source.items():
+        for key in source.keys():
+            val = source.peek(key)
             if isinstance(val, option.Option):
                 boolean_option = type(val.default) == bool
                 if val.short_form:
@@ -168,12 +210,15 @@ class ValueSource(object):
 
     #--------------------------------------------------------------------------
     @staticmethod
-    def getopt_with_ignore(args, shortopts, longopts=[]):
+    def getopt_with_ignore(args, shortopts, longopts=[], ignored_args=None):
         """my_getopt(args, options[, long_options]) -> opts, args
 
         This function works like gnu_getopt(), except that unknown parameters
-        are ignored rather than raising an error.
+        are ignored rather than raising an error.  If given, the list
+        'ignored_args' collects the arguments that were ignored.
         """
+        if ignored_args is None:
+            ignored_args = []
         opts = []
         prog_args = []
         if isinstance(longopts, str):
@@ -193,8 +238,12 @@ class ValueSource(object):
                         args[1:]
                     )
                 except getopt.GetoptError:
+                    ignored_args.append(args[0])
                     args = args[1:]
             elif args[0][0] == '-':
+                if args[0] == '-':
+                    # gnu_getopt would have taken this as a program argument
+                    ignored_args.append(args[0])
                 try:
                     opts, args = getopt.do_shorts(
                         opts,
@@ -203,6 +252,7 @@ class ValueSource(object):
                         args[1:]
                     )
                 except getopt.GetoptError:
+                    ignored_args.append(args[0])
                     args = args[1:]
             else:
                 prog_args.append(args[0])
@@ -211,7 +261,8 @@ class ValueSource(object):
 
     #--------------------------------------------------------------------------
     def find_name_with_short_form(self, short_name, source, prefix):
-        for key, val in source.items():
+        for key in source.keys():
+            val = source.peek(key)
             if isinstance(val, namespace.Namespace):
                 new_prefix = '%s.' % key
                 name = self.find_name_with_short_form(short_name, val,
@@ -232,7 +283,7 @@ class ValueSource(object):
         for key in option_definitions.keys_breadth_first():
             try:
                 if (
-                    option_definitions[key].is_argument
+                    option_definitions.peek(key).is_argument
                     and key not in switches_already_used
                 ):
                     yield key
@@ -21,7 +21,11 @@ from configman.value_sources.source_exceptions import (
     CantHandleTypeException
 )
 
-from configman.dotdict import DotDict
+from configman.dotdict import (
+    DotDict,
+    iteritems_breadth_first,
+    lookup_dotted_key
+)
 from configman.memoize import memoize
 
 can_handle = (
@@ -44,6 +48,8 @@ class ValueSource(object):
     #--------------------------------------------------------------------------
     def __init__(self, source, the_config_manager=None):
         self.values = None
+        # the file that can be watched for changes
+        self.pathname = None
         if source is json:
             try:
                 app = the_config_manager._get_option('admin.application')
@@ -58,6 +64,7 @@ class ValueSource(object):
             isinstance(source, six.string_types)
             and source.endswith(file_name_extension)
         ):
+            self.pathname = source
             try:
                 with open(source) as fp:
                     self.values = json.load(fp)
@@ -67,7 +74,7 @@ class ValueSource(object):
                 import warnings
                 warnings.warn("%s doesn't exist" % source)
                 self.values = {}
-            except ValueError:
+            except ValueError as x:
                 raise LoadingJsonFileFailsException(
                     "Cannot load json: %s" % str(x)
                 )
@@ -81,6 +88,29 @@ class ValueSource(object):
             return self.values
         return obj_hook(self.values)
 
+    #--------------------------------------------------------------------------
+    def get(self, key, default=None):
+        """look up a single key of the form 'x.y.z' without copying the
+        values into the object hook.  See configman.value_sources.LazyValues
+        """
+        try:
+            return lookup_dotted_key(self.values, key)
+        except KeyError:
+            return default
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        try:
+            lookup_dotted_key(self.values, key)
+        except KeyError:
+            return False
+        return True
+
+    #--------------------------------------------------------------------------
+    def keys(self):
+        """all of the keys in the form 'x.y.z', for checking mismatches"""
+        return [key for key, value in iteritems_breadth_first(self.values)]
+
     #--------------------------------------------------------------------------
     @staticmethod
     def recursive_default_dict():
@@ -89,16 +119,22 @@ class ValueSource(object):
     #--------------------------------------------------------------------------
     @staticmethod
     def write(source_dict, output_stream=sys.stdout):
-        json_dict = ValueSource.recursive_default_dict()
-        for qkey in source_dict.keys_breadth_first(include_dicts=True):
-            val = source_dict[qkey]
+        """write the options as a json object.  It is written a namespace at
+        a time as the tree is walked, no copy of the tree is made first."""
+        output_stream.write('{')
+        separator = ''
+        for key, val in six.iteritems(source_dict):
             if isinstance(val, Namespace):
+                output_stream.write('%s%s: ' % (separator, json.dumps(key)))
+                ValueSource.write(val, output_stream)
+                separator = ', '
                 continue
-            d = json_dict
-            for x in qkey.split('.'):
-                d = d[x]
+            d = {}
             if isinstance(val, Option):
-                for okey, oval in six.iteritems(val.__dict__):
+                for okey in Option.__slots__:
+                    if okey.startswith('_'):
+                        continue
+                    oval = getattr(val, okey)
                     try:
                         d[okey] = to_string_converters[type(oval)](oval)
                     except KeyError:
@@ -108,4 +144,10 @@ class ValueSource(object):
                 d['name'] = val.name
                 fn = val.function
                 d['function'] = to_string_converters[type(fn)](fn)
-        json.dump(json_dict, output_stream)
+            output_stream.write('%s%s: %s' % (
+                separator,
+                json.dumps(key),
+                json.dumps(d)
+            ))
+            separator = ', '
+        output_stream.write('}')
@@ -9,7 +9,11 @@ import six
 
 from configman.value_sources.source_exceptions import CantHandleTypeException
 from configman.option import Option
-from configman.dotdict import DotDict
+from configman.dotdict import (
+    DotDict,
+    iteritems_breadth_first,
+    lookup_dotted_key
+)
 from configman.memoize import memoize
 from configman import namespace
 
@@ -44,6 +48,29 @@ class ValueSource(object):
             return self.source
         return obj_hook(initializer=self.source)
 
+    #--------------------------------------------------------------------------
+    def get(self, key, default=None):
+        """look up a single key of the form 'x.y.z' without copying the
+        values into the object hook.  See configman.value_sources.LazyValues
+        """
+        try:
+            return lookup_dotted_key(self.source, key)
+        except KeyError:
+            return default
+
+    #--------------------------------------------------------------------------
+    def __contains__(self, key):
+        try:
+            lookup_dotted_key(self.source, key)
+        except KeyError:
+            return False
+        return True
+
+    #--------------------------------------------------------------------------
+    def keys(self):
+        """all of the keys in the form 'x.y.z', for checking mismatches"""
+        return [key for key, value in iteritems_breadth_first(self.source)]
+
     #--------------------------------------------------------------------------
     @staticmethod
     def _namespace_reference_value_from_sort(key_value_tuple):
@@ -57,17 +84,14 @@ class ValueSource(object):
     #--------------------------------------------------------------------------
     @staticmethod
     def write(source_dict, namespace_name=None, output_stream=sys.stdout):
-        options = [
-            value
-            for value in source_dict.values()
-            if isinstance(value, Option)
-        ]
+        options = []
+        namespaces = []
+        for key, value in six.iteritems(source_dict):
+            if isinstance(value, Option):
+                options.append(value)
+            elif isinstance(value, namespace.Namespace):
+                namespaces.append((key, value))
         options.sort(key=lambda x: x.name)
-        namespaces = [
-            (key, value)
-            for key, value in source_dict.items()
-            if isinstance(value, namespace.Namespace)
-        ]
 
         def split_long_line(line, prefix='\n', max_length=80):
             parts = line.split()
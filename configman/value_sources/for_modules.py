@@ -3,10 +3,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 from __future__ import absolute_import, division, print_function
 
-try:
-    from functools import total_ordering
-except ImportError:
-    from total_ordering import total_ordering
+from functools import total_ordering
 import types
 import sys
 import datetime
@@ -14,8 +14,8 @@ try:
 except ImportError:
     pass
 
-if sys.version_info[:3] <= (2, 6, 4):
-    print("Please upgrade to a python >= 2.6.5!", file=sys.stderr)
+if sys.version_info[:2] < (2, 7):
+    print("Please upgrade to a python >= 2.7!", file=sys.stderr)
     sys.exit(1)
 
 if sys.version_info[0] == 3 and sys.version_info[1] < 3:
@@ -30,14 +30,9 @@ def read(fname):
 
 
 def find_install_requires():
-    reqs = [x.strip() for x in
+    return [x.strip() for x in
             read('requirements.txt').splitlines()
             if x.strip() and not x.startswith('#')]
-    try:
-        from functools import total_ordering
-    except ImportError:
-        reqs.append('total-ordering==0.1')
-    return reqs
 
 
 def find_tests_require():
@@ -61,7 +56,6 @@ setup(
         'License :: OSI Approved :: Mozilla Public License 2.0 (MPL 2.0)',
         'Programming Language :: Python',
         'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.6',
         'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
         'Programming Language :: Python :: 3.3',